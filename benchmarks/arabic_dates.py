@@ -0,0 +1,110 @@
+"""
+Golden cases and a micro-benchmark for utils.arabic_dates.
+
+Run from the repository root:
+
+    python benchmarks/arabic_dates.py [--repeat 20000]
+
+Every golden case is a date string as the sites print it, with the date
+the parsers should store. The script exits with status 1 if any of them
+is parsed differently, then times the previous per-parser approach
+(rebuilding the month and digit dicts, replacing digits one by one,
+strptime) against the engine without and with its cache, and the
+Umm al-Qura lookup table against a fresh ummalqura.Umalqurra per date.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ummalqura.hijri import Umalqurra
+from utils.arabic_dates import parse_date, to_iso
+from utils.hijri_calendar import hijri_to_gregorian
+
+GOLDEN = [
+    # bna.bh, mofa.gov.bh, uaeun.org: dd.createdby / time blocks
+    ("18 نوفمبر 2024", "2024-11-18"),
+    ("3 أغسطس 2014", "2014-08-03"),
+    # crownprince.bh search results, Arabic-Indic digits
+    ("٢٥ ديسمبر ٢٠٢٤", "2024-12-25"),
+    # diwan.gov.qa list items
+    (" 12 مارس 2025 ", "2025-03-12"),
+    # mfa.gov.jo and mfa.gov.eg ContentMain_lblDate, Levantine months
+    ("١٥ تشرين الثاني ٢٠٢٤", "2024-11-15"),
+    ("7 كانون الثاني 2025", "2025-01-07"),
+    ("2 آب 2024", "2024-08-02"),
+    # mfa.gov.eg statement bodies with a weekday
+    ("القاهرة في يوم الخميس 5 ديسمبر 2024 - استقبل وزير الخارجية", "2024-12-05"),
+    ("الأربعاء، ٤ سبتمبر ٢٠٢٤", "2024-09-04"),
+    # presidency.eg date ranges, day first
+    ("١٢ / ٠٣ / ٢٠٢٥ - ١٣ / ٠٣ / ٢٠٢٥", "2025-03-12"),
+    # gate.ahram.org.eg
+    ("05-01-2025 | 14:32", "2025-01-05"),
+    # meta published_time
+    ("2025-02-10T08:15:00Z", "2025-02-10"),
+    # pmo.gov.bh spellings
+    ("1 إبريل 2025", "2025-04-01"),
+    ("10 يونيه 2024", "2024-06-10"),
+    # pmo.gov.bh month first, as its %B %d, %Y format printed them
+    ("مارس 5, 2025", "2025-03-05"),
+    ("إبريل ١٢، ٢٠٢٥", "2025-04-12"),
+    # Hijri dates on Saudi and Qatari sources
+    ("12 رمضان 1446 هـ", "2025-03-12"),
+    ("20 جمادى الأولى 1446هـ", "2024-11-22"),
+    ("1446/09/12 هـ", "2025-03-12"),
+    # No date at all
+    ("بيان صحفي", None),
+]
+
+
+def legacy_iso(arabic_date: str) -> str | None:
+    """What Functions.convert_arabic_date_to_iso used to do on every call."""
+    arabic_to_western = {"٠": "0", "١": "1", "٢": "2", "٣": "3", "٤": "4",
+                         "٥": "5", "٦": "6", "٧": "7", "٨": "8", "٩": "9"}
+    for ar, en in arabic_to_western.items():
+        arabic_date = arabic_date.replace(ar, en)
+    months = {"يناير": "January", "فبراير": "February", "مارس": "March", "أبريل": "April", "مايو": "May",
+              "يونيو": "June", "يوليو": "July", "أغسطس": "August", "سبتمبر": "September", "أكتوبر": "October",
+              "نوفمبر": "November", "ديسمبر": "December"}
+    parts = arabic_date.split()
+    if len(parts) != 3 or parts[1] not in months:
+        return None
+    return datetime.strptime(f"{parts[0]} {months[parts[1]]} {parts[2]}", "%d %B %Y").strftime("%Y-%m-%d")
+
+
+def timed(function, samples: list[str], repeat: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for sample in samples:
+            function(sample)
+    return (time.perf_counter() - started_at) / (repeat * len(samples)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20000)
+    args = parser.parse_args()
+
+    failures = [(text, expected, to_iso(text)) for text, expected in GOLDEN if to_iso(text) != expected]
+    for text, expected, actual in failures:
+        print(f'FAIL {text!r}: expected {expected}, got {actual}')
+    print(f'{len(GOLDEN) - len(failures)}/{len(GOLDEN)} golden cases pass')
+
+    samples = ["18 نوفمبر 2024", "٢٥ ديسمبر ٢٠٢٤", "3 أغسطس 2014", "12 مارس 2025"]
+    uncached = parse_date.__wrapped__
+    print(f"{'legacy dict+replace+strptime':<32}{timed(legacy_iso, samples, args.repeat):>8.2f} us/date")
+    print(f"{'engine, uncached':<32}{timed(uncached, samples, args.repeat):>8.2f} us/date")
+    print(f"{'engine, cached':<32}{timed(parse_date, samples, args.repeat):>8.2f} us/date")
+
+    hijri = [(1446, 9, 12), (1445, 5, 20), (1447, 1, 1), (1440, 12, 29)]
+    print(f"{'hijri, Umalqurra per date':<32}{timed(lambda d: Umalqurra().hijri_to_gregorian(*d), hijri, args.repeat):>8.2f} us/date")
+    print(f"{'hijri, lookup table':<32}{timed(lambda d: hijri_to_gregorian(*d), hijri, args.repeat):>8.2f} us/date")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
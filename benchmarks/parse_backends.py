@@ -0,0 +1,120 @@
+"""
+Compare the HTML extraction backends on saved pages.
+
+Save search and article pages of every site under benchmarks/pages/<site>/
+(any *.html file), then run from the repository root:
+
+    python benchmarks/parse_backends.py [--pages benchmarks/pages] [--repeat 5]
+
+Without saved pages it generates search and article pages shaped like the
+sites' (result lists, multi-class containers, Arabic text, scripts and
+comments), so the comparison runs on a fresh checkout too.
+
+For every site it prints the average time to parse a page and run the
+operations the parsers use (find_all by tag and class, CSS select,
+get_text, attribute access) with each backend, and whether the backends
+extracted the same links and text.
+"""
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.extraction import parse_html, LXML_AVAILABLE
+
+
+def extract(html: str, backend: str) -> tuple:
+    doc = parse_html(html, backend)
+    links = [a.get('href') for a in doc.find_all('a') if a.has_attr('href')]
+    selected = len(doc.select('div a[href]'))
+    classed = len(doc.find_all('div', class_='item'))
+    paragraphs = [p.get_text(strip=True) for p in doc.find_all('p')]
+    title = doc.find('h1')
+    return (links, selected, classed, paragraphs, title.get_text(strip=True) if title else None,
+            title.string if title else None)
+
+
+WORDS = ['وزير', 'الخارجية', 'يستقبل', 'سفير', 'المملكة', 'بيان', 'صحفي', 'القاهرة', 'المنامة', 'الدوحة',
+         'مجلس', 'التعاون', 'الأمم', 'المتحدة', 'Palestine', 'Gaza', 'statement', '2025']
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def synthetic_pages(seed: int = 1) -> dict[str, list[str]]:
+    """Search and article pages for a run without saved ones, the same on every run."""
+    rng = random.Random(seed)
+    chrome = ('<head><title>{title}</title><style>.item {{ color: red }}</style>'
+              '<script>var config = {{"page": 1}};</script></head>')
+    search, articles = [], []
+    for page in range(10):
+        items = ''.join(
+            f'<div class="item col-md-4 {"featured" if rng.random() < 0.2 else ""}">'
+            f'<h2 class="title"><a href="/ar/news/{page}-{number}">{sentence(rng, 8)}</a></h2>'
+            f'<span class="date">{rng.randint(1, 28)} مارس 2025</span><p>{sentence(rng, 25)}</p></div>'
+            for number in range(rng.randint(10, 30)))
+        search.append(f'<html dir="rtl">{chrome.format(title=sentence(rng, 3))}<body><!-- results -->'
+                      f'<div class="list">{items}</div><ul class="pagination"><li><a href="?page={page + 1}">'
+                      f'{page + 1}</a></li></ul></body></html>')
+    for page in range(10):
+        body = ''.join(f'<p>{sentence(rng, rng.randint(20, 80))}</p>' for _ in range(rng.randint(5, 40)))
+        heading = f'<h1><span>{sentence(rng, 6)}</span></h1>' if page % 2 else f'<h1>{sentence(rng, 6)}</h1>'
+        articles.append(f'<html dir="rtl">{chrome.format(title=sentence(rng, 3))}<body><div class="item">'
+                        f'{heading}<div class="content">{body}<a href="/ar/news">{sentence(rng, 2)}</a></div>'
+                        f'</div></body></html>')
+    return {'synthetic search': search, 'synthetic article': articles}
+
+
+def bench(pages: list[str], backend: str, repeat: int) -> tuple[float, list]:
+    results = []
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        results = [extract(html, backend) for html in pages]
+    return (time.perf_counter() - started_at) / (repeat * len(pages)), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', default=os.path.join(os.path.dirname(__file__), 'pages'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    backends = ['soup'] + (['lxml'] if LXML_AVAILABLE else [])
+    if not LXML_AVAILABLE:
+        print('lxml is not installed, only the BeautifulSoup backend is measured')
+    sites = sorted(entry for entry in os.listdir(args.pages)
+                   if os.path.isdir(os.path.join(args.pages, entry))) if os.path.isdir(args.pages) else []
+    site_pages = {}
+    for site in sites:
+        site_pages[site] = []
+        for path in sorted(glob.glob(os.path.join(args.pages, site, '*.html'))):
+            with open(path, 'r', encoding='utf8', errors='replace') as file:
+                site_pages[site].append(file.read())
+    if not any(site_pages.values()):
+        print(f'No saved pages under {args.pages}, using generated ones')
+        site_pages = synthetic_pages()
+
+    print(f"{'site':<24}{'pages':>6}" + ''.join(f'{backend + " ms":>12}' for backend in backends) + f"{'speedup':>10}{'same':>6}")
+    totals = dict.fromkeys(backends, 0.0)
+    for site, pages in site_pages.items():
+        if not pages:
+            continue
+        timings, outputs = {}, {}
+        for backend in backends:
+            timings[backend], outputs[backend] = bench(pages, backend, args.repeat)
+            totals[backend] += timings[backend] * len(pages)
+        speedup = timings['soup'] / timings['lxml'] if 'lxml' in timings else 1.0
+        same = all(output == outputs['soup'] for output in outputs.values())
+        print(f'{site:<24}{len(pages):>6}' + ''.join(f'{timings[backend] * 1000:>12.2f}' for backend in backends)
+              + f'{speedup:>9.1f}x{"yes" if same else "no":>6}')
+    if 'lxml' in totals and totals['lxml']:
+        print(f"Overall speedup: {totals['soup'] / totals['lxml']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
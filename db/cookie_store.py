@@ -0,0 +1,158 @@
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from email.utils import parsedate_to_datetime
+from http.cookiejar import Cookie
+from http.cookies import SimpleCookie
+from urllib.parse import urlparse
+import requests
+
+
+class CookieStore:
+    """
+    SQLite cookie jar shared by every process and run, keyed on (domain,
+    proxy, user agent) because Cloudflare binds cf_clearance to the IP and
+    the user agent that solved the challenge.
+
+    Cookies are kept until their own expiry; session cookies, which have
+    none, are kept for session_ttl seconds. WAL mode and a busy timeout let
+    several worker processes share the file.
+    """
+    def __init__(self, path: str, session_ttl: float = 3600):
+        self.path = path
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS cookies (
+                domain TEXT NOT NULL,
+                proxy TEXT NOT NULL,
+                user_agent TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value TEXT NOT NULL,
+                cookie_domain TEXT NOT NULL,
+                path TEXT NOT NULL,
+                secure INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (domain, proxy, user_agent, name, cookie_domain, path)
+            )""")
+        self.connection.execute('DELETE FROM cookies WHERE expires < ?', (time.time(),))
+        self.connection.commit()
+
+    @staticmethod
+    def proxy_key(proxy: str | None) -> str:
+        """The proxy's host:port without credentials, '' for direct connections."""
+        if not proxy:
+            return ''
+        parsed = urlparse(proxy)
+        return f'{parsed.hostname}:{parsed.port}'
+
+    @staticmethod
+    def fingerprint(session: requests.Session) -> frozenset:
+        return frozenset((c.name, c.value, c.domain, c.path) for c in session.cookies)
+
+    def load_into(self, session: requests.Session, domain: str, proxy: str | None,
+                  user_agent: str | None = None) -> None:
+        """
+        Put the stored cookies for (domain, proxy, user_agent) into the session.
+        Without a user agent the one of the freshest stored clearance is used
+        and set on the session, so a new scraper can reuse it.
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                if user_agent is None:
+                    row = self.connection.execute(
+                        'SELECT user_agent FROM cookies WHERE domain = ? AND proxy = ? AND expires > ? '
+                        'ORDER BY updated_at DESC LIMIT 1', (domain, self.proxy_key(proxy), now)).fetchone()
+                    if row is None:
+                        return
+                    user_agent = row[0]
+                    session.headers['User-Agent'] = user_agent
+                rows = self._select(domain, proxy, user_agent, now)
+        except sqlite3.Error:
+            print(traceback.format_exc())
+            return
+        for name, value, cookie_domain, path, secure, expires in rows:
+            session.cookies.set_cookie(Cookie(
+                version=0, name=name, value=value, port=None, port_specified=False,
+                domain=cookie_domain, domain_specified=cookie_domain.startswith('.'),
+                domain_initial_dot=cookie_domain.startswith('.'), path=path, path_specified=True,
+                secure=bool(secure), expires=int(expires), discard=False, comment=None, comment_url=None,
+                rest={},
+            ))
+
+    def cookies_for(self, domain: str, proxy: str | None, user_agent: str) -> dict:
+        """Name to value of the stored cookies for (domain, proxy, user_agent), for clients without a requests jar."""
+        try:
+            with self._lock:
+                rows = self._select(domain, proxy, user_agent, time.time())
+        except sqlite3.Error:
+            print(traceback.format_exc())
+            return {}
+        return {name: value for name, value, *_ in rows}
+
+    def _select(self, domain: str, proxy: str | None, user_agent: str, now: float) -> list:
+        return self.connection.execute(
+            'SELECT name, value, cookie_domain, path, secure, expires FROM cookies '
+            'WHERE domain = ? AND proxy = ? AND user_agent = ? AND expires > ?',
+            (domain, self.proxy_key(proxy), user_agent, now)).fetchall()
+
+    def save_from(self, session: requests.Session, domain: str, proxy: str | None, user_agent: str) -> None:
+        now = time.time()
+        self._save([
+            (domain, self.proxy_key(proxy), user_agent, c.name, c.value or '', c.domain, c.path, int(c.secure),
+             float(c.expires) if c.expires else now + self.session_ttl, now)
+            for c in session.cookies
+        ])
+
+    def save_morsels(self, cookies: SimpleCookie, domain: str, proxy: str | None, user_agent: str) -> None:
+        """Store the Set-Cookie morsels of a response, as aiohttp hands them out."""
+        now = time.time()
+        rows = []
+        for morsel in cookies.values():
+            try:
+                if morsel['max-age']:
+                    expires = now + int(morsel['max-age'])
+                elif morsel['expires']:
+                    expires = parsedate_to_datetime(morsel['expires']).timestamp()
+                else:
+                    expires = now + self.session_ttl
+            except (TypeError, ValueError):
+                expires = now + self.session_ttl
+            rows.append((domain, self.proxy_key(proxy), user_agent, morsel.key, morsel.value,
+                         morsel['domain'] or domain, morsel['path'] or '/', int(bool(morsel['secure'])), expires, now))
+        self._save(rows)
+
+    def _save(self, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        try:
+            with self._lock:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO cookies (domain, proxy, user_agent, name, value, cookie_domain, path, '
+                    'secure, expires, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                self.connection.commit()
+        except sqlite3.Error:
+            print(traceback.format_exc())
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_cookie_store() -> CookieStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CookieStore(
+                os.getenv("COOKIE_STORE_PATH", 'db/cache/cookies.sqlite3'),
+                session_ttl=float(os.getenv("COOKIE_SESSION_TTL", 3600)),
+            )
+        return _store
@@ -1,46 +1,58 @@
 import json
 import traceback
 from typing import Any, NoReturn, Dict
-import os
 import psycopg2
+from contextlib import contextmanager
+from psycopg2.extras import execute_values
+from db.pool import get_pool
 
 
 class PostgreSQL:
+    """Borrows connections from the process-wide pool for every query."""
     def __init__(self):
-        self.connection = psycopg2.connect(dbname=os.getenv("POSTGRES_DB_NAME"), user=os.getenv("POSTGRES_USER"),
-                                           password=os.getenv("POSTGRES_PASSWORD"), host=os.getenv("HOST"))
+        self.pool = get_pool()
 
-    def __del__(self):
-        try:
-            self.close_connection()
-        except AttributeError:
-            pass
-
-    def execute_query_with_results(self, query: str, values: list | None = None) -> list:
-        cursor = self.connection.cursor()
-        try:
-            if values:
-                values = [json.dumps(v, default=str) if isinstance(v, dict) else v for v in values]
-                cursor.execute(query, values)
-            else:
-                cursor.execute(query)
-            column_names = [desc[0] for desc in cursor.description]
-            rows = []
-            for row in cursor.fetchall():
-                row_dict = dict(zip(column_names, row))
-                rows.append(row_dict)
-            self.connection.commit()
-            cursor.close()
-            return rows
-        except psycopg2.Error as e:
-            print(query, values)
-            cursor.execute('rollback')
-            cursor.close()
-            print(f"Error executing query with results: {e}")
-            print(traceback.format_exc())
+    @contextmanager
+    def cursor(self, name: str | None = None):
+        """
+        Yield a cursor on a pooled connection, commit when the block succeeds and
+        roll back otherwise. The connection goes back to the pool either way.
+        """
+        with self.pool.connection() as connection:
+            cursor = connection.cursor(name=name) if name else connection.cursor()
+            try:
+                yield cursor
+                cursor.close()
+                connection.commit()
+            except BaseException:
+                if not connection.closed:
+                    connection.rollback()
+                raise
 
-    def close_connection(self):
-        self.connection.close()
+    def execute_query_with_results(self, query: str, values: list | None = None,
+                                   reconnect_attempts: int = 1) -> list:
+        if values:
+            values = [json.dumps(v, default=str) if isinstance(v, dict) else v for v in values]
+        for attempt in range(reconnect_attempts + 1):
+            try:
+                with self.cursor() as cursor:
+                    cursor.execute(query, values or None)
+                    column_names = [desc[0] for desc in cursor.description]
+                    rows = []
+                    for row in cursor.fetchall():
+                        row_dict = dict(zip(column_names, row))
+                        rows.append(row_dict)
+                    return rows
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                # The pool has dropped the broken connection, the next attempt gets a fresh one
+                print(f"Connection error, reconnecting ({attempt + 1}): {e}")
+                if attempt == reconnect_attempts:
+                    print(traceback.format_exc())
+            except psycopg2.Error as e:
+                print(query, values)
+                print(f"Error executing query with results: {e}")
+                print(traceback.format_exc())
+                return None
 
 
 class PostgreSQLTable:
@@ -54,8 +66,7 @@ class PostgreSQLTable:
             values = list(data.values())
             placeholders = ", ".join(["%s"] * len(values))
             query = f"INSERT INTO {self.table_name} ({column_names}) VALUES ({placeholders}) RETURNING *"
-            inserted_row = self.db.execute_query_with_results(query, values)
-            self.db.connection.commit()
+            inserted_row = self.db.execute_query_with_results(query, values, reconnect_attempts=0)
             if inserted_row:
                 return inserted_row[0]
             else:
@@ -71,7 +82,6 @@ class PostgreSQLTable:
             condition_value = [custom_value]
             query = f"UPDATE {self.table_name} SET {set_columns} WHERE {condition} RETURNING *"
             updated_row = self.db.execute_query_with_results(query, set_values + condition_value)
-            self.db.connection.commit()
             if updated_row:
                 return updated_row[0]
             else:
@@ -83,93 +93,92 @@ class PostgreSQLTable:
         try:
             query = f"DELETE FROM {self.table_name} WHERE {condition_field} = %s RETURNING *"
             self.db.execute_query_with_results(query, [condition_value])
-            self.db.connection.commit()
         except Exception:
             print(traceback.format_exc())
 
     def get_all_rows(self) -> list | NoReturn:
-        cursor = self.db.connection.cursor()
-        try:
-            query = f"SELECT * FROM {self.table_name} order by id"
-            cursor.execute(query)
-            column_names = [desc[0] for desc in cursor.description]
-            rows = []
-            for row in cursor.fetchall():
-                row_dict = dict(zip(column_names, row))
-                rows.append(row_dict)
-            cursor.close()
-            self.db.connection.commit()
-            return rows
-        except Exception:
-            cursor.execute('rollback')
-            print(traceback.format_exc())
+        query = f"SELECT * FROM {self.table_name} order by id"
+        return self.db.execute_query_with_results(query)
 
     def get_row(self, conditions: Dict[str, Any]) -> dict | None:
-        cursor = self.db.connection.cursor()
-        try:
-            where_clause = " AND ".join([f"{field} = %s" for field in conditions.keys()])
-            query = f"SELECT * FROM {self.table_name} WHERE {where_clause}"
-            cursor.execute(query, tuple(conditions.values()))
-            results = cursor.fetchall()
-            cursor.close()
-            if results:
-                row_data = results[0]
-                column_names = [desc[0] for desc in cursor.description]
-                row_dict = {column: value for column, value in zip(column_names, row_data)}
-                return row_dict
-            else:
-                return None
-        except Exception:
-            cursor.execute('rollback')
-            print(traceback.format_exc())
-        finally:
-            cursor.close()
+        where_clause = " AND ".join([f"{field} = %s" for field in conditions.keys()])
+        query = f"SELECT * FROM {self.table_name} WHERE {where_clause} LIMIT 1"
+        rows = self.db.execute_query_with_results(query, list(conditions.values()))
+        return rows[0] if rows else None
 
     def get_rows_with_filter(self, condition_field: str, condition_value: Any) -> list | NoReturn:
-        cursor = self.db.connection.cursor()
+        query = f"SELECT * FROM {self.table_name} WHERE {condition_field} = %s"
+        return self.db.execute_query_with_results(query, [condition_value])
+
+    def get_existing_pairs(self, fields: tuple[str, str], pairs: list[tuple]) -> set | None:
+        """
+        Return the subset of (value, value) pairs that already exist in the table
+        for the two given columns, using a single join against unnest() arrays.
+        """
+        if not pairs:
+            return set()
         try:
-            query = f"SELECT * FROM {self.table_name} WHERE {condition_field} = %s"
-            cursor.execute(query, (condition_value,))
-            column_names = [desc[0] for desc in cursor.description]
-            rows = []
-            for row in cursor.fetchall():
-                row_dict = dict(zip(column_names, row))
-                rows.append(row_dict)
-            cursor.close()
-            self.db.connection.commit()
-            return rows
+            first, second = fields
+            query = f"""
+                SELECT DISTINCT t.{first}, t.{second}
+                FROM {self.table_name} t
+                JOIN unnest(%s::text[], %s::text[]) AS c({first}, {second})
+                ON t.{first} = c.{first} AND t.{second} = c.{second}
+                """
+            with self.db.cursor() as cursor:
+                cursor.execute(query, ([str(pair[0]) for pair in pairs], [str(pair[1]) for pair in pairs]))
+                return {tuple(row) for row in cursor.fetchall()}
         except Exception:
-            cursor.execute('rollback')
             print(traceback.format_exc())
 
+    def count_rows(self) -> int:
+        with self.db.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {self.table_name}")
+            res = cursor.fetchone()
+            return res[0] if res else 0
+
+    def iter_rows(self, columns: list[str], itersize: int = 10000):
+        """
+        Stream the given columns of every row through a server-side cursor,
+        so the whole table is never materialised in memory at once. The pooled
+        connection is held until the generator is exhausted or closed.
+        """
+        with self.db.cursor(name=f"{self.table_name}_stream") as cursor:
+            cursor.itersize = itersize
+            cursor.execute(f"SELECT {', '.join(columns)} FROM {self.table_name}")
+            for row in cursor:
+                yield row
+
     def check_table(self) -> bool:
-        cursor = self.db.connection.cursor()
         sql = "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = %s)"
-        cursor.execute(sql, (self.table_name,))
-        res = cursor.fetchone()
-        return res[0] if res else False
-    
-    def bulk_insert_or_update(self, data_list: list[dict]) -> None:
+        with self.db.cursor() as cursor:
+            cursor.execute(sql, (self.table_name,))
+            res = cursor.fetchone()
+            return res[0] if res else False
+
+    def bulk_insert_or_update(self, data_list: list[dict]) -> int | None:
+        """
+        Insert rows sharing the same keys with a single execute_values statement.
+        Returns the number of inserted rows, or None if the insert failed.
+        """
         if not data_list:
             print("Empty data list for bulk insert or update.")
-            return
-        cursor = self.db.connection.cursor()
+            return 0
         try:
-            columns = data_list[0].keys()
+            columns = list(data_list[0].keys())
             column_names = ", ".join(columns)
-            placeholders = ", ".join(["%s"] * len(columns))
-            values = [tuple(item[column] for column in columns) for item in data_list]
+            values = [tuple(json.dumps(item[column], default=str) if isinstance(item[column], dict) else item[column]
+                            for column in columns) for item in data_list]
             query = f"""
                 INSERT INTO {self.table_name} ({column_names})
-                VALUES ({placeholders})
+                VALUES %s
                 ON CONFLICT DO NOTHING
                 """
-            cursor.executemany(query, values)
-            self.db.connection.commit()
-            print(f"Inserted {cursor.rowcount} rows into {self.table_name} (skipped duplicates).")
+            with self.db.cursor() as cursor:
+                execute_values(cursor, query, values, page_size=len(values))
+                inserted = cursor.rowcount
+            print(f"Inserted {inserted} rows into {self.table_name} (skipped duplicates).")
+            return inserted
         except Exception as e:
-            cursor.execute("ROLLBACK")
             print(f"Error during bulk insert or update: {e}")
             print(traceback.format_exc())
-        finally:
-            cursor.close()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of Postgres connections shared by every PostgreSQLTable.
+
+    Borrowing blocks while all maxconn connections are lent out. A connection
+    is checked before it is handed out (closed, in an unknown transaction
+    state, or failing a ping after being idle for health_check_interval
+    seconds) and replaced by a fresh one, and connections that fail with a
+    connection-level error while in use are discarded instead of returned.
+    Only minconn idle connections are kept open between borrows.
+    """
+    def __init__(self, minconn: int = 4, maxconn: int = 10, health_check_interval: float = 30,
+                 connect_attempts: int = 3):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.health_check_interval = health_check_interval
+        self.connect_attempts = connect_attempts
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self.reconnects = 0
+
+    def _get_pool(self) -> ThreadedConnectionPool:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadedConnectionPool(
+                    self.minconn, self.maxconn, dbname=os.getenv("POSTGRES_DB_NAME"),
+                    user=os.getenv("POSTGRES_USER"), password=os.getenv("POSTGRES_PASSWORD"),
+                    host=os.getenv("HOST"))
+            return self._pool
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        connection = None
+        broken = False
+        try:
+            connection = self._checkout()
+            yield connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            if connection is not None:
+                self._checkin(connection, broken)
+            self._slots.release()
+
+    def _checkout(self):
+        pool = self._get_pool()
+        for attempt in range(self.connect_attempts):
+            try:
+                connection = pool.getconn()
+            except psycopg2.OperationalError:
+                if attempt == self.connect_attempts - 1:
+                    raise
+                time.sleep(2 ** attempt)
+                continue
+            if self._is_healthy(connection):
+                return connection
+            self.reconnects += 1
+            self._discard(connection)
+        raise psycopg2.OperationalError('Could not get a working connection from the pool')
+
+    def _is_healthy(self, connection) -> bool:
+        if connection.closed:
+            return False
+        if connection.get_transaction_status() == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if time.monotonic() - self._last_used.get(id(connection), 0) < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _checkin(self, connection, broken: bool) -> None:
+        if broken or connection.closed:
+            self._discard(connection)
+            return
+        try:
+            if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            self._discard(connection)
+            return
+        self._last_used[id(connection)] = time.monotonic()
+        self._get_pool().putconn(connection)
+
+    def _discard(self, connection) -> None:
+        self._last_used.pop(id(connection), None)
+        try:
+            self._get_pool().putconn(connection, close=True)
+        except PoolError:
+            pass
+
+    def close_all(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+            self._last_used = {}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                minconn=int(os.getenv("POSTGRES_POOL_MIN", 4)),
+                maxconn=int(os.getenv("POSTGRES_POOL_MAX", 10)),
+                health_check_interval=float(os.getenv("POSTGRES_POOL_HEALTH_CHECK", 30)),
+            )
+        return _pool
@@ -0,0 +1,91 @@
+import hashlib
+import math
+import threading
+import traceback
+from db.core import PostgreSQLTable
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SeenLinksIndex:
+    """
+    Bloom filter over the (news_link, speaker) pairs already stored in the table.
+
+    It is loaded once per run with a streaming server-side cursor. A negative
+    answer is final, so most links found again by the daily rerun never reach
+    Postgres; a positive answer may be false and has to be confirmed by the DB.
+    """
+    def __init__(self, table_name: str, error_rate: float = 0.001, headroom: float = 1.5):
+        self.table_name = table_name
+        self.error_rate = error_rate
+        self.headroom = headroom
+        self.bloom = None
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        with self._lock:
+            if self.loaded:
+                return self.bloom is not None
+            self.loaded = True
+            try:
+                table = PostgreSQLTable(self.table_name)
+                bloom = BloomFilter(int(table.count_rows() * self.headroom) + 10000, self.error_rate)
+                for link, speaker in table.iter_rows(['news_link', 'speaker']):
+                    bloom.add(self._key(link, speaker))
+                self.bloom = bloom
+            except Exception:
+                print(traceback.format_exc())
+                self.bloom = None
+            return self.bloom is not None
+
+    def add(self, link: str, speaker: str) -> None:
+        # Waits for a load in progress, rows committed before a load starts are streamed by it
+        with self._lock:
+            if self.bloom is not None:
+                self.bloom.add(self._key(link, speaker))
+
+    def might_contain(self, link: str, speaker: str) -> bool:
+        if not self.load():
+            return True
+        return self._key(link, speaker) in self.bloom
+
+    def _key(self, link: str, speaker: str) -> str:
+        return f'{link}\x00{speaker}'
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_seen_links_index(table_name: str) -> SeenLinksIndex:
+    with _indexes_lock:
+        if table_name not in _indexes:
+            _indexes[table_name] = SeenLinksIndex(table_name)
+        return _indexes[table_name]
+
+
+def reset_seen_links_indexes() -> None:
+    """Drop the loaded indexes so the next run reloads them from the table."""
+    with _indexes_lock:
+        _indexes.clear()
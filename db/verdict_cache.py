@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import traceback
+
+
+class VerdictCache:
+    """
+    SQLite cache of LLM verdicts ({'is_about', 'explanation'}).
+
+    Entries are keyed on a hash of the normalised article text together with
+    the speaker, prompt version, model id and language, so the same wire story
+    published on several sites, or checked again on the next run, is only
+    classified once. Entries expire after ttl seconds and the least recently
+    used ones are evicted once the cache holds more than max_entries.
+    """
+    # Harakat and tatweel, so differently vocalised copies of a story share a key
+    DIACRITICS = re.compile(r'[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]')
+    SPACES = re.compile(r'\s+')
+
+    def __init__(self, path: str, ttl: float = 30 * 24 * 3600, max_entries: int = 100000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                verdict TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        self.connection.execute('CREATE INDEX IF NOT EXISTS verdicts_accessed_at ON verdicts (accessed_at)')
+        self.connection.commit()
+
+    def normalize(self, text: str) -> str:
+        text = self.DIACRITICS.sub('', text or '')
+        return self.SPACES.sub(' ', text).strip().casefold()
+
+    def make_key(self, title: str, body: str, speaker: str, prompt_version: str, model: str, lang: str) -> str:
+        content = hashlib.sha256(self.normalize(f'{title}\n{body}').encode('utf8')).hexdigest()
+        key = json.dumps([content, str(speaker), prompt_version, model, lang], ensure_ascii=False)
+        return hashlib.sha256(key.encode('utf8')).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    'SELECT verdict, created_at FROM verdicts WHERE key = ?', (key,)).fetchone()
+                if row is None or now - row[1] > self.ttl:
+                    self.misses += 1
+                    return None
+                self.connection.execute('UPDATE verdicts SET accessed_at = ? WHERE key = ?', (now, key))
+                self.connection.commit()
+                self.hits += 1
+            return json.loads(row[0])
+        except sqlite3.Error:
+            print(traceback.format_exc())
+            return None
+
+    def put(self, key: str, verdict: dict) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO verdicts (key, verdict, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(verdict, ensure_ascii=False), now, now))
+                self._puts += 1
+                if self._puts % 100 == 1:
+                    self._evict(now)
+                self.connection.commit()
+        except sqlite3.Error:
+            print(traceback.format_exc())
+
+    def _evict(self, now: float) -> None:
+        self.connection.execute('DELETE FROM verdicts WHERE created_at < ?', (now - self.ttl,))
+        self.connection.execute("""
+            DELETE FROM verdicts WHERE key IN (
+                SELECT key FROM verdicts ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )""", (self.max_entries,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            size = self.connection.execute('SELECT count(*) FROM verdicts').fetchone()[0]
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': size,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_verdict_cache() -> VerdictCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = VerdictCache(
+                os.getenv("LLM_CACHE_PATH", 'db/cache/verdicts.sqlite3'),
+                ttl=float(os.getenv("LLM_CACHE_TTL", 30 * 24 * 3600)),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 100000)),
+            )
+        return _cache
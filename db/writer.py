@@ -0,0 +1,236 @@
+import atexit
+import json
+import os
+import threading
+import traceback
+from db.core import PostgreSQLTable
+
+
+class BufferedWriter:
+    """
+    Collects parsed articles and writes them in batches with execute_values.
+
+    A batch is flushed when batch_size rows are buffered, every flush_interval
+    seconds from a background thread, and on shutdown. Every row is appended
+    to a JSON-lines spool file before it is buffered and the spool is only
+    trimmed after a successful flush, so rows buffered at the time of a crash
+    are replayed into the table the next time the writer starts.
+
+    At most max_buffer rows are held in memory; while the database is away
+    further rows only go to an overflow spool and are read back as room frees
+    up. When a batch fails although the database answers, it is bisected down
+    to the rows that fail on their own. Those are retried on the next
+    max_row_attempts - 1 flushes and then moved to a quarantine file, so one
+    bad row cannot block every later flush.
+    """
+    def __init__(self, table_name: str, batch_size: int = 50, flush_interval: float = 30,
+                 spool_path: str | None = None, max_buffer: int = 1000, max_row_attempts: int = 3):
+        self.table_name = table_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path or f'db/spool/{table_name}.jsonl'
+        self.overflow_path = self.spool_path[:-len('.jsonl')] + '.overflow.jsonl' \
+            if self.spool_path.endswith('.jsonl') else self.spool_path + '.overflow'
+        self.quarantine_path = self.spool_path[:-len('.jsonl')] + '.quarantine.jsonl' \
+            if self.spool_path.endswith('.jsonl') else self.spool_path + '.quarantine'
+        self.max_buffer = max(max_buffer, batch_size)
+        self.max_row_attempts = max_row_attempts
+        self.table = PostgreSQLTable(table_name)
+        # (row, site_run, failed attempts)
+        self.buffer = []
+        self.overflow = 0
+        self.pending = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+        self.replay()
+        self._thread = threading.Thread(target=self._flush_periodically, name=f'writer-{table_name}', daemon=True)
+        self._thread.start()
+
+    def add(self, row: dict, site_run=None) -> None:
+        with self._lock:
+            overflow = len(self.buffer) >= self.max_buffer
+            with open(self.overflow_path if overflow else self.spool_path, 'a', encoding='utf8') as file:
+                file.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+            if overflow:
+                self.overflow += 1
+            else:
+                self.buffer.append((row, site_run, 0))
+            self.pending.add((row.get('news_link'), str(row.get('speaker'))))
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def is_pending(self, link: str, speaker: str) -> bool:
+        return (link, str(speaker)) in self.pending
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self.buffer = self.buffer, []
+            if not batch:
+                return 0
+            result = self._insert_isolating([row for row, _, _ in batch])
+            with self._lock:
+                if result is None:
+                    # The database is unreachable, keep the rows buffered, they are still in the spool file
+                    self.buffer = batch + self.buffer
+                    return 0
+                inserted, failed = result
+                retry, quarantined = [], []
+                for i, (row, site_run, attempts) in enumerate(batch):
+                    if i in failed and attempts + 1 < self.max_row_attempts:
+                        retry.append((row, site_run, attempts + 1))
+                        continue
+                    if i in failed:
+                        quarantined.append(row)
+                    elif site_run is not None:
+                        site_run.increment('db_inserts')
+                    self.pending.discard((row.get('news_link'), str(row.get('speaker'))))
+                self.buffer = retry + self.buffer
+                self._quarantine(quarantined)
+                self._refill()
+                self._rewrite_spool(self.spool_path, [row for row, _, _ in self.buffer])
+            return inserted
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def replay(self) -> None:
+        """Buffer the rows left in the spool files by a previous run and try to write them."""
+        rows = self._read_spool(self.spool_path) + self._read_spool(self.overflow_path)
+        if not rows:
+            return
+        print(f"Replaying {len(rows)} buffered rows from {self.spool_path}")
+        with self._lock:
+            self.buffer = [(row, None, 0) for row in rows[:self.max_buffer]]
+            self.overflow = len(rows) - len(self.buffer)
+            self._rewrite_spool(self.overflow_path, rows[self.max_buffer:])
+            self._rewrite_spool(self.spool_path, rows[:self.max_buffer])
+            for row in rows:
+                self.pending.add((row.get('news_link'), str(row.get('speaker'))))
+        self.flush()
+
+    def _insert(self, rows: list[dict]) -> int | None:
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(row.keys()), []).append(row)
+        inserted = 0
+        try:
+            for group in groups.values():
+                count = self.table.bulk_insert_or_update(group)
+                if count is None:
+                    return None
+                inserted += count
+        except Exception:
+            print(traceback.format_exc())
+            return None
+        return inserted
+
+    def _insert_isolating(self, rows: list[dict]) -> tuple[int, set[int]] | None:
+        """
+        Insert rows; if that fails while the database answers, bisect down to
+        the rows that fail on their own. Returns (inserted, indexes of failed
+        rows), or None when the database is unreachable.
+        """
+        inserted = self._insert(rows)
+        if inserted is not None:
+            return inserted, set()
+        if self.table.db.execute_query_with_results('SELECT 1', reconnect_attempts=0) is None:
+            return None
+        middle = len(rows) // 2
+        if not middle:
+            return 0, {0}
+        left_inserted, left_failed = self._bisect(rows[:middle], 0)
+        right_inserted, right_failed = self._bisect(rows[middle:], middle)
+        return left_inserted + right_inserted, left_failed | right_failed
+
+    def _bisect(self, rows: list[dict], offset: int) -> tuple[int, set[int]]:
+        inserted = self._insert(rows)
+        if inserted is not None:
+            return inserted, set()
+        if len(rows) == 1:
+            return 0, {offset}
+        middle = len(rows) // 2
+        left_inserted, left_failed = self._bisect(rows[:middle], offset)
+        right_inserted, right_failed = self._bisect(rows[middle:], offset + middle)
+        return left_inserted + right_inserted, left_failed | right_failed
+
+    def _quarantine(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        print(f"Quarantined {len(rows)} rows that could not be written to {self.table_name} "
+              f"after {self.max_row_attempts} attempts: {self.quarantine_path}")
+        with open(self.quarantine_path, 'a', encoding='utf8') as file:
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+
+    def _refill(self) -> None:
+        """Move rows from the overflow spool into the free room of the buffer."""
+        room = self.max_buffer - len(self.buffer)
+        if not self.overflow or room <= 0:
+            return
+        rows = self._read_spool(self.overflow_path)
+        self.buffer.extend((row, None, 0) for row in rows[:room])
+        self._rewrite_spool(self.overflow_path, rows[room:])
+        self.overflow = max(0, len(rows) - room)
+
+    @staticmethod
+    def _read_spool(path: str) -> list[dict]:
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf8') as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    @staticmethod
+    def _rewrite_spool(path: str, rows: list[dict]) -> None:
+        if not rows and not os.path.exists(path):
+            return
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf8') as file:
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+        os.replace(tmp_path, path)
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                print(traceback.format_exc())
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(table_name: str) -> BufferedWriter:
+    with _writers_lock:
+        if table_name not in _writers:
+            _writers[table_name] = BufferedWriter(
+                table_name,
+                batch_size=int(os.getenv("DB_WRITER_BATCH_SIZE", 50)),
+                flush_interval=float(os.getenv("DB_WRITER_FLUSH_INTERVAL", 30)),
+                max_buffer=int(os.getenv("DB_WRITER_MAX_BUFFER", 1000)),
+                max_row_attempts=int(os.getenv("DB_WRITER_MAX_ROW_ATTEMPTS", 3)),
+            )
+        return _writers[table_name]
+
+
+def flush_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+def close_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(close_writers)
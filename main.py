@@ -1,6 +1,16 @@
 import schedule
 from dotenv import load_dotenv
 from utils.func import *
+from utils.orchestrator import Orchestrator, Site
+from network.session_pool import session_pool
+from network.httpx_transport import httpx_pool
+from db.seen_links import reset_seen_links_indexes
+from db.writer import flush_writers
+from db.pool import get_pool
+from db.verdict_cache import get_verdict_cache
+from proxies.proxy_manager import get_proxy_registry
+from network.hedging import get_hedger
+from network.host_limiter import get_host_limiter
 import warnings
 from parsers.bna_bh.parser import NewsBnaBh
 from parsers.mofa_gov_bh.parser import NewsMofaGovBh
@@ -30,117 +40,125 @@ load_dotenv(override=True)
 
 def parse_bna():
     speaker = 'حمد بن عيسى آل خليفة'
-    NewsBnaBh(speaker).get()
+    NewsBnaBh(speaker).run()
 
 def parse_mofa_gov_bh():
     speakers = ['عبد اللطيف الزياني','جمال فارس الرويعي']
-    NewsMofaGovBh(speakers).get()
+    NewsMofaGovBh(speakers).run()
 
 def parse_presidency():
     speaker = 'عبد الفتاح سعيد حسين خليل السيسى'
-    NewsPresidencyEg(speaker).get()
+    NewsPresidencyEg(speaker).run()
 
 def parse_egypttoday():
     speaker = 'Badr Abdelatty'
-    NewsEgypttoday(speaker).get()
+    NewsEgypttoday(speaker).run()
 
 def parse_gate_ahram_org_eg():
     speaker = 'أسامة عبد الخالق'
-    NewsGateAhramOrgEg(speaker).get()
+    NewsGateAhramOrgEg(speaker).run()
 
 def parse_kingabdullah_jo():
     speaker = 'عبد الله الثاني بن الحسين'
-    NewsKingabdullahJo(speaker).get()
+    NewsKingabdullahJo(speaker).run()
 
 def parse_mfa_gov_jo():
     # на этом сайте не работает пагинация в поиске
     speaker = 'ايمن حسين الصفدي'
-    NewsMfaGovJo(speaker).get()
+    NewsMfaGovJo(speaker).run()
     
 def parse_jordantimes_com():
     speaker = 'Mahmoud Daifallah Hmoud'
-    NewsJordantimesCom(speaker).get()
+    NewsJordantimesCom(speaker).run()
 
 def parse_spa_gov_sa():
     speakers = ['سلمان بن عبد العزیز آل سعود','محمد بن سلمان آل سعود','عبدالعزيز الواصل']
-    NewsSpaGovSa(speakers).get()
+    NewsSpaGovSa(speakers).run()
 
 def parse_mofa_gov_sa():
     # тут вообще поиск не работает, по statements проверяю
     speaker = 'فيصل بن فرحان آل سعود'
-    NewsMofaGovSa(speaker).get()
+    NewsMofaGovSa(speaker).run()
 
 def parser_diwan_gov_qa():
     speaker = 'تميم بن حمد بن خليفة آل ثاني'
-    NewsDiwanGovQa(speaker).get()
+    NewsDiwanGovQa(speaker).run()
 
 def parse_mofa_gov_qa():
     speaker = 'محمد بن عبد الرحمن بن جاسم آل ثاني'
-    NewsMofaGovQa(speaker).get()
+    NewsMofaGovQa(speaker).run()
 
 def parse_ny_mission_qa():
     speaker = 'علياء بنت أحمد بن سيف آل ثاني'
-    NewsNyMissionQa(speaker).get()
+    NewsNyMissionQa(speaker).run()
 
 def parse_mohamedbinzayed_ae():
     speaker = 'محمد بن زايد آل نهيان'
-    NewsMohamedbinzayedAe(speaker).get()
+    NewsMohamedbinzayedAe(speaker).run()
 
 def parse_mofa_gov_ae():
     # тут на английском, потому что на арабском ничего не ищет по сайту
     speaker = 'Abdullah bin Zayed Al Nahyan'
-    NewsMofaGovAe(speaker).get()
+    NewsMofaGovAe(speaker).run()
 
 def parse_uaeun_org():
     speaker = 'محمد أبوشهاب'
-    NewsUaeunOrg(speaker).get()
+    NewsUaeunOrg(speaker).run()
 
 def parse_uae_embassy_org():
     # абсолютно не понятно что тут можно найти ?
     speaker = 'Yousef Al Otaiba'
-    # NewsUaeEmbassyOrg(speaker).get()
+    # NewsUaeEmbassyOrg(speaker).run()
 
 def parse_mfa_gov_eg():
     speaker = 'بدر عبد العاطي'
-    NewsMfaGovEg(speaker).get()
+    NewsMfaGovEg(speaker).run()
 
 def parse_crownprince_bh():
     speaker = 'الأمير سلمان بن حمد آل خليفة'
-    NewsCrownprinceBh(speaker).get()
+    NewsCrownprinceBh(speaker).run()
 
 def parse_pmo_gov_bh():
     speaker = 'الأمير سلمان بن حمد آل خليفة'
-    NewsPmoGovBh(speaker).get()
+    NewsPmoGovBh(speaker).run()
 
 def main():
-    functions = [
-        parse_bna,
-        parse_mofa_gov_bh,
-        parse_presidency,
-        parse_egypttoday,
-        parse_gate_ahram_org_eg,
-        parse_kingabdullah_jo,
-        parse_mfa_gov_jo,
-        parse_jordantimes_com,
-        parse_spa_gov_sa,
-        parse_mofa_gov_sa,
-        parser_diwan_gov_qa,
-        parse_mofa_gov_qa,
-        parse_ny_mission_qa,
-        parse_mohamedbinzayed_ae,
-        parse_mofa_gov_ae,
-        parse_uaeun_org,
-        parse_uae_embassy_org,
-        parse_mfa_gov_eg,
-        parse_crownprince_bh,
-        parse_pmo_gov_bh,
+    sites = [
+        Site('bna.bh', parse_bna),
+        Site('mofa.gov.bh', parse_mofa_gov_bh),
+        Site('presidency.eg', parse_presidency),
+        Site('egypttoday.com', parse_egypttoday),
+        Site('gate.ahram.org.eg', parse_gate_ahram_org_eg),
+        Site('kingabdullah.jo', parse_kingabdullah_jo),
+        Site('mfa.gov.jo', parse_mfa_gov_jo),
+        Site('jordantimes.com', parse_jordantimes_com),
+        Site('spa.gov.sa', parse_spa_gov_sa),
+        Site('mofa.gov.sa', parse_mofa_gov_sa),
+        Site('diwan.gov.qa', parser_diwan_gov_qa),
+        Site('mofa.gov.qa', parse_mofa_gov_qa),
+        Site('ny.mission.qa', parse_ny_mission_qa),
+        Site('mohamedbinzayed.ae', parse_mohamedbinzayed_ae),
+        Site('mofa.gov.ae', parse_mofa_gov_ae),
+        Site('uaeun.org', parse_uaeun_org),
+        Site('uae-embassy.org', parse_uae_embassy_org),
+        Site('mfa.gov.eg', parse_mfa_gov_eg),
+        Site('crownprince.bh', parse_crownprince_bh),
+        Site('pmo.gov.bh', parse_pmo_gov_bh),
     ]
-    for func in functions:
-        try:
-            print(f'Start {func.__name__}')
-            func()
-        except Exception as e:
-            print(f"Error in {func.__name__}: {e}\n")
+    reset_seen_links_indexes()
+    orchestrator = Orchestrator()
+    runs = orchestrator.run(sites)
+    flush_writers()
+    orchestrator.print_summary(runs)
+    print(f'Session pool: {session_pool.stats()}')
+    print(f'LLM verdict cache: {get_verdict_cache().stats()}')
+    print(f'Live proxies: {get_proxy_registry().live_count()}')
+    print(f'Hedged requests: {get_hedger().stats()}')
+    print(f'Host concurrency limits: {get_host_limiter().snapshot()}')
+    get_host_limiter().save()
+    session_pool.close_all()
+    httpx_pool.close_all()
+    get_pool().close_all()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+import asyncio
+import queue
+import threading
+import time
+from typing import Callable, Iterator
+from urllib.parse import urlparse
+import aiohttp
+from requests.structures import CaseInsensitiveDict
+from network.host_limiter import HostLimiter, is_challenge
+from network.retry import RetryPolicy
+
+
+class AsyncFetcher:
+    """
+    Downloads a batch of URLs concurrently with aiohttp.
+
+    Concurrency is limited per target host (not per proxy, which is what
+    aiohttp's own limit_per_host would count) and in total. With a
+    HostLimiter the per-host limit adapts to the responses instead of
+    staying at per_host_limit. Results are
+    handed back as (url, body) pairs in completion order; body is None when
+    every attempt failed, so callers can fall back to their own fetch path.
+    Requests still in flight at the deadline (a time.monotonic() value) are
+    cancelled and come back as None too. limit caps the requests of one
+    batch in flight at once, whatever their hosts.
+
+    proxy_factory is called with the target host before every attempt, so a
+    sticky proxy per domain is kept here too.
+
+    Failures are classified by retry_policy like the sync path, so a 404 is
+    not fetched twice. With a proxy_registry every outcome is reported for
+    the proxy used, and with a cookie_store the cookies stored for (host,
+    proxy, user agent) are sent and the ones set by the site saved back.
+    """
+    def __init__(self, per_host_limit: int = 4, total_limit: int = 32, timeout: float = 30,
+                 max_attempts: int = 2, connect_timeout: float | None = None, read_timeout: float | None = None,
+                 host_limiter: HostLimiter | None = None, retry_policy: RetryPolicy | None = None,
+                 proxy_registry=None, cookie_store=None):
+        self.per_host_limit = per_host_limit
+        self.host_limiter = host_limiter
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_attempts = max_attempts
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.proxy_registry = proxy_registry
+        self.cookie_store = cookie_store
+
+    def iter_completed(self, urls: list[str], headers: dict | None = None,
+                       proxy_factory: Callable[[str], str | None] | None = None,
+                       verify_ssl: bool = True, deadline: float | None = None,
+                       on_timeout: Callable[[], None] | None = None,
+                       limit: int | None = None) -> Iterator[tuple[str, str | None]]:
+        results = queue.Queue()
+        stop = threading.Event()
+        finished = object()
+
+        def runner():
+            try:
+                asyncio.run(self.fetch_many(list(dict.fromkeys(urls)), results.put, headers,
+                                            proxy_factory, verify_ssl, stop, deadline, on_timeout, limit))
+            finally:
+                results.put(finished)
+
+        thread = threading.Thread(target=runner, name='async-fetcher', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            stop.set()
+
+    def fetch_all(self, urls: list[str], headers: dict | None = None,
+                  proxy_factory: Callable[[str], str | None] | None = None,
+                  verify_ssl: bool = True, deadline: float | None = None) -> dict[str, str | None]:
+        return dict(self.iter_completed(urls, headers, proxy_factory, verify_ssl, deadline))
+
+    async def fetch_many(self, urls: list[str], emit: Callable[[tuple], None], headers: dict | None = None,
+                         proxy_factory: Callable[[str], str | None] | None = None, verify_ssl: bool = True,
+                         stop: threading.Event | None = None, deadline: float | None = None,
+                         on_timeout: Callable[[], None] | None = None, limit: int | None = None) -> None:
+        host_limits = {}
+        # Requests of this batch in flight at once, across hosts
+        batch_limit = asyncio.Semaphore(min(limit or self.total_limit, self.total_limit))
+        connector = aiohttp.TCPConnector(limit=self.total_limit, ssl=verify_ssl)
+        # No shared jar: cookies are sent per request from the store, so they never cross proxies
+        async with aiohttp.ClientSession(connector=connector, headers=headers,
+                                         cookie_jar=aiohttp.DummyCookieJar()) as session:
+            user_agent = CaseInsensitiveDict(session.headers).get('User-Agent') or aiohttp.http.SERVER_SOFTWARE
+            tasks = []
+            for url in urls:
+                host = urlparse(url).netloc
+                if host not in host_limits:
+                    per_host_limit = int(self.host_limiter.max_limit) if self.host_limiter else self.per_host_limit
+                    host_limits[host] = asyncio.Semaphore(per_host_limit)
+                tasks.append(asyncio.create_task(self._fetch(session, host_limits[host], url, proxy_factory, stop,
+                                                             deadline, on_timeout, user_agent, batch_limit)))
+            for task in asyncio.as_completed(tasks):
+                emit(await task)
+
+    def client_timeout(self, deadline: float | None) -> aiohttp.ClientTimeout | None:
+        total = self.timeout
+        if deadline is not None:
+            total = min(total, deadline - time.monotonic())
+            if total <= 0:
+                return None
+        return aiohttp.ClientTimeout(total=total, connect=self.connect_timeout, sock_read=self.read_timeout)
+
+    async def _fetch(self, session: aiohttp.ClientSession, limit: asyncio.Semaphore, url: str,
+                     proxy_factory: Callable[[str], str | None] | None,
+                     stop: threading.Event | None, deadline: float | None = None,
+                     on_timeout: Callable[[], None] | None = None,
+                     user_agent: str = '',
+                     batch_limit: asyncio.Semaphore | None = None) -> tuple[str, str | None]:
+        host = urlparse(url).netloc
+        async with batch_limit or asyncio.Semaphore(), limit:
+            for _ in range(self.max_attempts):
+                if stop is not None and stop.is_set():
+                    break
+                timeout = self.client_timeout(deadline)
+                if timeout is None:
+                    break
+                host_limit = await self._acquire_host(host)
+                started_at = time.monotonic()
+                proxy, answered = None, None
+                try:
+                    proxy = proxy_factory(host) if proxy_factory else None
+                    cookies = self.cookie_store.cookies_for(host, proxy, user_agent) if self.cookie_store else None
+                    async with session.get(url, proxy=proxy, timeout=timeout, cookies=cookies) as response:
+                        answered = response.status
+                        latency = time.monotonic() - started_at
+                        blocked = response.status in (403, 429) or is_challenge(response.status, response.headers)
+                        if host_limit and (blocked or response.status < 300):
+                            host_limit.on_response(not blocked, latency)
+                        # Blocks and proxy auth failures count against the proxy, other statuses are the site's
+                        self._report(proxy, response.status not in (403, 407, 429) and response.status < 500,
+                                     latency)
+                        if self.cookie_store and response.cookies:
+                            self.cookie_store.save_morsels(response.cookies, host, proxy, user_agent)
+                        response.raise_for_status()
+                        return url, await response.text()
+                except asyncio.TimeoutError:
+                    if host_limit:
+                        host_limit.on_response(False)
+                    if answered is None:
+                        self._report(proxy, False)
+                    if on_timeout:
+                        on_timeout()
+                    continue
+                except Exception as ex:
+                    if answered is None and isinstance(ex, aiohttp.ClientError):
+                        # No response at all, the proxy or the connection failed
+                        self._report(proxy, False)
+                    # Only retryable errors get another attempt, a 404 or 410 is final
+                    if self.retry_policy.classify(ex) in (RetryPolicy.FATAL, RetryPolicy.ABORT):
+                        break
+                    continue
+                finally:
+                    if host_limit:
+                        host_limit.release()
+        return url, None
+
+    def _report(self, proxy: str | None, ok: bool, latency: float | None = None) -> None:
+        if proxy and self.proxy_registry is not None:
+            self.proxy_registry.report(proxy, ok, latency)
+
+    async def _acquire_host(self, host: str):
+        if self.host_limiter is None:
+            return None
+        host_limit = self.host_limiter.get(host)
+        while not host_limit.try_acquire():
+            await asyncio.sleep(0.05)
+        return host_limit
@@ -0,0 +1,58 @@
+import time
+import requests
+import urllib3
+
+
+class RequestDeadlineExceeded(requests.exceptions.Timeout):
+    pass
+
+
+class RequestTimeouts:
+    """
+    Connect and read timeouts plus a total deadline for one request.
+
+    requests only bounds the connect and each socket read, so a server that
+    trickles bytes can hold a call for ever; the body is therefore streamed
+    and the request is given up once total seconds have passed. All three
+    are clamped to remaining, the time left before the site or run deadline.
+    """
+    def __init__(self, connect: float = 10, read: float = 30, total: float = 90):
+        self.connect = connect
+        self.read = read
+        self.total = total
+
+    def for_request(self, timeout: float | tuple | None = None,
+                    remaining: float | None = None) -> tuple[tuple[float, float], float]:
+        """Return the (connect, read) timeout for requests and the monotonic deadline of the call."""
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+        else:
+            connect, read = self.connect, timeout or self.read
+        total = self.total
+        if remaining is not None:
+            remaining = max(remaining, 0.1)
+            connect, read, total = min(connect, remaining), min(read, remaining), min(total, remaining)
+        return (connect, read), time.monotonic() + total
+
+    def read_body(self, response: requests.Response, deadline: float, chunk_size: int = 64 * 1024) -> None:
+        """Read a streamed response into response.content, raising once the deadline has passed."""
+        if response._content_consumed:
+            return
+        chunks = []
+        try:
+            # read1 returns whatever has arrived instead of waiting for a full chunk
+            while chunk := response.raw.read1(chunk_size, decode_content=True):
+                chunks.append(chunk)
+                if time.monotonic() > deadline:
+                    raise RequestDeadlineExceeded(f'{response.url} did not finish before its deadline',
+                                                  response=response)
+        except RequestDeadlineExceeded:
+            response.close()
+            raise
+        except (urllib3.exceptions.ReadTimeoutError, urllib3.exceptions.ProtocolError) as ex:
+            response.close()
+            if isinstance(ex, urllib3.exceptions.ReadTimeoutError):
+                raise requests.exceptions.ReadTimeout(ex, response=response)
+            raise requests.exceptions.ChunkedEncodingError(ex, response=response)
+        response._content = b''.join(chunks)
+        response._content_consumed = True
@@ -0,0 +1,121 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, Callable
+
+
+class LatencyTracker:
+    """Recent response times per domain, to find where a domain's latency tail starts."""
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, domain: str, latency: float) -> None:
+        with self._lock:
+            if domain not in self._samples:
+                self._samples[domain] = deque(maxlen=self.window)
+            self._samples[domain].append(latency)
+
+    def percentile(self, domain: str, q: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(domain, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class HedgeBudget:
+    """
+    Allows at most ratio hedges per request sent to a domain, plus a small
+    burst, so hedging adds a bounded share of load instead of doubling it.
+    """
+    def __init__(self, ratio: float = 0.1, burst: int = 2):
+        self.ratio = ratio
+        self.burst = burst
+        self.requests = {}
+        self.hedges = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, domain: str) -> None:
+        with self._lock:
+            self.requests[domain] = self.requests.get(domain, 0) + 1
+
+    def try_spend(self, domain: str) -> bool:
+        with self._lock:
+            hedges = self.hedges.get(domain, 0)
+            if hedges >= self.ratio * self.requests.get(domain, 0) + self.burst:
+                return False
+            self.hedges[domain] = hedges + 1
+            return True
+
+
+class Hedger:
+    """
+    Sends a request and, when it is still running past the domain's q-th
+    latency percentile, a duplicate through a different proxy. The first
+    successful response wins. requests calls can't be interrupted, so the
+    loser is left to finish (its deadline still bounds it) and its response
+    is handed to discard, which closes it and frees the connection.
+    """
+    def __init__(self, tracker: LatencyTracker, budget: HedgeBudget, quantile: float = 0.9, workers: int = 16):
+        self.tracker = tracker
+        self.budget = budget
+        self.quantile = quantile
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hedge')
+        self.sent = 0
+        self.won = 0
+        self._lock = threading.Lock()
+
+    def call(self, domain: str, primary: Callable[[], Any], backup: Callable[[], Any],
+             discard: Callable[[Any], None]) -> Any:
+        self.budget.record_request(domain)
+        delay = self.tracker.percentile(domain, self.quantile)
+        first = self.executor.submit(primary)
+        if delay is None or wait([first], timeout=delay).done or not self.budget.try_spend(domain):
+            return first.result()
+        with self._lock:
+            self.sent += 1
+        second = self.executor.submit(backup)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                for loser in pending:
+                    self._drop(loser, discard)
+                if future is second:
+                    with self._lock:
+                        self.won += 1
+                return future.result()
+        raise error
+
+    def _drop(self, future: Future, discard: Callable[[Any], None]) -> None:
+        if future.cancel():
+            return
+        future.add_done_callback(lambda f: discard(f.result()) if f.exception() is None else None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hedges': self.sent, 'hedges_won': self.won}
+
+
+_hedger = None
+_lock = threading.Lock()
+
+
+def get_hedger() -> Hedger:
+    global _hedger
+    with _lock:
+        if _hedger is None:
+            _hedger = Hedger(
+                LatencyTracker(min_samples=int(os.getenv("HTTP_HEDGE_MIN_SAMPLES", 20))),
+                HedgeBudget(ratio=float(os.getenv("HTTP_HEDGE_BUDGET", 0.1))),
+                quantile=float(os.getenv("HTTP_HEDGE_QUANTILE", 0.9)),
+            )
+        return _hedger
@@ -0,0 +1,146 @@
+import atexit
+import json
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+
+def is_challenge(status: int, headers) -> bool:
+    """Cloudflare (and similar) challenge pages come back as 403/503 from the edge."""
+    if headers.get('cf-mitigated') == 'challenge':
+        return True
+    return status in (403, 503) and 'cloudflare' in headers.get('Server', '').lower()
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit of one host, learned with AIMD: every fast 2xx adds
+    1/limit (about +1 per round of requests), a block, challenge page or
+    latency spike halves it, at most once per backoff_interval so one burst
+    of errors only counts once.
+    """
+    def __init__(self, limit: float, min_limit: float = 1, max_limit: float = 16, decrease: float = 0.5,
+                 spike_factor: float = 3.0, backoff_interval: float = 2.0, alpha: float = 0.2):
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.spike_factor = spike_factor
+        self.backoff_interval = backoff_interval
+        self.alpha = alpha
+        self.in_flight = 0
+        self.latency = None
+        self.samples = 0
+        self.decreased_at = 0.0
+        self._cond = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def acquire(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_response(self, ok: bool, latency: float | None = None) -> None:
+        with self._cond:
+            spike = (latency is not None and self.latency is not None and self.samples >= 5
+                     and latency > self.spike_factor * self.latency)
+            if latency is not None and ok:
+                self.latency = latency if self.latency is None else self.alpha * latency + (1 - self.alpha) * self.latency
+                self.samples += 1
+            if ok and not spike:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self._cond.notify_all()
+                return
+            now = time.monotonic()
+            if now - self.decreased_at >= self.backoff_interval:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self.decreased_at = now
+
+
+class HostLimiter:
+    """
+    Adaptive per-host concurrency limits shared by the sync and async fetch
+    paths. Learned limits are saved to path and used as the starting point
+    on the next run, so a site that blocked us yesterday starts slow.
+    """
+    def __init__(self, path: str = 'network/cache/host_limits.json', initial: float = 4, min_limit: float = 1,
+                 max_limit: float = 16):
+        self.path = path
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limits = {}
+        self._lock = threading.Lock()
+        self._saved = self._read()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            print(traceback.format_exc())
+            return {}
+
+    def get(self, host: str) -> AdaptiveLimit:
+        with self._lock:
+            if host not in self.limits:
+                start = min(self.max_limit, max(self.min_limit, float(self._saved.get(host, self.initial))))
+                self.limits[host] = AdaptiveLimit(start, self.min_limit, self.max_limit)
+            return self.limits[host]
+
+    @contextmanager
+    def slot(self, host: str):
+        limit = self.get(host)
+        limit.acquire()
+        try:
+            yield limit
+        finally:
+            limit.release()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {host: round(limit.limit, 2) for host, limit in self.limits.items()}
+
+    def save(self) -> None:
+        limits = {**self._saved, **self.snapshot()}
+        try:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf8') as file:
+                json.dump(limits, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            print(traceback.format_exc())
+
+
+_limiter = None
+_lock = threading.Lock()
+
+
+def get_host_limiter() -> HostLimiter:
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            _limiter = HostLimiter(
+                os.getenv("HOST_LIMITS_PATH", 'network/cache/host_limits.json'),
+                initial=float(os.getenv("FETCH_PER_HOST_LIMIT", 4)),
+                max_limit=float(os.getenv("HOST_LIMIT_MAX", 16)),
+            )
+            atexit.register(_limiter.save)
+        return _limiter
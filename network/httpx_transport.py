@@ -0,0 +1,85 @@
+import threading
+import time
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+from network.deadline import RequestDeadlineExceeded
+
+try:
+    import h2  # noqa: F401 - httpx only needs it to be importable
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpxClientPool:
+    """
+    Long-lived httpx clients for API-style sources, one per (domain, proxy,
+    verify). Every page of a paginated search goes over the same pooled
+    connection, multiplexed over HTTP/2 when the h2 package is installed,
+    instead of paying for a new TCP and TLS handshake each time.
+
+    Responses are returned as requests.Response and httpx errors are raised
+    as their requests counterparts, so retries, proxy scoring and the host
+    limiter treat this transport like the others.
+    """
+    def __init__(self, http2: bool = HTTP2_AVAILABLE, max_connections: int = 20, keepalive_expiry: float = 60):
+        if http2 and not HTTP2_AVAILABLE:
+            print('The h2 package is not installed, the httpx transport falls back to HTTP/1.1 '
+                  '(pip install -r requirements.txt)')
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                                   keepalive_expiry=keepalive_expiry)
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client(self, domain: str, proxy: str | None, verify: bool) -> httpx.Client:
+        key = (domain, proxy, verify)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = httpx.Client(http2=self.http2, proxy=proxy, verify=verify, limits=self.limits,
+                                                  follow_redirects=True)
+            return self._clients[key]
+
+    def request(self, method: str, url: str, domain: str, proxy: str | None, timeout: tuple[float, float],
+                deadline: float, verify: bool = True, allow_redirects: bool = True, **kwargs) -> requests.Response:
+        connect, read = timeout
+        client = self.client(domain, proxy, verify)
+        try:
+            with client.stream(method, url, timeout=httpx.Timeout(read, connect=connect),
+                               follow_redirects=allow_redirects, **kwargs) as response:
+                chunks = []
+                for chunk in response.iter_bytes():
+                    chunks.append(chunk)
+                    if time.monotonic() > deadline:
+                        raise RequestDeadlineExceeded(f'{url} did not finish before its deadline')
+                return self.to_requests(response, b''.join(chunks))
+        except httpx.ConnectTimeout as ex:
+            raise requests.exceptions.ConnectTimeout(ex)
+        except httpx.TimeoutException as ex:
+            raise requests.exceptions.ReadTimeout(ex)
+        except httpx.ProxyError as ex:
+            raise requests.exceptions.ProxyError(ex)
+        except httpx.TransportError as ex:
+            raise requests.exceptions.ConnectionError(ex)
+
+    @staticmethod
+    def to_requests(response: httpx.Response, content: bytes) -> requests.Response:
+        converted = requests.Response()
+        converted.status_code = response.status_code
+        converted.headers = CaseInsensitiveDict(response.headers)
+        converted.url = str(response.url)
+        converted.reason = response.reason_phrase
+        converted.encoding = response.charset_encoding
+        converted._content = content
+        converted._content_consumed = True
+        return converted
+
+    def close_all(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients = {}
+
+
+httpx_pool = HttpxClientPool()
@@ -0,0 +1,222 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterator
+import aiohttp
+import requests
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Fails fast for a domain that keeps failing.
+
+    After failure_threshold failed attempts in a row the circuit opens and every
+    call is refused for cooldown seconds. Then a single trial call is let
+    through (half-open): success closes the circuit, failure opens it again
+    with the cooldown doubled up to max_cooldown.
+    """
+    def __init__(self, name: str, failure_threshold: int = 10, cooldown: float = 60, max_cooldown: float = 900):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_until = 0.0
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() >= self.opened_until:
+                self.state = 'half-open'
+                self.trial_running = False
+            if self.state == 'half-open' and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            self.trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self.state == 'half-open':
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open()
+                return
+            self.failures += 1
+            if self.state == 'closed' and self.failures >= self.failure_threshold:
+                self._open()
+
+    def release(self) -> None:
+        """Give up a trial call that ended without a result."""
+        with self._lock:
+            self.trial_running = False
+
+    def _open(self) -> None:
+        self.state = 'open'
+        self.opened_until = time.monotonic() + self.cooldown
+        self.trial_running = False
+
+
+class CircuitBreakers:
+    def __init__(self, failure_threshold: int = 10, cooldown: float = 60, max_cooldown: float = 900):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, domain: str) -> CircuitBreaker:
+        with self._lock:
+            if domain not in self._breakers:
+                self._breakers[domain] = CircuitBreaker(domain, self.failure_threshold, self.cooldown,
+                                                        self.max_cooldown)
+            return self._breakers[domain]
+
+    def open_circuits(self) -> list[str]:
+        with self._lock:
+            return [domain for domain, breaker in self._breakers.items() if breaker.state != 'closed']
+
+
+class Attempt:
+    """
+    One try of a retried block, used as a context manager. Retryable errors are
+    swallowed and kept on the attempt; fatal ones and abort exceptions propagate.
+    """
+    def __init__(self, policy: 'RetryPolicy', breaker: CircuitBreaker, number: int):
+        self.policy = policy
+        self.breaker = breaker
+        self.number = number
+        self.error = None
+        self.kind = None
+
+    def __enter__(self) -> 'Attempt':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc is None:
+            self.breaker.record_success()
+            return False
+        self.kind = self.policy.classify(exc)
+        if self.kind == RetryPolicy.ABORT:
+            self.breaker.release()
+            return False
+        if self.kind == RetryPolicy.FATAL:
+            # The site answered, the request itself is wrong
+            self.breaker.record_success()
+            return False
+        self.breaker.record_failure()
+        self.error = exc
+        return True
+
+
+class RetryPolicy:
+    """
+    Iterative retries with status-aware classes:
+
+    - fatal: client errors such as 404 or 410, raised at once;
+    - rotate: 403/407 blocks, retried quickly since the next try goes out
+      through another proxy;
+    - retry: timeouts, connection errors, 408/425/429/5xx and anything
+      else, retried with capped exponential backoff with jitter, or after
+      the server's Retry-After.
+
+    Usage::
+
+        for attempt in policy.attempts(breaker, 'Something wrong'):
+            with attempt:
+                return fetch()
+    """
+    RETRY, ROTATE, FATAL, ABORT = 'retry', 'rotate', 'fatal', 'abort'
+    FATAL_STATUSES = {400, 401, 404, 405, 410, 414, 422, 501}
+    ROTATE_STATUSES = {403, 407}
+
+    def __init__(self, max_attempts: int = 6, base_delay: float = 1.0, max_delay: float = 30.0,
+                 abort_exceptions: tuple = ()):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.abort_exceptions = (CircuitOpenError,) + tuple(abort_exceptions)
+
+    def classify(self, error: BaseException) -> str:
+        if isinstance(error, self.abort_exceptions) or not isinstance(error, Exception):
+            return self.ABORT
+        status = self.status_of(error)
+        if status in self.FATAL_STATUSES:
+            return self.FATAL
+        if status in self.ROTATE_STATUSES:
+            return self.ROTATE
+        return self.RETRY
+
+    def status_of(self, error: BaseException) -> int | None:
+        if isinstance(error, aiohttp.ClientResponseError):
+            # aiohttp keeps the status on the error, raise_for_status() drops the response
+            return error.status
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None)
+
+    def delay(self, attempt: Attempt) -> float:
+        retry_after = self.retry_after(attempt.error)
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        if attempt.kind == self.ROTATE:
+            return random.uniform(0, self.base_delay)
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt.number)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def retry_after(self, error: BaseException) -> float | None:
+        response = getattr(error, 'response', None)
+        value = response.headers.get('Retry-After') if isinstance(response, requests.Response) else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def attempts(self, breaker: CircuitBreaker, message: str | None = None,
+                 max_attempts: int | None = None) -> Iterator[Attempt]:
+        """
+        Yield attempts until one succeeds. When they are all used up, raise
+        Exception(message) or, without a message, just stop so the caller can
+        fall through to its own default.
+        """
+        last_error = None
+        max_attempts = max_attempts or self.max_attempts
+        for number in range(max_attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f'Circuit for {breaker.name} is open, skipping the request') from last_error
+            attempt = Attempt(self, breaker, number)
+            yield attempt
+            if attempt.error is None:
+                return
+            last_error = attempt.error
+            if number + 1 < max_attempts:
+                time.sleep(self.delay(attempt))
+        if message:
+            raise Exception(message) from last_error
+
+
+circuit_breakers = CircuitBreakers(
+    failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 10)),
+    cooldown=float(os.getenv("CIRCUIT_COOLDOWN", 60)),
+)
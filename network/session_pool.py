@@ -0,0 +1,93 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Hashable
+import requests
+
+
+class SessionPool:
+    """
+    Keeps warmed HTTP sessions (cloudscraper or plain requests) keyed by
+    (transport, domain, proxy, options) so TLS connections and challenge
+    cookies survive between requests. A session is lent to one caller at a
+    time; sessions that hit a connection-level error are closed instead of
+    being returned, and idle ones are evicted after idle_ttl seconds.
+    """
+    def __init__(self, idle_ttl: float = 300, max_idle_per_key: int = 4):
+        self.idle_ttl = idle_ttl
+        self.max_idle_per_key = max_idle_per_key
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def session(self, key: Hashable, factory: Callable[[], requests.Session]):
+        session = self._acquire(key, factory)
+        broken = False
+        try:
+            yield session
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError):
+            broken = True
+            raise
+        finally:
+            if broken:
+                session.close()
+            else:
+                self._release(key, session)
+
+    def _acquire(self, key: Hashable, factory: Callable[[], requests.Session]) -> requests.Session:
+        with self._lock:
+            self._evict_idle()
+            idle = self._idle.get(key)
+            if idle:
+                self.hits += 1
+                return idle.pop()[0]
+            self.misses += 1
+        return factory()
+
+    def _release(self, key: Hashable, session: requests.Session) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) >= self.max_idle_per_key:
+                self.evictions += 1
+                session.close()
+                return
+            idle.append((session, time.monotonic()))
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key in list(self._idle):
+            fresh = []
+            for session, last_used in self._idle[key]:
+                if now - last_used > self.idle_ttl:
+                    self.evictions += 1
+                    session.close()
+                else:
+                    fresh.append((session, last_used))
+            if fresh:
+                self._idle[key] = fresh
+            else:
+                del self._idle[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'idle': sum(len(sessions) for sessions in self._idle.values()),
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
+
+    def close_all(self) -> None:
+        with self._lock:
+            for sessions in self._idle.values():
+                for session, _ in sessions:
+                    session.close()
+            self._idle = {}
+
+
+session_pool = SessionPool()
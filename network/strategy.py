@@ -0,0 +1,43 @@
+import math
+import os
+import threading
+import time
+
+
+class StrategyMemo:
+    """
+    Remembers which fetch strategy of a fallback chain works for a domain
+    (and optionally a URL pattern on it), so later calls start with it
+    instead of paying for the failing ones first.
+
+    Every strategy has a score: +1 for a success, -1 for a failure, decaying
+    towards 0 with the given half_life in seconds. order() sorts a chain by
+    score, keeping the declared order for ties, so a stale memo falls back
+    to the parser's own preference.
+    """
+    def __init__(self, half_life: float = 1800):
+        self.half_life = half_life
+        self._scores = {}
+        self._lock = threading.Lock()
+
+    def _decayed(self, key: tuple, name: str, now: float) -> float:
+        score, updated_at = self._scores.get(key, {}).get(name, (0.0, now))
+        return score * math.pow(0.5, (now - updated_at) / self.half_life)
+
+    def order(self, domain: str, chain: list[dict], pattern: str | None = None) -> list[dict]:
+        key = (domain, pattern)
+        now = time.monotonic()
+        with self._lock:
+            scores = [self._decayed(key, strategy['name'], now) for strategy in chain]
+        ranked = sorted(range(len(chain)), key=lambda i: (-scores[i], i))
+        return [chain[i] for i in ranked]
+
+    def record(self, domain: str, name: str, ok: bool, pattern: str | None = None) -> None:
+        key = (domain, pattern)
+        now = time.monotonic()
+        with self._lock:
+            score = self._decayed(key, name, now) + (1 if ok else -1)
+            self._scores.setdefault(key, {})[name] = (max(-5.0, min(5.0, score)), now)
+
+
+strategy_memo = StrategyMemo(half_life=float(os.getenv("FETCH_STRATEGY_HALF_LIFE", 1800)))
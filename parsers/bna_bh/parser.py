@@ -1,6 +1,4 @@
-import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
 from parsers.model import CheckNewsModel
 
 
@@ -26,42 +24,37 @@ class NewsBnaBh(CheckNewsModel):
         except Exception as ex:
             self.logger.error(ex)
 
+    def get_result_region(self) -> dict:
+        return {'container': 'h2.title', 'fields': {'link': ('a', 'href')}}
+
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
-        titles = soup.find_all('h2', class_='title')
-        if not titles:
+        records = self.extract_results(search_news)
+        if not records:
             return None
-        for title in titles:
-            a_teg = title.find('a')
-            if a_teg:
-                link = self.domain + a_teg.get('href')
-                if not self.db_check_link(link, self.speaker):
-                    links.append(link)
-        return links
+        for record in records:
+            if record['link']:
+                links.append(self.domain + record['link'])
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, links: list, search_keyword: str) -> None:
+        pages = dict(self.iter_pages(links, self.get_heders()))
         for link in links:
             try:
-                page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                page_content = pages.get(link) or self.news_content_response(link)
+                soup = self.parse_html(page_content)
                 res = self.get_result_dict(search_keyword, self.domain, link, self.speaker, self.country)
                 res['news_title']=soup.find('h1',class_='h2 title').get_text()
                 res['news_body']=self.get_body(soup)
                 res['news_date']=self.get_news_create(soup.find('dd',class_='createdby'))
                 if self.stop_parse_next:
                     break
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(ex)
     
     def get_news_create(self, createdby: BeautifulSoup) -> str:
-        arabic_date = createdby.get_text()
-        arabic_months_dict = self.arabic_months_dict()
-        day, arabic_month, year = arabic_date.split()
-        month = arabic_months_dict.get(arabic_month)
-        date_obj = datetime.strptime(f"{day} {month} {year}", "%d %B %Y")
+        date_obj = self.parse_arabic_date(createdby.get_text())
         if date_obj < self.stop_date_create:
             self.stop_parse_next = True
         return date_obj.strftime("%Y-%m-%d")
@@ -70,52 +63,33 @@ class NewsBnaBh(CheckNewsModel):
         section = soup.find_all("section")[-1]
         return section.get_text()
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            headers = self.get_heders()
-            response = requests.get(
-                url=link,
-                headers=headers,
-                proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            if 'response' in locals() and isinstance(response, requests.Response):
-                response.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                headers = self.get_heders()
+                with self.request('GET', link, transport='requests', headers=headers) as response:
+                    response.raise_for_status()
+                    return response.text
 
-    def bna_response(self, news_keyword: str, page: int = 1, pagesize: int = 30, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            headers = self.get_heders()
-            json_data = {
-                'RowNumber': 0,
-                'NewsKeyword': str(news_keyword),
-                'RowNumberArchive': 0,
-                'pageIndex': int(page),
-                'pagesize': str(pagesize),
-            }
-            response = requests.post(
-                'https://www.bna.bh/bnaWebService.aspx/fnGetWebsiteSearchNew',
-                headers=headers,
-                proxies=self.get_proxy(),
-                json=json_data)
-            response.raise_for_status()
-            data : dict = response.json()
-            return data.get('d',[])[0]
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            if 'response' in locals() and isinstance(response, requests.Response):
-                response.close()
-        return self.bna_response(news_keyword, page, pagesize, count_try + 1)
+    def bna_response(self, news_keyword: str, page: int = 1, pagesize: int = 30) -> str:
+        url = 'https://www.bna.bh/bnaWebService.aspx/fnGetWebsiteSearchNew'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                headers = self.get_heders()
+                json_data = {
+                    'RowNumber': 0,
+                    'NewsKeyword': str(news_keyword),
+                    'RowNumberArchive': 0,
+                    'pageIndex': int(page),
+                    'pagesize': str(pagesize),
+                }
+                with self.request('POST', url,
+                                  transport='httpx',
+                                  headers=headers,
+                                  json=json_data) as response:
+                    response.raise_for_status()
+                    data : dict = response.json()
+                    return data.get('d',[])[0]
     
     def get_heders(self) -> dict:
         return {
@@ -0,0 +1,158 @@
+import os
+import queue
+import threading
+import time
+import traceback
+from typing import Any, Callable
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+
+class RateLimiter:
+    """
+    Token buckets on requests and tokens per minute shared by all Bedrock calls.
+    acquire() blocks until both buckets can pay for the call; a limit of 0
+    disables that bucket.
+    """
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> None:
+        wanted = [(bucket, amount) for bucket, amount in ((self.requests, 1), (self.tokens, tokens)) if bucket]
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                for bucket, amount in wanted:
+                    bucket.refill(now)
+                delay = max((bucket.wait_time(amount) for bucket, amount in wanted), default=0.0)
+                if delay <= 0:
+                    for bucket, amount in wanted:
+                        bucket.tokens -= min(amount, bucket.capacity)
+                    return
+            time.sleep(delay)
+
+
+class ClassificationPool:
+    """
+    Bounded queue of classification jobs served by worker threads.
+
+    Every worker owns its own LLM client built by llm_factory, because a client
+    keeps the chat history of the request in flight. Jobs are callables taking
+    that client; submit() blocks while the queue is full so fetchers slow down
+    instead of piling up articles in memory.
+
+    A worker that cannot build its client (bad credentials, boto errors) retries
+    client_attempts times with exponential backoff. If that still fails, it fails
+    the job and every job already queued through their on_failure callbacks, so
+    nobody waits on them forever, and tries again on the next job.
+    """
+    def __init__(self, llm_factory: Callable[[], Any], workers: int = 4, queue_size: int = 64,
+                 client_attempts: int = 3, client_backoff: float = 1.0):
+        self.llm_factory = llm_factory
+        self.workers = workers
+        self.client_attempts = client_attempts
+        self.client_backoff = client_backoff
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[[Any], None], on_failure: Callable[[Exception], None] | None = None) -> None:
+        """Queue job; on_failure is called instead of it when no LLM client can be built."""
+        self._start()
+        self.jobs.put((job, on_failure))
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'classifier-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _create_client(self) -> Any:
+        for attempt in range(self.client_attempts):
+            try:
+                return self.llm_factory()
+            except Exception as ex:
+                print(f'Could not create the LLM client (attempt {attempt + 1}/{self.client_attempts}): {ex}')
+                if attempt + 1 == self.client_attempts:
+                    raise
+                time.sleep(self.client_backoff * 2 ** attempt)
+
+    @staticmethod
+    def _fail(on_failure: Callable[[Exception], None] | None, error: Exception) -> None:
+        if on_failure is None:
+            return
+        try:
+            on_failure(error)
+        except Exception:
+            print(traceback.format_exc())
+
+    def _fail_queued(self, error: Exception) -> None:
+        while True:
+            try:
+                _, on_failure = self.jobs.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self._fail(on_failure, error)
+            finally:
+                self.jobs.task_done()
+
+    def _work(self) -> None:
+        llm = None
+        while True:
+            job, on_failure = self.jobs.get()
+            try:
+                if llm is None:
+                    try:
+                        llm = self._create_client()
+                    except Exception as ex:
+                        print(traceback.format_exc())
+                        self._fail(on_failure, ex)
+                        self._fail_queued(ex)
+                        continue
+                job(llm)
+            except Exception:
+                print(traceback.format_exc())
+            finally:
+                self.jobs.task_done()
+
+
+_limiter = None
+_pool = None
+_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            _limiter = RateLimiter(float(os.getenv("BEDROCK_RPM", 60)), float(os.getenv("BEDROCK_TPM", 200000)))
+        return _limiter
+
+
+def get_classification_pool(llm_factory: Callable[[], Any]) -> ClassificationPool:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ClassificationPool(llm_factory, workers=int(os.getenv("LLM_WORKERS", 4)),
+                                       queue_size=int(os.getenv("LLM_QUEUE_SIZE", 64)))
+        return _pool
@@ -6,7 +6,6 @@ from datetime import datetime
 from parsers.model import CheckNewsModel
 from utils.func import write_to_file_json
 import ssl
-import requests
 import urllib3
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -71,50 +70,6 @@ class NewsCrownprinceBh(CheckNewsModel):
         finally:
             write_to_file_json(self.filename_exeption, self.exception_links)
 
-    def convert_arabic_date_to_iso(self, arabic_date: str) -> str:
-        """
-        Convert Arabic date format to ISO format (YYYY-MM-DD)
-
-        Args:
-            arabic_date: Date in Arabic format (e.g. "3 أغسطس 2014")
-
-        Returns:
-            Date in ISO format (e.g. "2014-08-03") or None if conversion fails
-        """
-        try:
-            # First, convert any Arabic numerals to Western numerals
-            for ar, en in self.arabic_to_western().items():
-                arabic_date = arabic_date.replace(ar, en)
-
-            # Split the date into parts
-            parts = arabic_date.split()
-            if len(parts) != 3:
-                self.logger.warning(f"Unexpected date format: {arabic_date}")
-                return None
-
-            day = parts[0].zfill(2)  # Pad with leading zero if needed
-
-            # Try both Arabic month dictionaries
-            month_name = parts[1]
-            month_en = self.arabic_months_dict().get(month_name)
-
-            if not month_en:
-                month_en = self.arabic_months_dict_second().get(month_name)
-
-            if not month_en:
-                self.logger.warning(f"Unknown month: {month_name} in date {arabic_date}")
-                return None
-
-            year = parts[2]
-
-            # Convert to datetime for validation and formatting
-            date_obj = datetime.strptime(f"{day} {month_en} {year}", "%d %B %Y")
-            return date_obj.strftime("%Y-%m-%d")
-        except Exception as ex:
-            # Log the error and return None
-            self.logger.error(f"Error converting date '{arabic_date}': {ex}")
-            return None
-
     def check_date(self, date_str: str) -> bool:
         """
         Check if the date is within the acceptable range
@@ -146,8 +101,6 @@ class NewsCrownprinceBh(CheckNewsModel):
         Returns:
             List of dictionaries with links and dates
         """
-        from bs4 import BeautifulSoup
-
         links = []
         links_set = set()
 
@@ -158,7 +111,7 @@ class NewsCrownprinceBh(CheckNewsModel):
         else:
             html_content = response_text
 
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self.parse_html(html_content)
 
         items = soup.find_all('div', class_='item')
 
@@ -195,10 +148,6 @@ class NewsCrownprinceBh(CheckNewsModel):
                 links_set.add(link)
                 self.all_seen_links.add(link)
 
-                # Check if the link has already been processed in previous runs
-                if self.db_check_link(link, self.speaker):
-                    continue
-
                 result = {
                     'link': link,
                     'date': date
@@ -206,7 +155,8 @@ class NewsCrownprinceBh(CheckNewsModel):
 
                 links.append(result)
 
-        return links
+        # Drop links that have already been processed in previous runs
+        return self.db_filter_new_links(links, self.speaker, field='link')
 
     def get_links_content(self, datas: list, search_keyword: str) -> None:
         for data in datas:
@@ -219,7 +169,7 @@ class NewsCrownprinceBh(CheckNewsModel):
                 if not page_content:
                     continue
 
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 res = self.get_result_dict(search_keyword, self.domain, link, self.speaker, self.country)
                 text_list = [p.get_text(strip=True) for p in soup.find_all("p")]
                 full_text = " ".join(text_list)
@@ -241,15 +191,8 @@ class NewsCrownprinceBh(CheckNewsModel):
                 res['news_date'] = iso_date
 
                 print(res)
-                # Update with AWS Bedrock check and handle possible errors
-                try:
-                    bedrock_result = self.check_aws_bedrock(self.speaker, res)
-                    res.update(bedrock_result)
-                except Exception as bedrock_ex:
-                    self.logger.error(f"AWS Bedrock error: {bedrock_ex}, link: {link}")
-                    res.update({'is_about': False, 'explanation': 'Error in AWS Bedrock processing'})
-
-                self.db_client.insert_row(res)
+                # Classified by the Bedrock workers, errors come back as an 'error' verdict
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
                 # Add the failed link to exception_links to avoid retrying
@@ -259,133 +202,79 @@ class NewsCrownprinceBh(CheckNewsModel):
     def get_news_create(self, createdby: BeautifulSoup) -> str:
         if not createdby:
             return '', True
-        arabic_date = createdby.get_text()
-        arabic_months_dict = self.arabic_months_dict()
-        day, arabic_month, year = arabic_date.split()
-        month = arabic_months_dict.get(arabic_month)
-        date_obj = datetime.strptime(f"{day} {month} {year}", "%d %B %Y")
+        date_obj = self.parse_arabic_date(createdby.get_text())
         stop_parse = False
         if date_obj < self.stop_date_create:
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            self.logger.error(f'Maximum retries exceeded for news content. Link: {link}')
-            return None
-
-        try:
-            # Try direct connection first if proxies are causing issues
-            use_proxy = count_try < self.max_count_try // 2
-            proxies = self.get_proxy() if use_proxy else None
-
-            if not use_proxy:
-                self.logger.info(f"Attempting direct connection without proxy after {count_try} failed attempts")
-
-            # Use requests directly for consistency instead of mixing with cloudscraper
-            response = requests.get(
-                link,
-                proxies=proxies,
-                headers=self.get_headers(),
-                verify=False,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.text
-
-        except Exception as ex:
-            # Log different types of errors differently
-            if "ProxyError" in str(ex):
-                self.logger.warning(f"Proxy error on attempt {count_try + 1}: {ex}")
-            elif "ConnectionError" in str(ex) or "Connection refused" in str(ex):
-                self.logger.warning(f"Connection error on attempt {count_try + 1}: {ex}")
-            elif "Timeout" in str(ex):
-                self.logger.warning(f"Timeout error on attempt {count_try + 1}: {ex}")
-            else:
-                self.logger.warning(f"Error on attempt {count_try + 1}: {ex}")
-
-            # Increase backoff time with each retry
-            import time
-            backoff_time = 2 * (count_try + 1)  # Progressive backoff
-            time.sleep(backoff_time)
-
-        return self.news_content_response(link, count_try + 1)
-
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link):
+            with attempt:
+                try:
+                    # Use requests directly for consistency instead of mixing with cloudscraper
+                    response = self.request_chain('GET', link, self.get_fetch_chain(), headers=self.get_headers(),
+                                                  verify=False, timeout=30)
+                    return response.text
+                except Exception as ex:
+                    self.log_attempt_error(attempt, ex)
+                    raise
+        self.logger.error(f'Maximum retries exceeded for news content. Link: {link}')
+        return None
+
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
         """
         Alternative implementation using the requests library directly
         instead of cloudscraper, in case the SSL issues persist.
         """
-        if count_try > self.max_count_try:
-            self.logger.error(f'Maximum retries exceeded. Keywords: {news_keyword}, Page: {page}')
-            return ""  # Return empty string instead of raising exception to continue with other keywords
-
-        try:
-            import requests
-            from requests.packages.urllib3.exceptions import InsecureRequestWarning
-
-            # Suppress only the specific InsecureRequestWarning
-            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-
-            cookies = {
-                'wp-wpml_current_language': 'ar',
-            }
-
-            data = {
-                'action': 'ajaxsearchpro_search',
-                'aspp': news_keyword,
-                'asid': '1',
-                'asp_inst_id': '1_1',
-                'options': f'filters_initial=1&filters_changed=0&wpml_lang=ar&qtranslate_lang=0&current_page_id=2',
-                'asp_call_num': page
-            }
-
-            # Try direct connection first if proxies are causing issues
-            use_proxy = count_try < self.max_count_try // 2
-            proxies = self.get_proxy() if use_proxy else None
-
-            if not use_proxy:
-                self.logger.info(f"Attempting direct connection without proxy after {count_try} failed attempts")
-
-            session = requests.Session()
-
-            response = session.post(
-                'https://www.crownprince.bh/user-ajax.php',
-                data=data,
-                headers=self.get_headers(),
-                cookies=cookies,
-                proxies=proxies,
-                verify=False,
-                timeout=30
-            )
-
-            response.raise_for_status()
-            try:
-                return response.json()
-            except ValueError:
-                return response.text
-
-        except Exception as ex:
-            # Log different types of errors differently
-            if "ProxyError" in str(ex):
-                self.logger.warning(f"Proxy error on attempt {count_try + 1}: {ex}")
-            elif "ConnectionError" in str(ex) or "Connection refused" in str(ex):
-                self.logger.warning(f"Connection error on attempt {count_try + 1}: {ex}")
-            elif "Timeout" in str(ex):
-                self.logger.warning(f"Timeout error on attempt {count_try + 1}: {ex}")
-            else:
-                self.logger.error(f"Error on attempt {count_try + 1}: {ex}")
-
-            # Increase backoff time with each retry
-            import time
-            backoff_time = 2 * (count_try + 1)  # Progressive backoff
-            self.logger.info(f"Waiting {backoff_time} seconds before retry")
-            time.sleep(backoff_time)
-
-            return self.get_response(news_keyword, page, count_try + 1)
-        finally:
-            if 'session' in locals():
-                session.close()
+        cookies = {
+            'wp-wpml_current_language': 'ar',
+        }
+
+        data = {
+            'action': 'ajaxsearchpro_search',
+            'aspp': news_keyword,
+            'asid': '1',
+            'asp_inst_id': '1_1',
+            'options': f'filters_initial=1&filters_changed=0&wpml_lang=ar&qtranslate_lang=0&current_page_id=2',
+            'asp_call_num': page
+        }
+
+        url = 'https://www.crownprince.bh/user-ajax.php'
+        for attempt in self.retrying(url):
+            with attempt:
+                try:
+                    response = self.request_chain('POST', url,
+                                                  self.get_fetch_chain(), pattern='search', data=data,
+                                                  headers=self.get_headers(), cookies=cookies, verify=False,
+                                                  timeout=30)
+                    try:
+                        return response.json()
+                    except ValueError:
+                        return response.text
+                except Exception as ex:
+                    self.log_attempt_error(attempt, ex)
+                    raise
+        self.logger.error(f'Maximum retries exceeded. Keywords: {news_keyword}, Page: {page}')
+        return ""  # Return empty string instead of raising exception to continue with other keywords
+
+    def get_fetch_chain(self) -> list[dict]:
+        # Direct connection is the fallback when proxies are causing issues
+        return [
+            {'name': 'proxy', 'transport': 'requests'},
+            {'name': 'direct', 'transport': 'requests', 'use_proxy': False},
+        ]
+
+    def log_attempt_error(self, attempt, ex: Exception) -> None:
+        # Log different types of errors differently
+        if "ProxyError" in str(ex):
+            self.logger.warning(f"Proxy error on attempt {attempt.number + 1}: {ex}")
+        elif "ConnectionError" in str(ex) or "Connection refused" in str(ex):
+            self.logger.warning(f"Connection error on attempt {attempt.number + 1}: {ex}")
+        elif "Timeout" in str(ex):
+            self.logger.warning(f"Timeout error on attempt {attempt.number + 1}: {ex}")
+        else:
+            self.logger.warning(f"Error on attempt {attempt.number + 1}: {ex}")
 
     def get_headers(self) -> dict:
         return {
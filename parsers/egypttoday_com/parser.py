@@ -1,4 +1,3 @@
-import cloudscraper
 from bs4 import BeautifulSoup
 from datetime import datetime
 from parsers.model import CheckNewsModel
@@ -30,24 +29,22 @@ class NewsEgypttoday(CheckNewsModel):
         finally:
             write_to_file_json(self.filename_exeption, self.exception_links)
 
+    def get_result_region(self) -> dict:
+        return {'container': 'div.Sectionnewsitem', 'fields': {'date': (None, 'data-id'), 'link': ('a', 'href')}}
+
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
-        titles = soup.find_all('div', class_='Sectionnewsitem')
-        if not titles:
+        records = self.extract_results(search_news)
+        if not records:
             return None
-        for title in titles:
-            date_block = title.get('data-id')
-            if date_block:
-                date_obj = datetime.strptime(date_block, "%m/%d/%Y %I:%M:%S %p")
+        for record in records:
+            if record['date']:
+                date_obj = datetime.strptime(record['date'], "%m/%d/%Y %I:%M:%S %p")
                 if date_obj < self.stop_date_create:
                     continue
-            a_teg = title.find('a')
-            if a_teg:
-                link = self.domain + a_teg.get('href')
-                if not self.db_check_link(link, self.speaker):
-                    links.append(link)
-        return links
+            if record['link']:
+                links.append(self.domain + record['link'])
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, links: list, search_keyword: str) -> None:
         for link in links:
@@ -55,7 +52,7 @@ class NewsEgypttoday(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 date, stop_parse = self.get_news_create(soup.find('meta',{'property':'article:published_time'}))
                 if stop_parse:
                     self.exception_links.append(link)
@@ -64,8 +61,7 @@ class NewsEgypttoday(CheckNewsModel):
                 res['news_title']=self.clear_text(soup.find('h1',class_='ArticleTitleH1').get_text())
                 res['news_body']=self.clear_text(soup.find('div',class_='ArticleDescription').get_text())
                 res['news_date']=date
-                res.update(self.check_aws_bedrock(self.speaker, res, lang='en'))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res, lang='en')
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
@@ -79,37 +75,22 @@ class NewsEgypttoday(CheckNewsModel):
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link)
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            params = {
-                'title': f'{news_keyword}',
-                'pageNum': f'{page}',
-                '_': '1738676084058',
-            }
-            response = client.get('https://www.egypttoday.com/Article/LoadMoreSearchArt', params=params, proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
+        url = 'https://www.egypttoday.com/Article/LoadMoreSearchArt'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                params = {
+                    'title': f'{news_keyword}',
+                    'pageNum': f'{page}',
+                    '_': '1738676084058',
+                }
+                response = self.request('GET', url, params=params)
+                response.raise_for_status()
+                return response.text
@@ -0,0 +1,288 @@
+import os
+from functools import lru_cache
+from io import BytesIO
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# Attributes BeautifulSoup returns as a list of tokens
+MULTI_VALUED = {'class', 'rel', 'rev', 'accept-charset', 'headers', 'accesskey', 'dropzone'}
+SKIPPED_TEXT = {'script', 'style', 'template'}
+
+
+class LxmlString(str):
+    """A text node, with its parent element like bs4's NavigableString."""
+    def __new__(cls, value: str, parent: 'LxmlNode'):
+        string = super().__new__(cls, value)
+        string.parent = parent
+        return string
+
+
+class LxmlNode:
+    """
+    lxml element behind the subset of the BeautifulSoup Tag API the parsers
+    use: find/find_all/find_next by tag, class_, id and attrs, CSS select,
+    get_text/text/string, attribute access, parent, name and decompose.
+    Any other Tag attribute raises AttributeError instead of falling back
+    to bs4's tag.child_name lookup, so unsupported code fails loudly.
+    """
+    def __init__(self, element, is_root: bool = False):
+        self.element = element
+        self.is_root = is_root
+
+    def __getattr__(self, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        raise AttributeError(f"LxmlNode does not support BeautifulSoup's .{name}, add it to LxmlNode or parse "
+                             f"this page with parse_html(html, 'soup')")
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, LxmlNode) and other.element is self.element
+
+    def __hash__(self) -> int:
+        return id(self.element)
+
+    def __repr__(self) -> str:
+        return etree.tostring(self.element, encoding='unicode', with_tail=False)
+
+    __str__ = __repr__
+
+    @property
+    def name(self) -> str:
+        return self.element.tag
+
+    @property
+    def parent(self) -> 'LxmlNode | None':
+        parent = self.element.getparent()
+        return LxmlNode(parent) if parent is not None else None
+
+    @property
+    def attrs(self) -> dict:
+        return {key: self.get(key) for key in self.element.attrib}
+
+    def get(self, key: str, default=None):
+        value = self.element.get(key)
+        if value is None:
+            return default
+        return value.split() if key in MULTI_VALUED else value
+
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def has_attr(self, key: str) -> bool:
+        return key in self.element.attrib
+
+    # Text
+
+    def _strings(self, element, top: bool = True):
+        if not isinstance(element.tag, str):
+            return
+        if top or element.tag not in SKIPPED_TEXT:
+            if element.text:
+                yield element.text
+            for child in element:
+                yield from self._strings(child, False)
+                if child.tail:
+                    yield child.tail
+
+    def _text_nodes(self, element):
+        """Text nodes in document order, each with the element that holds it."""
+        if not isinstance(element.tag, str) or element.tag in SKIPPED_TEXT:
+            return
+        if element.text:
+            yield LxmlString(element.text, LxmlNode(element))
+        for child in element:
+            yield from self._text_nodes(child)
+            if child.tail:
+                yield LxmlString(child.tail, LxmlNode(element))
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        strings = self._strings(self.element)
+        if strip:
+            strings = (string.strip() for string in strings)
+            strings = (string for string in strings if string)
+        return separator.join(strings)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    @property
+    def string(self) -> LxmlString | None:
+        """Like bs4: the only child if it is text, or the .string of the only child element, else None."""
+        element = self.element
+        while True:
+            if len(element) == 0:
+                return LxmlString(element.text, LxmlNode(element)) if element.text else None
+            if len(element) > 1 or element.text or element[0].tail:
+                return None
+            element = element[0]
+            if not isinstance(element.tag, str):
+                # A lone comment, which bs4 also returns
+                return LxmlString(element.text or '', LxmlNode(element.getparent()))
+
+    # Search
+
+    def _matches(self, element, name, class_, id, attrs: dict) -> bool:
+        if not isinstance(element.tag, str):
+            return False
+        if name is not None:
+            names = name if isinstance(name, (list, tuple, set)) else (name,)
+            if element.tag not in names:
+                return False
+        if id is not None and element.get('id') != id:
+            return False
+        if class_ is not None:
+            classes = element.get('class')
+            if classes is None:
+                return False
+            # bs4 matches a single class token or the whole attribute value
+            if class_ not in classes.split() and class_ != classes:
+                return False
+        for key, value in attrs.items():
+            actual = element.get(key)
+            if value is True:
+                if actual is None:
+                    return False
+            elif actual != value:
+                return False
+        return True
+
+    def _candidates(self, recursive: bool = True):
+        if not recursive:
+            return iter(self.element)
+        if self.is_root:
+            return self.element.iter()
+        return self.element.iterdescendants()
+
+    def find_all(self, name=None, attrs: dict | None = None, recursive: bool = True, text=None, limit=None,
+                 class_=None, id=None, string=None, **kwargs) -> list:
+        if text is True or string is True:
+            return list(self._text_nodes(self.element))
+        attrs = {**(attrs or {}), **kwargs}
+        found = []
+        for element in self._candidates(recursive):
+            if self._matches(element, name, class_, id, attrs):
+                found.append(LxmlNode(element))
+                if limit and len(found) >= limit:
+                    break
+        return found
+
+    def find(self, name=None, attrs: dict | None = None, recursive: bool = True, class_=None, id=None,
+             **kwargs) -> 'LxmlNode | None':
+        found = self.find_all(name, attrs, recursive, limit=1, class_=class_, id=id, **kwargs)
+        return found[0] if found else None
+
+    def find_next(self, name=None, attrs: dict | None = None, class_=None, id=None, **kwargs) -> 'LxmlNode | None':
+        attrs = {**(attrs or {}), **kwargs}
+        for element in self.element.xpath('descendant::* | following::*'):
+            if self._matches(element, name, class_, id, attrs):
+                return LxmlNode(element)
+        return None
+
+    def select(self, selector: str) -> list:
+        return [LxmlNode(element) for element in compile_selector(selector)(self.element)]
+
+    def select_one(self, selector: str) -> 'LxmlNode | None':
+        found = compile_selector(selector)(self.element)
+        return LxmlNode(found[0]) if found else None
+
+    def decompose(self) -> None:
+        self.element.drop_tree()
+
+
+@lru_cache(maxsize=256)
+def compile_selector(selector: str):
+    return CSSSelector(selector, translator='html')
+
+
+def parse_lxml(html: str | bytes) -> LxmlNode:
+    if isinstance(html, str):
+        html = html.encode('utf8')
+    if not html.strip():
+        html = b'<html></html>'
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    return LxmlNode(lxml.html.document_fromstring(html, parser=parser), is_root=True)
+
+
+def parse_html(html: str | bytes, backend: str | None = None):
+    """
+    Parse a page for extraction. 'lxml' builds an LxmlNode tree, several
+    times faster than html.parser; 'soup' returns a BeautifulSoup tree. The
+    default, 'auto', uses lxml when it is installed and BeautifulSoup
+    otherwise. Both answer the same find/select/get_text API.
+    """
+    backend = backend or os.getenv("HTML_PARSER_BACKEND", "auto")
+    if backend == 'lxml' or (backend == 'auto' and LXML_AVAILABLE):
+        return parse_lxml(html)
+    return BeautifulSoup(html, 'html.parser')
+
+
+def split_container(container: str) -> tuple[str, str | None]:
+    """'div.list-items__item' -> ('div', 'list-items__item'), 'article' -> ('article', None)."""
+    tag, _, class_ = container.partition('.')
+    return tag, class_ or None
+
+
+def extract_record(node, fields: dict) -> dict:
+    """
+    One flat record from a result container. fields maps a record key to
+    (css selector inside the container or None for the container itself,
+    attribute name or None for the element's stripped text).
+    """
+    record = {}
+    for key, (selector, attribute) in fields.items():
+        element = node.select_one(selector) if selector else node
+        if element is None:
+            record[key] = None
+        elif attribute:
+            record[key] = element.get(attribute)
+        else:
+            record[key] = element.get_text(strip=True)
+    return record
+
+
+def extract_results(html: str | bytes, container: str, fields: dict, backend: str | None = None) -> list[dict]:
+    """
+    Parse only the result containers of a search page ('tag' or 'tag.class')
+    and return one record per container, see extract_record. BeautifulSoup
+    builds nothing outside the containers (SoupStrainer); lxml streams the
+    page and drops every container once its record is taken, so neither
+    holds a full tree of a large results page.
+    """
+    tag, class_ = split_container(container)
+    backend = backend or os.getenv("HTML_PARSER_BACKEND", "auto")
+    if backend == 'lxml' or (backend == 'auto' and LXML_AVAILABLE):
+        if isinstance(html, str):
+            html = html.encode('utf8')
+        if not html.strip():
+            return []
+        records = []
+        for _, element in etree.iterparse(BytesIO(html), events=('end',), tag=tag, html=True, encoding='utf-8',
+                                          recover=True):
+            if class_ is None or class_ in (element.get('class') or '').split():
+                records.append(extract_record(LxmlNode(element), fields))
+                element.clear(keep_tail=True)
+        return records
+    # While parsing, the strainer sees class as the raw attribute string, not a token list
+    if class_ is None:
+        strainer, matches = SoupStrainer(tag), {}
+    else:
+        strainer = SoupStrainer(tag, class_=lambda value: bool(value) and class_ in (
+            value.split() if isinstance(value, str) else value))
+        matches = {'class_': class_}
+    soup = BeautifulSoup(html, 'html.parser', parse_only=strainer)
+    return [extract_record(node, fields) for node in soup.find_all(tag, **matches)]
@@ -1,65 +1,251 @@
 import os
 import re
 import json
-import random
+import time
+import cloudscraper
+import requests
+from requests.structures import CaseInsensitiveDict
 from datetime import datetime, timedelta
-from proxies.proxy_manager import get_proxies
+from urllib.parse import urlparse
+from proxies.proxy_manager import get_proxy_registry
 from utils.logger import Logger
+from utils.site_run import current_site_run, SiteBudgetExceeded
 from db.core import PostgreSQLTable
+from db.seen_links import get_seen_links_index
+from db.writer import get_writer
+from db.cookie_store import get_cookie_store
+from network.async_fetcher import AsyncFetcher
+from network.session_pool import session_pool
+from network.retry import RetryPolicy, circuit_breakers
+from network.deadline import RequestTimeouts
+from network.hedging import get_hedger
+from network.host_limiter import get_host_limiter, is_challenge
+from network.strategy import strategy_memo
+from network.httpx_transport import httpx_pool
+from parsers.extraction import parse_html, extract_results
 from utils.func import load_from_file_json, write_to_file_json
+from utils.arabic_dates import parse_date, to_iso
 
 
 class Functions():
     def __init__(self):
-        self.max_count_try = 20
         self.stop_date_create = datetime.today() - timedelta(days=140)
-        self.proxies_list = get_proxies()
+        self.proxy_registry = get_proxy_registry()
+        self.proxy_registry.load()
+        self.sticky_proxy = os.getenv("PROXY_STICKY", "1") == "1"
+        self.hedging = os.getenv("HTTP_HEDGE", "0") == "1"
+        self.hedger = get_hedger()
         self.logger = Logger().get_logger(__name__)
         self.db_client = PostgreSQLTable(os.getenv("TABLE_NAME"))
+        self.seen_links = get_seen_links_index(os.getenv("TABLE_NAME"))
+        self.writer = get_writer(os.getenv("TABLE_NAME"))
+        # (news_link, speaker) of the articles queued for classification and not saved yet
+        self.in_flight = set()
+        self.site_run = current_site_run()
+        self.timeouts = RequestTimeouts(connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", 10)),
+                                        read=float(os.getenv("HTTP_READ_TIMEOUT", 30)),
+                                        total=float(os.getenv("HTTP_TOTAL_TIMEOUT", 90)))
+        self.host_limiter = get_host_limiter()
+        self.cookie_store = get_cookie_store()
+        self.retry_policy = RetryPolicy(max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", 6)),
+                                        base_delay=float(os.getenv("RETRY_BASE_DELAY", 1)),
+                                        max_delay=float(os.getenv("RETRY_MAX_DELAY", 30)),
+                                        abort_exceptions=(SiteBudgetExceeded,))
+        self.fetcher = AsyncFetcher(per_host_limit=int(os.getenv("FETCH_PER_HOST_LIMIT", 4)),
+                                    timeout=self.timeouts.total, connect_timeout=self.timeouts.connect,
+                                    read_timeout=self.timeouts.read, host_limiter=self.host_limiter,
+                                    retry_policy=self.retry_policy, proxy_registry=self.proxy_registry,
+                                    cookie_store=self.cookie_store)
 
-    def get_proxy(self) -> dict:
-        random.shuffle(self.proxies_list)
-        proxy = self.proxies_list[0]
+    def get_proxy(self, domain: str | None = None) -> dict:
+        """
+        Pick a proxy in the site's country when there is one. With a domain the
+        proxy stays the same for every request to it until the proxy fails.
+        """
+        proxy = self.proxy_registry.pick(domain if self.sticky_proxy else None, getattr(self, 'country', None))
         return {'http':proxy, 'https':proxy}
+
+    def get_proxy_excluding(self, proxy: str) -> dict:
+        other = self.proxy_registry.pick(None, getattr(self, 'country', None), exclude=proxy)
+        return {'http':other, 'https':other}
     
-    def arabic_months_dict(self) -> dict:
-        return {
-            "يناير": "January", 
-            "فبراير": "February", 
-            "مارس": "March", 
-            "أبريل": "April",
-            "مايو": "May", 
-            "يونيو": "June", 
-            "يوليو": "July", 
-            "أغسطس": "August",
-            "سبتمبر": "September", 
-            "أكتوبر": "October", 
-            "نوفمبر": "November", 
-            "ديسمبر": "December"
-        }
-    
-    def arabic_months_dict_second(self) -> dict:
-        return {
-            "كانون الثاني": "January",
-            "شباط": "February",
-            "آذار": "March",
-            "نيسان": "April",
-            "أيار": "May",
-            "حزيران": "June",
-            "تموز": "July",
-            "آب": "August",
-            "أيلول": "September",
-            "تشرين الأول": "October",
-            "تشرين الثاني": "November",
-            "كانون الأول": "December"
-        }
-            
-    def arabic_to_western(self) -> dict:
-        return {
-            "٠": "0", "١": "1", "٢": "2", "٣": "3", "٤": "4",
-            "٥": "5", "٦": "6", "٧": "7", "٨": "8", "٩": "9",
-        }
-    
+    def request(self, method: str, url: str, transport: str = 'cloudscraper', use_proxy: bool = True,
+                browser: dict | None = None, **kwargs) -> requests.Response:
+        """
+        Send a request through a pooled session for (transport, domain, proxy),
+        so keep-alive connections and Cloudflare clearance cookies are reused
+        between articles instead of being thrown away after every call.
+        transport is 'cloudscraper', 'requests' or 'httpx'; the latter keeps
+        one HTTP/2 client per domain for JSON and XHR endpoints.
+
+        Every call gets connect and read timeouts and a total deadline, all
+        clamped to the time the site and the run have left; a timeout
+        parameter from the caller replaces the default read timeout.
+        With HTTP_HEDGE=1, GETs through a proxy are hedged (see Hedger).
+        """
+        self.site_run.check_budget()
+        timeout, deadline = self.timeouts.for_request(kwargs.pop('timeout', None), self.site_run.remaining())
+        stream = kwargs.pop('stream', False)
+        domain = urlparse(url).netloc
+        proxies = self.get_proxy(domain) if use_proxy else None
+        if self.hedging and proxies and method.upper() in ('GET', 'HEAD') and not stream:
+            # A duplicate goes out through another proxy if this one lands in the domain's latency tail
+            def primary():
+                return self.send(method, url, transport, proxies, browser, timeout, deadline, stream, kwargs)
+
+            def backup():
+                other = self.get_proxy_excluding(proxies['http'])
+                return self.send(method, url, transport, other, browser, timeout, deadline, stream, kwargs)
+
+            return self.hedger.call(domain, primary, backup, lambda response: response.close())
+        return self.send(method, url, transport, proxies, browser, timeout, deadline, stream, kwargs)
+
+    def request_chain(self, method: str, url: str, chain: list[dict], pattern: str | None = None,
+                      **kwargs) -> requests.Response:
+        """
+        Try the strategies of a fallback chain in turn until one gets a
+        successful response. A strategy is a dict of request() arguments
+        (transport, use_proxy, browser, timeout, ...) with a name; kwargs are
+        shared by all of them. The chain is reordered by the strategy memo of
+        the domain, and of pattern when given, so the combination that worked
+        last is tried first. A fatal status such as 404 is raised at once.
+        """
+        domain = urlparse(url).netloc
+        last_error = None
+        for strategy in strategy_memo.order(domain, chain, pattern):
+            options = {key: value for key, value in strategy.items() if key != 'name'}
+            try:
+                response = self.request(method, url, **{**kwargs, **options})
+                response.raise_for_status()
+            except Exception as ex:
+                if self.retry_policy.classify(ex) in (RetryPolicy.FATAL, RetryPolicy.ABORT):
+                    raise
+                strategy_memo.record(domain, strategy['name'], False, pattern)
+                self.logger.debug(f"{strategy['name']} failed for {url}: {str(ex)[:100]}...")
+                last_error = ex
+                continue
+            strategy_memo.record(domain, strategy['name'], True, pattern)
+            return response
+        raise last_error
+
+    def get_api_chain(self) -> list[dict]:
+        """Fallback chain for JSON/XHR endpoints: a pooled HTTP/2 client first, cloudscraper if the site challenges it."""
+        return [
+            {'name': 'httpx', 'transport': 'httpx'},
+            {'name': 'cloudscraper', 'transport': 'cloudscraper'},
+        ]
+
+    def send(self, method: str, url: str, transport: str, proxies: dict | None, browser: dict | None,
+             timeout: tuple, deadline: float, stream: bool, kwargs: dict) -> requests.Response:
+        domain = urlparse(url).netloc
+        proxy = proxies['http'] if proxies else None
+        # The UA actually sent; Cloudflare only honours cf_clearance with the UA it was issued to,
+        # so sessions and stored cookies are kept apart per UA
+        user_agent = CaseInsensitiveDict(kwargs.get('headers') or {}).get('User-Agent')
+        key = (transport, domain, proxy, repr(browser), user_agent)
+        with self.host_limiter.slot(domain) as host_limit:
+            started_at = time.monotonic()
+            try:
+                if transport == 'httpx':
+                    response = httpx_pool.request(method, url, domain, proxy, timeout, deadline, **kwargs)
+                else:
+                    factory = lambda: self.create_session(transport, browser, domain, proxy, user_agent)
+                    with session_pool.session(key, factory) as client:
+                        cookies = self.cookie_store.fingerprint(client)
+                        response = client.request(method, url, proxies=proxies, timeout=timeout, stream=True,
+                                                  **kwargs)
+                        if not stream:
+                            self.timeouts.read_body(response, deadline)
+                        if self.cookie_store.fingerprint(client) != cookies:
+                            # New clearance or session cookies, share them with other processes and the next run
+                            self.cookie_store.save_from(client, domain, proxy,
+                                                        user_agent or client.headers.get('User-Agent', ''))
+            except requests.exceptions.Timeout:
+                self.site_run.increment('timeouts')
+                host_limit.on_response(False)
+                if proxies:
+                    self.proxy_registry.report(proxies['http'], False)
+                raise
+            except requests.exceptions.RequestException:
+                if proxies:
+                    self.proxy_registry.report(proxies['http'], False)
+                raise
+            latency = time.monotonic() - started_at
+            # Fast 2xx raise the host's concurrency, blocks and challenge pages cut it
+            blocked = response.status_code in (403, 429) or is_challenge(response.status_code, response.headers)
+            if blocked or response.status_code < 300:
+                host_limit.on_response(not blocked, latency)
+        # Blocks and proxy auth failures count against the proxy, other statuses are the site's
+        ok = response.status_code not in (403, 407, 429) and response.status_code < 500
+        if proxies:
+            self.proxy_registry.report(proxies['http'], ok, latency)
+        if ok:
+            self.hedger.tracker.record(domain, latency)
+        return response
+
+    def retrying(self, url: str, message: str | None = None, max_attempts: int | None = None):
+        """
+        Retry a block with the shared policy and the circuit breaker of the url's domain:
+
+            for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+                with attempt:
+                    return self.request('GET', link).text
+        """
+        breaker = circuit_breakers.get(urlparse(url).netloc or url)
+        return self.retry_policy.attempts(breaker, message, max_attempts)
+
+    def create_session(self, transport: str, browser: dict | None = None, domain: str | None = None,
+                       proxy: str | None = None, user_agent: str | None = None) -> requests.Session:
+        """New session preloaded with the stored cookies for (domain, proxy, user agent)."""
+        if transport == 'requests':
+            session = requests.Session()
+        elif browser:
+            session = cloudscraper.create_scraper(browser=browser)
+        else:
+            session = cloudscraper.create_scraper()
+        if domain:
+            self.cookie_store.load_into(session, domain, proxy, user_agent)
+        return session
+
+    def iter_pages(self, links: list, headers: dict | None = None, use_proxy: bool = True, verify_ssl: bool = True):
+        """
+        Download a batch of article links concurrently and yield (link, html)
+        pairs as they complete. html is None for links that could not be
+        fetched, callers should fall back to their news_content_response.
+        """
+        # The same sticky proxy per domain as request(), a failure reported by the fetcher moves it on
+        proxy_factory = (lambda host: self.get_proxy(host)['http']) if use_proxy else None
+        self.site_run.check_budget()
+        deadline = self.site_run.deadline
+        return self.fetcher.iter_completed(links, headers, proxy_factory, verify_ssl, deadline,
+                                           lambda: self.site_run.increment('timeouts'), self.site_run.concurrency)
+
+    def parse_html(self, html: str | bytes):
+        """Parse a page with the fastest installed backend, see parsers.extraction.parse_html."""
+        return parse_html(html)
+
+    def get_result_region(self) -> dict | None:
+        """
+        Where a search page keeps its results, for extract_results:
+        {'container': 'tag.class', 'fields': {key: (css selector or None, attribute or None)}}.
+        """
+        return None
+
+    def extract_results(self, html: str | bytes) -> list[dict]:
+        """
+        Records of the result containers declared by get_result_region, parsing
+        only those containers instead of building a tree of the whole page.
+        """
+        region = self.get_result_region()
+        return extract_results(html, region['container'], region['fields'])
+
+    def parse_arabic_date(self, text: str) -> datetime:
+        """First date in a piece of site text, see utils.arabic_dates.parse_date. Raises ValueError without one."""
+        date_obj = parse_date(text)
+        if date_obj is None:
+            raise ValueError(f"No date found in '{text}'")
+        return date_obj
+
     def get_search_terms(self, return_value: bool = False) -> list:
         # search_terms = {
         #     "إسرائيل": "Israel",
@@ -92,6 +278,33 @@ class Functions():
             return False
         return True
     
+    def db_existing_pairs(self, pairs: list[tuple]) -> set:
+        """
+        Return which (news_link, speaker) pairs are already stored, answering
+        a whole search page in one query instead of one db_check_link per link.
+        """
+        pairs = list(dict.fromkeys((link, str(speaker)) for link, speaker in pairs))
+        # Rows still queued for classification or buffered by the writer count as stored
+        pending = {pair for pair in pairs if pair in self.in_flight or self.writer.is_pending(*pair)}
+        pairs = [pair for pair in pairs if pair not in pending]
+        # Pairs the seen-links index has never stored are new, only its positives go to the DB
+        pairs = [pair for pair in pairs if self.seen_links.might_contain(*pair)]
+        if not pairs:
+            return pending
+        existing = self.db_client.get_existing_pairs(('news_link', 'speaker'), pairs)
+        if existing is None:
+            existing = {pair for pair in pairs if self.db_check_link(*pair)}
+        return existing | pending
+
+    def db_filter_new_links(self, items: list, speaker: str, field: str | None = None) -> list:
+        """
+        Keep the search results whose link is not stored yet for the speaker.
+        Items are links, or dicts holding the link under field.
+        """
+        links = [item[field] if field else item for item in items]
+        existing = self.db_existing_pairs([(link, speaker) for link in links])
+        return [item for item, link in zip(items, links) if (link, str(speaker)) not in existing]
+
     def clear_text(self, text: str) -> str:
         value = ''
         if text:
@@ -99,7 +312,13 @@ class Functions():
             value = re.sub(r"\s+", " ", value).strip()
         return value
     
+    def save_result(self, res: dict) -> None:
+        # Rows are written in batches, db_inserts is counted when the batch is flushed
+        self.writer.add(res, self.site_run)
+        self.seen_links.add(res['news_link'], str(res['speaker']))
+
     def get_result_dict(self, search_keyword: str, domain: str, link: str, speaker: str, country: str) -> dict:
+        self.site_run.increment('articles')
         return {
             'search_keyword':search_keyword,
             'source':domain,
@@ -128,35 +347,7 @@ class Functions():
         Returns:
             Date in ISO format (e.g. "2014-08-03") or None if conversion fails
         """
-        try:
-            # First, convert any Arabic numerals to Western numerals
-            for ar, en in self.arabic_to_western().items():
-                arabic_date = arabic_date.replace(ar, en)
-
-            parts = arabic_date.split()
-            if len(parts) != 3:
-                self.logger.warning(f"Unexpected date format: {arabic_date}")
-                return None
-
-            day = parts[0].zfill(2)  # Pad with leading zero if needed
-
-            # Try both Arabic month dictionaries
-            month_name = parts[1]
-            month_en = self.arabic_months_dict().get(month_name)
-
-            if not month_en:
-                month_en = self.arabic_months_dict_second().get(month_name)
-
-            if not month_en:
-                self.logger.warning(f"Unknown month: {month_name} in date {arabic_date}")
-                return None
-
-            year = parts[2]
-
-            # Convert to datetime for validation and formatting
-            date_obj = datetime.strptime(f"{day} {month_en} {year}", "%d %B %Y")
-            return date_obj.strftime("%Y-%m-%d")
-        except Exception as e:
-            # Log the error and return None
-            self.logger.error(f"Error converting date '{arabic_date}': {e}")
-            return None
\ No newline at end of file
+        iso_date = to_iso(arabic_date)
+        if not iso_date:
+            self.logger.warning(f"Unexpected date format: {arabic_date}")
+        return iso_date
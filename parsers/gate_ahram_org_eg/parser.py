@@ -1,4 +1,3 @@
-import cloudscraper
 import urllib.parse
 from bs4 import BeautifulSoup
 from datetime import datetime
@@ -33,10 +32,10 @@ class NewsGateAhramOrgEg(CheckNewsModel):
 
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
+        soup = self.parse_html(search_news)
         block = soup.find('div', id='ContentPlaceHolder1_resultDiv')
         if not block:
-            return links
+            return self.db_filter_new_links(links, self.speaker)
         block = block.find_next('div',class_='row')
         titles = [div for div in block.find_all("div") if div.has_attr("id")]
         if not titles:
@@ -56,9 +55,8 @@ class NewsGateAhramOrgEg(CheckNewsModel):
             a_teg = title.find('a')
             if a_teg:
                 link = a_teg.get('href')
-                if not self.db_check_link(link, self.speaker):
-                    links.append(link)
-        return links
+                links.append(link)
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, links: list, search_keyword: str) -> None:
         for link in links:
@@ -66,7 +64,7 @@ class NewsGateAhramOrgEg(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 date, stop_parse = self.get_news_create(soup.find('div',id='ContentPlaceHolder1_divdate'))
                 if stop_parse:
                     self.exception_links.append(link)
@@ -75,8 +73,7 @@ class NewsGateAhramOrgEg(CheckNewsModel):
                 res['news_title']=self.clear_text(soup.find('h1',id='ContentPlaceHolder1_divTitle').get_text())
                 res['news_body']=self.clear_text(soup.find('div',id='ContentPlaceHolder1_divContent').get_text())
                 res['news_date']=date
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
@@ -93,42 +90,26 @@ class NewsGateAhramOrgEg(CheckNewsModel):
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            params = {
-                'StartRowIndex': f'{page}',
-            }
-            encoded_search = urllib.parse.quote(news_keyword)
-            response = client.get(f'https://gate.ahram.org.eg/Search/{encoded_search}.aspx', 
-                                  params=params, 
-                                  headers=self.get_headers(),
-                                  proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
+        encoded_search = urllib.parse.quote(news_keyword)
+        url = f'https://gate.ahram.org.eg/Search/{encoded_search}.aspx'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                params = {
+                    'StartRowIndex': f'{page}',
+                }
+                response = self.request('GET', url, 
+                                        params=params, 
+                                        headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
     
     def get_headers(self) -> dict:
         return {
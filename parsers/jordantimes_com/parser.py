@@ -1,4 +1,3 @@
-import cloudscraper
 import re
 import urllib.parse
 from bs4 import BeautifulSoup
@@ -33,16 +32,17 @@ class NewsJordantimesCom(CheckNewsModel):
         finally:
             write_to_file_json(self.filename_exeption, self.exception_links)
 
+    def get_result_region(self) -> dict:
+        return {'container': 'li.search-result', 'fields': {'info': ('p.search-info', None), 'link': ('a', 'href')}}
+
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
-        titles = soup.find_all('li', class_='search-result')
-        if not titles:
+        records = self.extract_results(search_news)
+        if not records:
             return None
-        for title in titles:
-            search_info = title.find('p',class_='search-info')
-            if search_info:
-                text = search_info.get_text(strip=True)
+        for record in records:
+            text = record['info']
+            if text is not None:
                 match = re.search(r'(\d{2}/\d{2}/\d{4}) - (\d{2}:\d{2})', text)
                 if match:
                     date_part = match.group(1)
@@ -50,12 +50,9 @@ class NewsJordantimesCom(CheckNewsModel):
                     date_obj = datetime.strptime(f"{date_part} {time_part}", "%m/%d/%Y %H:%M")
                     if date_obj < self.stop_date_create:
                         continue
-                a_teg = title.find('a')
-                if a_teg:
-                    link = a_teg.get('href')
-                    if not self.db_check_link(link, self.speaker):
-                        links.append(link)
-        return links
+                if record['link']:
+                    links.append(record['link'])
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, links: list, search_keyword: str) -> None:
         for link in links:
@@ -63,7 +60,7 @@ class NewsJordantimesCom(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 date, stop_parse = self.get_news_create(soup.find('div',class_='news-info'))
                 if stop_parse:
                     self.exception_links.append(link)
@@ -72,8 +69,7 @@ class NewsJordantimesCom(CheckNewsModel):
                 res['news_title']=self.clear_text(soup.find('h1').get_text())
                 res['news_body']=self.clear_text(soup.find('div',class_='news-body').get_text())
                 res['news_date']=date
-                res.update(self.check_aws_bedrock(self.speaker, res, lang='en'))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res, lang='en')
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
@@ -90,38 +86,22 @@ class NewsJordantimesCom(CheckNewsModel):
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            encoded_search = urllib.parse.quote(news_keyword)
-            response = client.get(f'https://jordantimes.com/search/site/{encoded_search}?page={page}', 
-                                  proxies=self.get_proxy(), 
-                                  headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
+        encoded_search = urllib.parse.quote(news_keyword)
+        url = f'https://jordantimes.com/search/site/{encoded_search}?page={page}'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                response = self.request('GET', url, 
+                                        headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
     def get_headers(self) -> dict:
         return {
@@ -1,4 +1,3 @@
-import cloudscraper
 from bs4 import BeautifulSoup
 from datetime import datetime
 from parsers.model import CheckNewsModel
@@ -32,7 +31,7 @@ class NewsKingabdullahJo(CheckNewsModel):
 
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
+        soup = self.parse_html(search_news)
         titles = soup.find_all('h3', class_='field-content')
         if not titles:
             return None
@@ -50,9 +49,8 @@ class NewsKingabdullahJo(CheckNewsModel):
             a_teg = title.find('a')
             if a_teg:
                 link = self.domain + a_teg.get('href')
-                if not self.db_check_link(link, self.speaker):
-                    links.append(link)
-        return links
+                links.append(link)
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, links: list, search_keyword: str) -> None:
         for link in links:
@@ -60,7 +58,7 @@ class NewsKingabdullahJo(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 date, stop_parse = self.get_news_create(soup.find('span',{'property':'dc:date'}))
                 if stop_parse:
                     self.exception_links.append(link)
@@ -69,8 +67,7 @@ class NewsKingabdullahJo(CheckNewsModel):
                 res['news_title']=self.clear_text(soup.find('div',{'property':'dc:title'}).get_text())
                 res['news_body']=self.clear_text(soup.find('div',{'property':'content:encoded'}).get_text())
                 res['news_date']=date
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
@@ -85,45 +82,29 @@ class NewsKingabdullahJo(CheckNewsModel):
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            params = {
-                'search_api_views_fulltext': f'{news_keyword}',
-                'field_date[date]': '',
-                'field_date_1[date]': '',
-                'type': 'All',
-                'page': f'{page}',
-            }
-            response = client.get('https://www.kingabdullah.jo/ar/search', 
-                                  params=params, 
-                                  proxies=self.get_proxy(), 
-                                  headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
+        url = 'https://www.kingabdullah.jo/ar/search'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                params = {
+                    'search_api_views_fulltext': f'{news_keyword}',
+                    'field_date[date]': '',
+                    'field_date_1[date]': '',
+                    'type': 'All',
+                    'page': f'{page}',
+                }
+                response = self.request('GET', url, 
+                                        params=params, 
+                                        headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
     def get_headers(self) -> dict:
         return {
@@ -1,13 +1,11 @@
-import cloudscraper
 import urllib.parse
 from bs4 import BeautifulSoup
 from datetime import datetime
 from parsers.model import CheckNewsModel
+from utils.arabic_dates import parse_date, iter_dates
 from utils.func import write_to_file_json
-import requests
 import re
 import random
-import time
 
 
 class NewsMfaGovEg(CheckNewsModel):
@@ -100,7 +98,7 @@ class NewsMfaGovEg(CheckNewsModel):
 
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
+        soup = self.parse_html(search_news)
 
         # Find all tab panes with search results
         tab_content = soup.find('div', id='pills-tabContent')
@@ -133,10 +131,6 @@ class NewsMfaGovEg(CheckNewsModel):
                             self.logger.debug(f"Skipping exception link: {link}")
                             continue
 
-                        if self.db_check_link(link, self.speaker):
-                            self.logger.debug(f"Skipping already processed link: {link}")
-                            continue
-
                         # Try to extract date from URL if possible
                         date_match = re.search(r'/(\d{4})[/-](\d{1,2})[/-](\d{1,2})/', link)
                         if date_match:
@@ -155,7 +149,11 @@ class NewsMfaGovEg(CheckNewsModel):
                     self.logger.warning(f"Error processing search result item: {ex}")
                     continue
 
-        return links
+        # Check which links have already been processed in one query
+        new_links = self.db_filter_new_links(links, self.speaker)
+        if len(new_links) < len(links):
+            self.logger.debug(f"Skipping {len(links) - len(new_links)} already processed links")
+        return new_links
 
     def extract_date_from_content(self, soup: BeautifulSoup, news_body: str) -> tuple:
         """
@@ -196,69 +194,13 @@ class NewsMfaGovEg(CheckNewsModel):
                     except Exception:
                         pass
 
-        # Method 3: Try to extract date from the content using regex patterns
-        date_patterns = [
-            # Format: day month year (with Arabic or Western numerals)
-            r'(\d+)\s+(يناير|فبراير|مارس|أبريل|مايو|يونيو|يوليو|أغسطس|سبتمبر|أكتوبر|نوفمبر|ديسمبر)\s+(\d{4})',
-            r'([\u0660-\u0669]+)\s+(يناير|فبراير|مارس|أبريل|مايو|يونيو|يوليو|أغسطس|سبتمبر|أكتوبر|نوفمبر|ديسمبر)\s+([\u0660-\u0669]{4})',
-
-            # Format: day monthname year with specific day names (Thursday, etc.)
-            r'(الخميس|الجمعة|السبت|الأحد|الاثنين|الثلاثاء|الأربعاء)\s+(\d+)\s+(يناير|فبراير|مارس|أبريل|مايو|يونيو|يوليو|أغسطس|سبتمبر|أكتوبر|نوفمبر|ديسمبر)\s+(\d{4})',
-            r'يوم\s+(الخميس|الجمعة|السبت|الأحد|الاثنين|الثلاثاء|الأربعاء)\s+(\d+)\s+(يناير|فبراير|مارس|أبريل|مايو|يونيو|يوليو|أغسطس|سبتمبر|أكتوبر|نوفمبر|ديسمبر)\s+(\d{4})',
-
-            # Format for dates with Arabic numerals and different month naming
-            r'([\u0660-\u0669]+)\s+(كانون الثاني|شباط|آذار|نيسان|أيار|حزيران|تموز|آب|أيلول|تشرين الأول|تشرين الثاني|كانون الأول)\s+([\u0660-\u0669]{4})'
-        ]
-
-        # Prioritize dates in the first 500 characters (more likely to be publication date)
-        # and avoid dates in quotes which are often historical references
-        first_content = news_body[:500]
-        for pattern in date_patterns:
-            match = re.search(pattern, first_content)
-            if match:
-                try:
-                    groups = match.groups()
-                    # Handle different pattern formats
-                    if len(groups) == 3:
-                        day, month_arabic, year = groups
-                    elif len(groups) == 4:
-                        if 'يوم' in pattern:
-                            _, day, month_arabic, year = groups
-                        else:
-                            day, month_arabic, year = groups[1:]
-
-                    # Convert Arabic numerals if needed
-                    if day and ord(day[0]) >= 0x0660 and ord(day[0]) <= 0x0669:
-                        arabic_to_western = self.arabic_to_western()
-                        day = ''.join([arabic_to_western.get(c, c) for c in day])
-                        year = ''.join([arabic_to_western.get(c, c) for c in year])
-
-                    # Convert month name to English
-                    if 'كانون' in month_arabic or 'شباط' in month_arabic or 'آذار' in month_arabic:
-                        month_dict = self.arabic_months_dict_second()
-                    else:
-                        month_dict = self.arabic_months_dict()
-
-                    month = month_dict.get(month_arabic)
-
-                    if month:
-                        date_obj = datetime.strptime(f"{day} {month} {year}", "%d %B %Y")
-                        date = date_obj.strftime("%Y-%m-%d")
-                        if self.validate_date(date):
-                            return date, False
-                except Exception as ex:
-                    self.logger.debug(f"Error parsing content date: {ex}")
-
-        # Method 4: Look for YYYY-MM-DD format in content
-        date_match = re.search(r'(\d{4})[/\-](\d{1,2})[/\-](\d{1,2})', news_body)
-        if date_match:
-            try:
-                year, month, day = date_match.groups()
-                date = f"{year}-{int(month):02d}-{int(day):02d}"
+        # Method 3: dates written in the content, the first 500 characters first (more likely to be
+        # the publication date and not a historical reference), then the whole body
+        for content in (news_body[:500], news_body):
+            for date_obj in iter_dates(content):
+                date = date_obj.strftime("%Y-%m-%d")
                 if self.validate_date(date):
                     return date, False
-            except Exception as ex:
-                self.logger.debug(f"Error parsing YYYY-MM-DD date: {ex}")
 
         # No valid date found
         return "", True
@@ -271,6 +213,8 @@ class NewsMfaGovEg(CheckNewsModel):
             links: List of URLs to process
             search_keyword: Keyword used for searching
         """
+        # Direct requests without a proxy work for this site, so prefetch the batch that way
+        pages = dict(self.iter_pages(links, self.get_headers(), use_proxy=False, verify_ssl=False))
         for link in links:
             try:
                 if link in self.exception_links:
@@ -278,14 +222,14 @@ class NewsMfaGovEg(CheckNewsModel):
                     continue
 
                 self.logger.info(f"Processing link: {link}")
-                page_content = self.news_content_response(link)
+                page_content = pages.get(link) or self.news_content_response(link)
 
                 if not page_content:
                     self.logger.warning(f"Empty content received for link: {link}")
                     self.exception_links.append(link)
                     continue
 
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
 
                 # Extract news title - handle different page structures
                 title_element = soup.find('h2', class_='about-title')
@@ -351,13 +295,9 @@ class NewsMfaGovEg(CheckNewsModel):
                 res['news_body'] = news_body
                 res['news_date'] = date
 
-                # Check with AWS Bedrock for relevance
-                bedrock_result = self.check_aws_bedrock(self.speaker, res)
-                res.update(bedrock_result)
-
-                # Insert to database
-                self.db_client.insert_row(res)
-                self.logger.info(f"Successfully processed: {news_title[:50]}... (Date: {date})")
+                # Check with AWS Bedrock for relevance and insert to database in the background
+                self.classify_and_save(self.speaker, res)
+                self.logger.info(f"Queued for classification: {news_title[:50]}... (Date: {date})")
 
             except Exception as ex:
                 self.logger.error(f"{ex}, link: {link}")
@@ -369,29 +309,10 @@ class NewsMfaGovEg(CheckNewsModel):
             return '', True
 
         try:
-            arabic_date = createdby.get_text().strip()
-            arabic_months_dict = self.arabic_months_dict_second()
-            parts = arabic_date.split()
-
-            if len(parts) > 3:
-                day = parts[0]
-                arabic_month = parts[1] + ' ' + parts[2]
-                year = parts[3]
-            else:
-                day, arabic_month, year = parts
-
-            month = arabic_months_dict.get(arabic_month)
-            if not month:
+            date_obj = parse_date(createdby.get_text())
+            if not date_obj:
                 return '', True
 
-            # Convert Arabic numerals if needed
-            if ord(day[0]) >= 0x0660 and ord(day[0]) <= 0x0669:
-                arabic_to_western = self.arabic_to_western()
-                day = ''.join([arabic_to_western.get(c, c) for c in day])
-                year = ''.join([arabic_to_western.get(c, c) for c in year])
-
-            date_obj = datetime.strptime(f"{day} {month} {year}", "%d %B %Y")
-
             # Extra validation to avoid extremely old dates
             if date_obj.year < 2000:
                 return '', True
@@ -403,13 +324,13 @@ class NewsMfaGovEg(CheckNewsModel):
             self.logger.warning(f"Error parsing date: {ex}")
             return '', True
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
+    def news_content_response(self, link: str) -> str:
         """
-        Get the content of a news page with improved error handling and retry logic.
+        Get the content of a news page, trying the fetch chain in the order
+        that last worked for the site.
 
         Args:
             link: URL to fetch
-            count_try: Current retry attempt count
 
         Returns:
             str: HTML content of the page
@@ -417,160 +338,49 @@ class NewsMfaGovEg(CheckNewsModel):
         Raises:
             Exception: If maximum retry attempts are exceeded
         """
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-
-        try:
-            # Method 1: Simple requests with SSL verification disabled
-            try:
-                response = requests.get(
-                    link,
-                    verify=False,
-                    headers=self.get_headers(),
-                    timeout=30
-                )
-                response.raise_for_status()
-                return response.text
-            except requests.exceptions.RequestException as e:
-                self.logger.debug(f"Simple request failed: {str(e)[:100]}...")
-
-            # Method 2: Try with cloudscraper and proxy
-            try:
-                client = cloudscraper.create_scraper(
-                    browser={
-                        'browser': 'chrome',
-                        'platform': 'windows',
-                        'mobile': False
-                    }
-                )
-                client.verify = False  # Disable SSL verification
-
-                response = client.get(
-                    link,
-                    proxies=self.get_proxy(),
-                    headers=self.get_headers(),
-                    timeout=30
-                )
-                response.raise_for_status()
-                return response.text
-            except Exception as e:
-                self.logger.debug(f"Cloudscraper with proxy failed: {str(e)[:100]}...")
-            finally:
-                if 'client' in locals():
-                    client.close()
-
-            # Method 3: Try with requests session
-            try:
-                session = requests.Session()
-                session.verify = False
-                session.headers.update(self.get_headers())
-
-                response = session.get(link, timeout=45)
-                response.raise_for_status()
-                return response.text
-            except Exception as e:
-                self.logger.debug(f"Session request failed: {str(e)[:100]}...")
-                raise
-
-        except Exception as ex:
-            self.logger.warning(f"All request methods failed for {link}: {str(ex)[:100]}...")
-
-            # Implement exponential backoff with jitter
-            backoff = min(30, 2 ** count_try) + random.uniform(0, 1)
-            self.logger.info(f"Retrying in {backoff:.2f} seconds (attempt {count_try + 1}/{self.max_count_try})...")
-            time.sleep(backoff)
-
-        return self.news_content_response(link, count_try + 1)
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                try:
+                    response = self.request_chain('GET', link, self.get_fetch_chain(), pattern='news',
+                                                  headers=self.get_headers())
+                    return response.text
+                except Exception as ex:
+                    self.logger.warning(f"All request methods failed for {link}: {str(ex)[:100]}...")
+                    raise
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
         """
         Get search results with improved proxy handling and SSL verification bypass.
         """
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with response. News_keyword: {news_keyword}, Page: {page}')
-
         encoded_search = urllib.parse.quote(news_keyword)
         search_url = f'https://www.mfa.gov.eg/ar/Search?search={encoded_search}'
 
-        try:
-            # Method 1: Direct request without proxy - simplest approach
-            try:
-                # Disable SSL verification warnings
-                import urllib3
-                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-                response = requests.get(
-                    search_url,
-                    verify=False,
-                    headers=self.get_headers(),
-                    timeout=30
-                )
-                response.raise_for_status()
-                return response.text
-            except requests.exceptions.RequestException as e:
-                self.logger.debug(f"Direct request failed: {str(e)[:100]}...")
-
-            # Method 2: Try with cloudscraper and explicit proxy formatting
-            try:
-                client = cloudscraper.create_scraper(
-                    browser={
-                        'browser': 'chrome',
-                        'platform': 'windows',
-                        'mobile': False
-                    }
-                )
-                client.verify = False
-
-                # Get a proxy string that already contains auth credentials
-                proxy_str = random.choice(self.proxies_list)
-                proxies = {
-                    'http': proxy_str,
-                    'https': proxy_str
-                }
-
-                response = client.get(
-                    search_url,
-                    proxies=proxies,
-                    headers=self.get_headers(),
-                    timeout=30
-                )
-                response.raise_for_status()
-                return response.text
-            except Exception as e:
-                self.logger.debug(f"Cloudscraper with proxy failed: {str(e)[:100]}...")
-            finally:
-                if 'client' in locals():
-                    client.close()
-
-            # Method 3: Try with requests session and session-level proxy
-            try:
-                session = requests.Session()
-                session.verify = False
-                session.headers.update(self.get_headers())
-
-                # Get a different proxy
-                proxy_str = random.choice(self.proxies_list)
-                session.proxies = {
-                    'http': proxy_str,
-                    'https': proxy_str
-                }
-
-                response = session.get(search_url, timeout=45)
-                response.raise_for_status()
-                return response.text
-            except Exception as e:
-                self.logger.debug(f"Session request failed: {str(e)[:100]}...")
-                raise
-
-        except Exception as ex:
-            self.logger.warning(f"All request methods failed for {search_url}: {str(ex)[:100]}...")
-
-            # Implement exponential backoff
-            backoff = min(30, 2 ** count_try) + random.uniform(0, 1)
-            self.logger.info(f"Retrying in {backoff:.2f} seconds (attempt {count_try + 1}/{self.max_count_try})...")
-            time.sleep(backoff)
+        for attempt in self.retrying(search_url, f'Something wrong with response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                try:
+                    response = self.request_chain('GET', search_url, self.get_fetch_chain(), pattern='search',
+                                                  headers=self.get_headers())
+                    return response.text
+                except Exception as ex:
+                    self.logger.warning(f"All request methods failed for {search_url}: {str(ex)[:100]}...")
+                    raise
+
+    def get_fetch_chain(self) -> list[dict]:
+        return [
+            # Simple requests without a proxy and with SSL verification disabled
+            {'name': 'direct', 'transport': 'requests', 'use_proxy': False, 'verify': False, 'timeout': 30},
+            # Cloudscraper through a proxy
+            {'name': 'cloudscraper-proxy', 'browser': self.get_browser(), 'verify': False, 'timeout': 30},
+            # Plain requests through a proxy
+            {'name': 'requests-proxy', 'transport': 'requests', 'verify': False, 'timeout': 45},
+        ]
 
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_browser(self) -> dict:
+        return {
+            'browser': 'chrome',
+            'platform': 'windows',
+            'mobile': False
+        }
 
     def get_headers(self) -> dict:
         """
@@ -1,8 +1,7 @@
-import cloudscraper
 import urllib.parse
 from bs4 import BeautifulSoup
-from datetime import datetime
 from parsers.model import CheckNewsModel
+from parsers.webforms import WebFormsPager, WebFormsPage
 from utils.func import write_to_file_json
 
 
@@ -15,37 +14,37 @@ class NewsMfaGovJo(CheckNewsModel):
         self.country = 'Jordan'
         self.filename_exeption = 'parsers/mfa_gov_jo/exception_links.json'
         self.exception_links = self.get_exception_links(self.filename_exeption)
-        
+        self.pager = WebFormsPager(items='ul.ul1 li', link='a')
+
     def get(self) -> None:
         try:
             for news_keyword in self.get_search_terms():
-                page = 0
-                # while True:
-                search_news = self.get_response(news_keyword, page)
-                links = self.get_links_from_search_news(search_news)
-                    # if not links:
-                    #     break
-                self.get_links_content(links, news_keyword)
-                    # page += 1
+                self.pager.reset()
+                page_number = 1
+                search_news = self.get_response(news_keyword, page_number)
+                while search_news:
+                    page = self.pager.parse(search_news, page_number)
+                    if page.duplicate:
+                        break
+                    links = self.get_links_from_search_news(page)
+                    if not links:
+                        break
+                    self.get_links_content(links, news_keyword)
+                    # Search.aspx pages only when its results carry a postback pager
+                    if page.last_page or page.next_postback is None:
+                        break
+                    page_number += 1
+                    search_news = self.get_next_page(news_keyword, page)
         except Exception as ex:
             self.logger.error(ex)
         finally:
             write_to_file_json(self.filename_exeption, self.exception_links)
 
-    def get_links_from_search_news(self, search_news: str) -> list:
-        links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
-        block = soup.find('ul', class_='ul1')
-        titles = block.find_all('li')
-        if not titles:
+    def get_links_from_search_news(self, page: WebFormsPage) -> list:
+        if not page.links:
             return None
-        for title in titles:
-            a_teg = title.find('a')
-            if a_teg:
-                link = self.domain + a_teg.get('href')
-                if not self.db_check_link(link, self.speaker):
-                    links.append(link)
-        return links
+        links = [self.domain + link for link in page.links]
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, links: list, search_keyword: str) -> None:
         for link in links:
@@ -53,7 +52,7 @@ class NewsMfaGovJo(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 date, stop_parse = self.get_news_create(soup.find('span',id='ContentMain_lblDate'))
                 if stop_parse:
                     self.exception_links.append(link)
@@ -62,62 +61,45 @@ class NewsMfaGovJo(CheckNewsModel):
                 res['news_title']=self.clear_text(soup.find('span',id='ContentMain_lblContentTitle').get_text())
                 res['news_body']=self.clear_text(soup.find('span',id='ContentMain_lblBody').get_text())
                 res['news_date']=date
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
     def get_news_create(self, createdby: BeautifulSoup) -> str:
         if not createdby:
             return '', True
-        arabic_date = createdby.get_text()
-        arabic_months_dict = self.arabic_months_dict_second()
-        parts = arabic_date.split()
-        if len(parts) > 3:
-            day = parts[0]
-            arabic_month = parts[1] + ' ' + parts[2]
-            year = parts[3]
-        else:
-            day, arabic_month, year = parts
-        month = arabic_months_dict.get(arabic_month)
-        date_obj = datetime.strptime(f"{day} {month} {year}", "%d %B %Y")
+        date_obj = self.parse_arabic_date(createdby.get_text())
         stop_parse = False
         if date_obj < self.stop_date_create:
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            encoded_search = urllib.parse.quote(news_keyword)
-            response = client.get(f'https://www.mfa.gov.jo/Search.aspx?Search={encoded_search}', 
-                                  proxies=self.get_proxy(), 
-                                  headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
+        encoded_search = urllib.parse.quote(news_keyword)
+        url = f'https://www.mfa.gov.jo/Search.aspx?Search={encoded_search}'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                response = self.request('GET', url, 
+                                        headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
+
+    def get_next_page(self, news_keyword: str, page: WebFormsPage) -> str:
+        encoded_search = urllib.parse.quote(news_keyword)
+        url = f'https://www.mfa.gov.jo/Search.aspx?Search={encoded_search}'
+        headers = {**self.get_headers(), 'Content-Type': 'application/x-www-form-urlencoded'}
+        for attempt in self.retrying(url, f'Something wrong with postback. News_keyword: {news_keyword}, Page: {page.number + 1}'):
+            with attempt:
+                response = self.request('POST', url, data=page.postback_data(), headers=headers)
+                response.raise_for_status()
+                return response.text
 
     def get_headers(self) -> dict:
         return {
@@ -1,5 +1,7 @@
 import time
 import json
+import random
+import threading
 from typing import Optional, Any, List
 from llama_index.llms.bedrock import Bedrock
 from llama_index.core.constants import (DEFAULT_TEMPERATURE,)
@@ -10,6 +12,9 @@ from llama_index.core.bridge.pydantic import Field
 from llama_index.llms.bedrock.utils import *
 import os
 from parsers.functions import Functions
+from db.verdict_cache import get_verdict_cache
+from parsers.classifier import get_classification_pool, get_rate_limiter
+from utils.site_run import SiteBudgetExceeded
 
 
 CHAT_ONLY_MODELS['amazon.nova-lite-v1:0'] = 100000 
@@ -175,46 +180,220 @@ class AWSBoto(Bedrock):
         self.send(query)
         return self.message
 
-    def _request(self, attempt=4):
-        try:
-            chat_response = self.chat(self.requests)
-            self.message = chat_response.message.content
-            self.add_message(chat_response.message)
-        except Exception as err:
-            attempt = attempt - 1
-            if "Try your request again" in str(err) and attempt >= 0:
-                time.sleep(30)
-                self._request(attempt)
-            else: raise
+    def _request(self, attempt=4, base_delay=2.0, max_delay=60.0):
+        for retry in range(attempt + 1):
+            try:
+                chat_response = self.chat(self.requests)
+                self.message = chat_response.message.content
+                self.add_message(chat_response.message)
+                return
+            except Exception as err:
+                if not self.is_throttled(err) or retry == attempt:
+                    raise
+                # Exponential backoff with jitter so throttled workers do not retry in lockstep
+                delay = min(max_delay, base_delay * 2 ** retry)
+                time.sleep(delay / 2 + random.uniform(0, delay / 2))
+
+    def is_throttled(self, err: Exception) -> bool:
+        message = str(err)
+        return any(text in message for text in ("Try your request again", "ThrottlingException",
+                                                "Too many requests", "ServiceUnavailable"))
 
     def add_message(self, message):
         self.requests.append(message)
 
 
+def create_llm() -> AWSBoto:
+    return AWSBoto(os.getenv("AWS_MODEL"), 
+                   context_size=236000,
+                   region_name='us-east-1',
+                   )
+
+
 class CheckNewsModel(Functions):
+    # Bump whenever get_prompt changes so cached verdicts of the old prompt are not reused
+    PROMPT_VERSION = '1'
+
     def __init__(self):
         super().__init__()
-        self.llm = AWSBoto(os.getenv("AWS_MODEL"), 
-                           context_size=236000,
-                           region_name='us-east-1',
-                           )
+        self.llm = create_llm()
+        self.verdict_cache = get_verdict_cache()
+        self.classifier = get_classification_pool(create_llm)
+        self.rate_limiter = get_rate_limiter()
+        self.pending_classifications = 0
+        self._classified = threading.Condition()
+
+    def run(self) -> None:
+        """Parse the site, then wait until every queued article is classified and saved."""
+        try:
+            self.get()
+        finally:
+            self.wait_classifications()
+
+    def classify_and_save(self, speaker: str, res: dict, lang: str = 'ar') -> None:
+        """
+        Queue res for classification on the shared worker pool and return at once,
+        the verdict is merged into res and the row is saved by the worker.
+        """
+        def classify(llm):
+            res.update(self.check_aws_bedrock(speaker, res, lang, llm=llm))
+            self.save_result(res)
+
+        self.submit_classification(res, classify)
+
+    def classify_speakers_and_save(self, speakers: list[str], res: dict, lang: str = 'ar') -> None:
+        """
+        Queue res for one classification covering all speakers. The insert rule of
+        the multi-speaker sites is kept: the row of the first speaker is always
+        saved, the others only when the article is about them, and a row about a
+        speaker is saved under that speaker's name.
+        """
+        def classify(llm):
+            verdicts = self.check_aws_bedrock_speakers(speakers, res, lang, llm=llm)
+            for i, speaker in enumerate(speakers):
+                row = dict(res, **verdicts[speaker])
+                if row['is_about'] or i == 0:
+                    if row['is_about']:
+                        row['speaker'] = speaker
+                    self.save_result(row)
+
+        self.submit_classification(res, classify, speakers)
 
-    def check_aws_bedrock(self, speaker: str, news: dict, lang: str = 'ar') -> bool:
+    def submit_classification(self, res: dict, classify, speakers: list[str] | None = None) -> None:
+        # Until the worker saves the row, db_existing_pairs counts the article as stored,
+        # so the next keyword or page does not queue it again
+        pairs = {(res['news_link'], str(res['speaker']))}
+        pairs.update((res['news_link'], str(speaker)) for speaker in speakers or [])
+        with self._classified:
+            self.pending_classifications += 1
+            self.in_flight.update(pairs)
+
+        def done():
+            with self._classified:
+                self.pending_classifications -= 1
+                self.in_flight.difference_update(pairs)
+                self._classified.notify_all()
+
+        def job(llm):
+            try:
+                classify(llm)
+            except SiteBudgetExceeded as ex:
+                self.logger.warning(f"{ex}, link: {res.get('news_link')}")
+            except Exception as ex:
+                self.logger.error(f"{ex}, link: {res.get('news_link')}")
+            finally:
+                done()
+
+        def failed(ex):
+            self.site_run.increment('errors')
+            self.logger.error(f"No LLM client to classify with: {ex}, link: {res.get('news_link')}")
+            done()
+
+        self.classifier.submit(job, failed)
+
+    def wait_classifications(self) -> None:
+        with self._classified:
+            self._classified.wait_for(lambda: self.pending_classifications == 0)
+
+    def check_aws_bedrock(self, speaker: str, news: dict, lang: str = 'ar', llm: AWSBoto | None = None) -> bool:
+        llm = llm or self.llm
+        cache_key = self.verdict_cache.make_key(news.get('news_title'), news.get('news_body'), speaker,
+                                                self.PROMPT_VERSION, llm.model, lang)
+        verdict = self.verdict_cache.get(cache_key)
+        if verdict is not None:
+            self.site_run.increment('llm_cache_hits')
+            return verdict
+        self.site_run.check_budget()
         status = False
         try:
             article = f"{news.get('news_title')} \n{news.get('news_body')}"
             prompt = self.get_prompt(speaker, article, lang)
-            response = self.llm.as_chat(prompt)
-            self.llm.clear()
+            self.rate_limiter.acquire(len(prompt) // 3 + llm.max_tokens)
+            self.site_run.increment('llm_calls')
+            response = llm.as_chat(prompt)
+            llm.clear()
             print(response)
             if 'true' in str(response).strip().lower():
                 status = True
             response_json = json.loads(response)
+            # Error verdicts below are never cached so the article is retried next time
+            if isinstance(response_json, dict) and 'is_about' in response_json:
+                self.verdict_cache.put(cache_key, response_json)
             return response_json
         except Exception as ex:
             self.logger.error(ex)
         return {'is_about':status, 'explanation':'error'}
         
+    def check_aws_bedrock_speakers(self, speakers: list[str], news: dict, lang: str = 'ar',
+                                   llm: AWSBoto | None = None) -> dict:
+        """
+        Classify the article for several speakers with a single request and return
+        {speaker: {'is_about', 'explanation'}}. Speakers with a cached verdict are
+        left out of the prompt; a speaker missing from the answer gets an error verdict.
+        """
+        llm = llm or self.llm
+        prompt_version = f'{self.PROMPT_VERSION}-multi'
+        keys = {speaker: self.verdict_cache.make_key(news.get('news_title'), news.get('news_body'), speaker,
+                                                     prompt_version, llm.model, lang) for speaker in speakers}
+        verdicts = {}
+        for speaker in speakers:
+            verdict = self.verdict_cache.get(keys[speaker])
+            if verdict is not None:
+                self.site_run.increment('llm_cache_hits')
+                verdicts[speaker] = verdict
+        missing = [speaker for speaker in speakers if speaker not in verdicts]
+        if not missing:
+            return verdicts
+        self.site_run.check_budget()
+        try:
+            article = f"{news.get('news_title')} \n{news.get('news_body')}"
+            prompt = self.get_multi_speaker_prompt(missing, article, lang)
+            self.rate_limiter.acquire(len(prompt) // 3 + llm.max_tokens)
+            self.site_run.increment('llm_calls')
+            response = llm.as_chat(prompt)
+            llm.clear()
+            print(response)
+            response_json = json.loads(response)
+            for number, speaker in enumerate(missing, start=1):
+                verdict = response_json.get(str(number))
+                if isinstance(verdict, dict) and 'is_about' in verdict:
+                    verdicts[speaker] = {'is_about': verdict['is_about'], 'explanation': verdict.get('explanation')}
+                    self.verdict_cache.put(keys[speaker], verdicts[speaker])
+        except Exception as ex:
+            self.logger.error(ex)
+        for speaker in missing:
+            verdicts.setdefault(speaker, {'is_about': False, 'explanation': 'error'})
+        return verdicts
+
+    def get_multi_speaker_prompt(self, speakers: list[str], article: str, lang: str = 'ar') -> str:
+        if lang == 'ar':
+            search_keywords = ', '.join(self.get_search_terms())
+        else:
+            search_keywords = ', '.join(self.get_search_terms(return_value=True))
+        speakers_list = '\n'.join(f'{number}. {speaker}' for number, speaker in enumerate(speakers, start=1))
+        prompt = f"""
+Analyze the Arabic news article and determine, separately for each numbered speaker below, if that speaker personally made statements about the Israeli-Palestinian conflict.
+
+Speakers:
+{speakers_list}
+
+Instructions:
+- For a speaker return "True" if he made at least one relevant statement regarding the conflict.
+- Return "False" if the article only mentions the speaker but does not contain his direct statements on this topic.
+- Ignore mentions of the conflict if they are not statements made by that speaker, including statements made by the other listed speakers.
+- Ignore mentions of unrelated parties (e.g., Foreign Ministry employees or other government officials).
+- Ensure that statements attributed to the speaker are directly related to {search_keywords}.
+
+Article Data: 
+{article}
+Output Format (IMPORTANT):
+Please output your final answer **in valid JSON**: an object whose keys are the speaker numbers as strings ("1", "2", ...) and whose values are objects with exactly two fields:
+1. "is_about": a boolean (true or false),
+2. "explanation": a short explanation in English why this is true or false for that speaker, if you need to include words from other languages for explanation - you can.
+"""
+
+        return prompt
+
     def get_prompt(self, speaker: str, article: str, lang: str = 'ar') -> str:
         if lang == 'ar':
             search_keywords = ', '.join(self.get_search_terms())
@@ -1,6 +1,4 @@
-import cloudscraper
 import re
-from bs4 import BeautifulSoup
 from datetime import datetime
 from parsers.model import CheckNewsModel
 from utils.func import write_to_file_json
@@ -34,18 +32,19 @@ class NewsMofaGovAe(CheckNewsModel):
         finally:
             write_to_file_json(self.filename_exeption, self.exception_links)
 
+    def get_result_region(self) -> dict:
+        return {'container': 'div.item-info', 'fields': {'link': ('a', 'href')}}
+
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
-        titles = soup.find_all('div', class_='item-info')
-        if not titles:
+        records = self.extract_results(search_news)
+        if not records:
             self.parse_next = False
             return None
-        for title in titles:
+        for record in records:
             try:
-                a_teg = title.find('a')
-                if a_teg:
-                    link = a_teg.get('href')
+                link = record['link']
+                if link:
                     match = re.search(r"(\d{2})-(\d{2})-(\d{4})", link)
                     if not match:
                         continue
@@ -55,15 +54,14 @@ class NewsMofaGovAe(CheckNewsModel):
                         continue
                     date = date_obj.strftime("%Y-%m-%d")
                     link = self.domain + link
-                    if not self.db_check_link(link, self.speaker):
-                        res = {
-                            'link': link,
-                            'date': date
-                        }
-                        links.append(res)
+                    res = {
+                        'link': link,
+                        'date': date
+                    }
+                    links.append(res)
             except:
                 pass
-        return links
+        return self.db_filter_new_links(links, self.speaker, field='link')
     
     def get_links_content(self, datas: list, search_keyword: str) -> None:
         for data in datas:
@@ -72,7 +70,7 @@ class NewsMofaGovAe(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 res = self.get_result_dict(search_keyword, self.domain, link, self.speaker, self.country)
                 details_container = soup.find("div", class_="details-container")
                 full_text = ''
@@ -82,55 +80,38 @@ class NewsMofaGovAe(CheckNewsModel):
                 res['news_title']=self.clear_text(soup.find('div',class_='details-info').find('h2').get_text())
                 res['news_body']=self.clear_text(full_text)
                 res['news_date']=data['date']
-                res.update(self.check_aws_bedrock(self.speaker, res, lang='en'))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res, lang='en')
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 0, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            cookies = {
-                'ldsc#lang': 'en',
-            }
-            data = {
-                'query': f'{news_keyword}',
-                'page': f'{page}',
-                'templatesIDs[]': [
-                    '{2F75C8AF-35FC-4A88-B585-7595203F442C}',
-                    '{5EB1B0C0-2264-4A03-A89E-EF56737F2408}',
-                ],
-                'wordOptions': '1',
-            }
-            response = client.post('https://www.mofa.gov.ae/api/features/Search/advancedSearchResult', 
-                                  data=data,
-                                  proxies=self.get_proxy(), 
-                                  cookies=cookies)
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 0) -> str:
+        url = 'https://www.mofa.gov.ae/api/features/Search/advancedSearchResult'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                cookies = {
+                    'ldsc#lang': 'en',
+                }
+                data = {
+                    'query': f'{news_keyword}',
+                    'page': f'{page}',
+                    'templatesIDs[]': [
+                        '{2F75C8AF-35FC-4A88-B585-7595203F442C}',
+                        '{5EB1B0C0-2264-4A03-A89E-EF56737F2408}',
+                    ],
+                    'wordOptions': '1',
+                }
+                response = self.request('POST', url, 
+                                        data=data,
+                                        cookies=cookies)
+                response.raise_for_status()
+                return response.text
 
     def get_headers(self) -> dict:
         return {
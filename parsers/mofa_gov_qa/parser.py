@@ -1,9 +1,6 @@
-import cloudscraper
 import re
-from ummalqura.hijri_date import Umalqurra
-from bs4 import BeautifulSoup
-from datetime import datetime
 from parsers.model import CheckNewsModel
+from utils.hijri_calendar import hijri_to_gregorian
 from utils.func import write_to_file_json
 
 
@@ -32,27 +29,27 @@ class NewsMofaGovQa(CheckNewsModel):
         finally:
             write_to_file_json(self.filename_exeption, self.exception_links)
 
+    def get_result_region(self) -> dict:
+        return {'container': 'div.sf-search-results', 'fields': {'link': ('a', 'href')}}
+
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
-        titles = soup.find_all('div', class_='sf-search-results')
-        if not titles:
+        records = self.extract_results(search_news)
+        if not records:
             return None
-        for title in titles:
-            a_teg = title.find('a')
-            if a_teg:
-                link = a_teg.get('href')
+        for record in records:
+            link = record['link']
+            if link:
                 date_obj = self.extract_hijri_date_from_url(link)
                 if date_obj < self.stop_date_create:
                     continue
                 date = date_obj.strftime("%Y-%m-%d")
-                if not self.db_check_link(link, self.speaker):
-                    res = {
-                        'link': link,
-                        'date': date
-                    }
-                    links.append(res)
-        return links
+                res = {
+                    'link': link,
+                    'date': date
+                }
+                links.append(res)
+        return self.db_filter_new_links(links, self.speaker, field='link')
     
     def get_links_content(self, datas: list, search_keyword: str) -> None:
         for data in datas:
@@ -61,54 +58,37 @@ class NewsMofaGovQa(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 res = self.get_result_dict(search_keyword, self.domain, link, self.speaker, self.country)
                 res['news_title']=self.clear_text(soup.find('h3',class_='news-detail-title').get_text())
                 res['news_body']=self.clear_text(soup.find('div',class_='news-detail-content').get_text())
                 res['news_date']=data['date']
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            params = {
-                'indexCatalogue': 'mofasite',
-                'searchQuery': f'{news_keyword}',
-                'wordsMode': 'AllWords',
-                'orderBy': 'Newest',
-            }
-            response = client.get(f'https://mofa.gov.qa/search/{page}', 
-                                  params=params, 
-                                  proxies=self.get_proxy(), 
-                                  headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
+        url = f'https://mofa.gov.qa/search/{page}'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                params = {
+                    'indexCatalogue': 'mofasite',
+                    'searchQuery': f'{news_keyword}',
+                    'wordsMode': 'AllWords',
+                    'orderBy': 'Newest',
+                }
+                response = self.request('GET', url, 
+                                        params=params, 
+                                        headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
     def get_headers(self) -> dict:
         return {
@@ -124,6 +104,4 @@ class NewsMofaGovQa(CheckNewsModel):
         if not match:
             return None
         year, month, day = map(int, match.groups())
-        ummalqura = Umalqurra()
-        g_year, g_month, g_day = ummalqura.hijri_to_gregorian(year, month, day)
-        return datetime(g_year, g_month, g_day)
\ No newline at end of file
+        return hijri_to_gregorian(year, month, day)
\ No newline at end of file
@@ -1,9 +1,6 @@
-import requests
-from ummalqura.hijri_date import Umalqurra
-import unicodedata
 from bs4 import BeautifulSoup
-from datetime import datetime
 from parsers.model import CheckNewsModel
+from utils.hijri_calendar import hijri_month, hijri_to_gregorian
 from utils.func import write_to_file_json
 
 
@@ -30,7 +27,7 @@ class NewsMofaGovSa(CheckNewsModel):
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
         links_set = set()
-        soup = BeautifulSoup(search_news, 'html.parser')
+        soup = self.parse_html(search_news)
         titles = soup.find_all('div', class_='card-body')
         if not titles:
             return None
@@ -47,64 +44,47 @@ class NewsMofaGovSa(CheckNewsModel):
                             link = a_teg.get('href')
                             if link not in links_set:
                                 links_set.add(link)
-                                if not self.db_check_link(link, self.speaker):
-                                    res = {
-                                        'link':link,
-                                        'search_keyword':news_keyword,
-                                        'date':date_obj.strftime("%Y-%m-%d"),
-                                    }
-                                    links.append(res)
-                                    break
-        return links
+                                res = {
+                                    'link':link,
+                                    'search_keyword':news_keyword,
+                                    'date':date_obj.strftime("%Y-%m-%d"),
+                                }
+                                links.append(res)
+                                break
+        return self.db_filter_new_links(links, self.speaker, field='link')
     
     def get_links_content(self, datas: list) -> None:
-        for data in datas:
+        datas = {data['link']: data for data in datas if data['link'] not in self.exception_links}
+        for link, page_content in self.iter_pages(list(datas), self.get_headers()):
             try:
-                link = data['link']
-                if link in self.exception_links:
-                    continue
-                page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                data = datas[link]
+                if not page_content:
+                    page_content = self.news_content_response(link)
+                soup = self.parse_html(page_content)
                 res = self.get_result_dict(data['search_keyword'], self.domain, link, self.speaker, self.country)
                 res['news_title']=self.clear_text(soup.find('span',id='DeltaPlaceHolderPageTitleInTitleArea').get_text())
                 res['news_body']=self.clear_text(soup.find('div',class_='article-content').get_text())
                 res['news_date']=data['date']
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(ex)
 
     def get_news_create(self, createdby: BeautifulSoup) -> str:
         if not createdby:
             return '', True
-        arabic_date = createdby.get_text()
-        arabic_months_dict = self.arabic_months_dict()
-        day, arabic_month, year = arabic_date.split()
-        month = arabic_months_dict.get(arabic_month)
-        date_obj = datetime.strptime(f"{day} {month} {year}", "%d %B %Y")
+        date_obj = self.parse_arabic_date(createdby.get_text())
         stop_parse = False
         if date_obj < self.stop_date_create:
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            headers = self.get_headers()
-            response = requests.get(
-                url=link,
-                headers=headers,
-                proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            if 'response' in locals() and isinstance(response, requests.Response):
-                response.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                headers = self.get_headers()
+                with self.request('GET', link, transport='requests', headers=headers) as response:
+                    response.raise_for_status()
+                    return response.text
     
     def get_headers(self) -> dict:
         return {
@@ -115,28 +95,12 @@ class NewsMofaGovSa(CheckNewsModel):
                 "Connection": "keep-alive",
             } 
     
-    def normalize_arabic(self, text):
-        text = unicodedata.normalize("NFKC", text)
-        text = text.replace("ـ", "")
-        text = text.strip()
-        return text
-
     def hijri_to_gregorian(self, hijri_date: str):
-        hijri_months = {
-            "محرم": 1, "صفر": 2, "ربيع الأول": 3, "ربيع الثاني": 4, 
-            "جمادى الأولى": 5, "جمادى الأولىٰ": 5,
-            "جمادى الثانية": 6, "جمادى الآخرة": 6,
-            "رجب": 7, "شعبان": 8, "رمضان": 9, "شوال": 10, "ذو القعدة": 11, "ذو الحجة": 12
-        }
-        hijri_date = self.normalize_arabic(hijri_date)
-        parts = hijri_date.split("/")
+        parts = hijri_date.strip().split("/")
         if len(parts) != 3:
             raise ValueError(f"Некорректный формат даты: {hijri_date}")
         day, month_ar, year = parts
-        month_ar = month_ar.strip()
-        if month_ar not in hijri_months:
-            raise ValueError(f"Неизвестный арабский месяц: '{month_ar}'")
-        month = hijri_months[month_ar]
-        ummalqura = Umalqurra()
-        g_year, g_month, g_day = ummalqura.hijri_to_gregorian(int(year), month, int(day))
-        return datetime(g_year, g_month, g_day)
\ No newline at end of file
+        month = hijri_month(month_ar)
+        if month is None:
+            raise ValueError(f"Неизвестный арабский месяц: '{month_ar.strip()}'")
+        return hijri_to_gregorian(int(year), month, int(day))
\ No newline at end of file
@@ -1,4 +1,3 @@
-import cloudscraper
 import json
 from bs4 import BeautifulSoup
 from datetime import datetime
@@ -42,9 +41,8 @@ class NewsMohamedbinzayedAe(CheckNewsModel):
             return None
         for title in titles:
             link = self.domain + title['item']['url']
-            if not self.db_check_link(link, self.speaker):
-                links.append(link)
-        return links
+            links.append(link)
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, links: list, search_keyword: str) -> None:
         for link in links:
@@ -52,7 +50,7 @@ class NewsMohamedbinzayedAe(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 script = soup.find('script',id='__JSS_STATE__').text.strip()
                 data = json.loads(script).get("sitecore", {}).get("route", {})
                 value_date = data.get("fields", {}).get("Date", {}).get("value", None)
@@ -66,13 +64,12 @@ class NewsMohamedbinzayedAe(CheckNewsModel):
                     if component.get("componentName") == "Content":
                         description_value = component.get("fields", {}).get("Description", {}).get("value", '')
                         break
-                description = BeautifulSoup(description_value,'html.parser')
+                description = self.parse_html(description_value)
                 res = self.get_result_dict(search_keyword, self.domain, link, self.speaker, self.country)
                 res['news_title']=self.clear_text(soup.find('h1').get_text())
                 res['news_body']=self.clear_text(description.get_text())
                 res['news_date']=date
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
@@ -85,51 +82,34 @@ class NewsMohamedbinzayedAe(CheckNewsModel):
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link)
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 0, count_try: int = 0) -> dict:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            json_data = [
-                {
-                    'variables': {
-                        'pageSize': 6,
-                        'skip': f'{page}',
-                        'keyword': f'{news_keyword}',
-                        'filters': [],
-                        'language': 'ar',
-                    },
-                    'extensions': {
-                        'persistedQuery': {
-                            'version': 1,
-                            'sha256Hash': 'e59b7ed509b4cb3a0c0263e51d0d4aa06f0d26b7ef48f2e6a25e71a3df0a262b',
-                        },
+    def get_response(self, news_keyword: str, page: int = 0) -> dict:
+        json_data = [
+            {
+                'variables': {
+                    'pageSize': 6,
+                    'skip': f'{page}',
+                    'keyword': f'{news_keyword}',
+                    'filters': [],
+                    'language': 'ar',
+                },
+                'extensions': {
+                    'persistedQuery': {
+                        'version': 1,
+                        'sha256Hash': 'e59b7ed509b4cb3a0c0263e51d0d4aa06f0d26b7ef48f2e6a25e71a3df0a262b',
                     },
                 },
-            ]
-            response = client.post(f'https://www.mohamedbinzayed.ae/sitecore/api/graph/items/web',
-                                   json=json_data,
-                                   proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.json()[0]
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
\ No newline at end of file
+            },
+        ]
+        url = f'https://www.mohamedbinzayed.ae/sitecore/api/graph/items/web'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                response = self.request_chain('POST', url,
+                                              self.get_api_chain(), json=json_data)
+                return response.json()[0]
@@ -1,9 +1,6 @@
-import cloudscraper
 import re
-from ummalqura.hijri_date import Umalqurra
-from bs4 import BeautifulSoup
-from datetime import datetime
 from parsers.model import CheckNewsModel
+from utils.hijri_calendar import hijri_to_gregorian
 from utils.func import write_to_file_json
 
 
@@ -35,7 +32,7 @@ class NewsNyMissionQa(CheckNewsModel):
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
         links_set = set()
-        soup = BeautifulSoup(search_news, 'html.parser')
+        soup = self.parse_html(search_news)
         titles = soup.find_all('article')
         if not titles:
             return None
@@ -52,14 +49,13 @@ class NewsNyMissionQa(CheckNewsModel):
                             break
                         links_set.add(link)
                         date = date_obj.strftime("%Y-%m-%d")
-                        if not self.db_check_link(link, self.speaker):
-                            res = {
-                                'link': link,
-                                'date': date,
-                                'search_keyword':news_keyword,
-                            }
-                            links.append(res)
-        return links
+                        res = {
+                            'link': link,
+                            'date': date,
+                            'search_keyword':news_keyword,
+                        }
+                        links.append(res)
+        return self.db_filter_new_links(links, self.speaker, field='link')
     
     def get_links_content(self, datas: list) -> None:
         for data in datas:
@@ -68,31 +64,22 @@ class NewsNyMissionQa(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 article = soup.find('article')
                 res = self.get_result_dict(data['search_keyword'], self.domain, link, self.speaker, self.country)
                 res['news_title']=self.clear_text(article.find('h1').get_text())
                 res['news_body']=self.clear_text(soup.find('h3').get_text())
                 res['news_date']=data['date']
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
     def get_headers(self) -> dict:
         return {
@@ -108,6 +95,4 @@ class NewsNyMissionQa(CheckNewsModel):
         if not match:
             return None
         year, month, day = map(int, match.groups())
-        ummalqura = Umalqurra()
-        g_year, g_month, g_day = ummalqura.hijri_to_gregorian(year, month, day)
-        return datetime(g_year, g_month, g_day)
\ No newline at end of file
+        return hijri_to_gregorian(year, month, day)
\ No newline at end of file
@@ -1,6 +1,4 @@
-import cloudscraper
 from bs4 import BeautifulSoup
-from datetime import datetime
 from parsers.model import CheckNewsModel
 from utils.func import write_to_file_json
 
@@ -32,7 +30,7 @@ class NewsPresidencyEg(CheckNewsModel):
 
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
+        soup = self.parse_html(search_news)
         titles = soup.find_all('div', class_='card')
         if not titles:
             return None
@@ -40,9 +38,8 @@ class NewsPresidencyEg(CheckNewsModel):
             a_teg = title.find('a')
             if a_teg:
                 link = a_teg.get('href')
-                if not self.db_check_link(link, self.speaker):
-                    links.append(link)
-        return links
+                links.append(link)
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, links: list, search_keyword: str) -> None:
         for link in links:
@@ -50,7 +47,7 @@ class NewsPresidencyEg(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 date, stop_parse = self.get_news_create(soup.find('div',class_='category-type'))
                 if stop_parse:
                     self.exception_links.append(link)
@@ -59,57 +56,39 @@ class NewsPresidencyEg(CheckNewsModel):
                 res['news_title']=self.clear_text(soup.find('h1').get_text())
                 res['news_body']=self.clear_text(soup.find('div',class_='details-brief').get_text())
                 res['news_date']=date
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
     def get_news_create(self, createdby: BeautifulSoup) -> str:
         if not createdby:
             return '', True
-        arabic_date = createdby.get_text()
-        start_date, end_date = arabic_date.split(" - ")
-        converted_date = "".join(self.arabic_to_western().get(char, char) for char in start_date)    
-        date_obj = datetime.strptime(converted_date.strip(), "%d / %m / %Y")
+        # "dd / mm / yyyy - dd / mm / yyyy", the first date is the start
+        date_obj = self.parse_arabic_date(createdby.get_text())
         stop_parse = False
         if date_obj < self.stop_date_create:
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link)
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            params = {
-                'pageNumber': f'{page}',
-                'q': f'{news_keyword}',
-                'l1': '2306',
-                'l2': '-1',
-                'l3': '1',
-                'culture': 'ar-EG',
-            }
-            response = client.get('https://www.presidency.eg/Surface/Search/Get', params=params, proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
+        url = 'https://www.presidency.eg/Surface/Search/Get'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                params = {
+                    'pageNumber': f'{page}',
+                    'q': f'{news_keyword}',
+                    'l1': '2306',
+                    'l2': '-1',
+                    'l3': '1',
+                    'culture': 'ar-EG',
+                }
+                response = self.request_chain('GET', url,
+                                              self.get_api_chain(), params=params)
+                return response.text
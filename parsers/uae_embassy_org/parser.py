@@ -1,6 +1,4 @@
-import cloudscraper
 import re
-from bs4 import BeautifulSoup
 from datetime import datetime
 from parsers.model import CheckNewsModel
 from utils.func import write_to_file_json
@@ -34,7 +32,7 @@ class NewsUaeEmbassyOrg(CheckNewsModel):
 
     def get_links_from_search_news(self, search_news: str) -> list:
         links = []
-        soup = BeautifulSoup(search_news, 'html.parser')
+        soup = self.parse_html(search_news)
         titles = soup.find_all('h2', class_='title')
         if not titles:
             return None
@@ -42,9 +40,8 @@ class NewsUaeEmbassyOrg(CheckNewsModel):
             a_teg = title.find('a')
             if a_teg:
                 link = self.domain + a_teg.get('href')
-                if not self.db_check_link(link, self.speaker):
-                    links.append(link)
-        return links
+                links.append(link)
+        return self.db_filter_new_links(links, self.speaker)
     
     def get_links_content(self, datas: list, search_keyword: str) -> None:
         for data in datas:
@@ -53,7 +50,7 @@ class NewsUaeEmbassyOrg(CheckNewsModel):
                 if link in self.exception_links:
                     continue
                 page_content = self.news_content_response(link)
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 res = self.get_result_dict(search_keyword, self.domain, link, self.speaker, self.country)
                 details_container = soup.find("div", class_="details-container")
                 full_text = ''
@@ -63,47 +60,30 @@ class NewsUaeEmbassyOrg(CheckNewsModel):
                 res['news_title']=self.clear_text(soup.find('div',class_='details-info').find('h2').get_text())
                 res['news_body']=self.clear_text(full_text)
                 res['news_date']=data['date']
-                res.update(self.check_aws_bedrock(self.speaker, res, lang='en'))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res, lang='en')
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with news content. Link: {link}')
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link, f'Something wrong with news content. Link: {link}'):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
-    def get_response(self, news_keyword: str, page: int = 0, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            params = {
-                    'keys': f'{news_keyword}',
-                    'page': f'{page}',
-                }
-            response = client.get('https://www.uae-embassy.org/search/node', 
-                                  params=params,
-                                  proxies=self.get_proxy(),
-                                  headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 0) -> str:
+        url = 'https://www.uae-embassy.org/search/node'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                params = {
+                        'keys': f'{news_keyword}',
+                        'page': f'{page}',
+                    }
+                response = self.request('GET', url, 
+                                        params=params,
+                                        headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
 
     def get_headers(self) -> dict:
         return {
@@ -1,6 +1,4 @@
-import cloudscraper
 from bs4 import BeautifulSoup
-from datetime import datetime
 from parsers.model import CheckNewsModel
 from utils.func import write_to_file_json
 
@@ -34,7 +32,7 @@ class NewsUaeunOrg(CheckNewsModel):
     def get_links_from_search_news(self, search_news: dict) -> list:
         links = []
         links_set = set()
-        soup = BeautifulSoup(search_news["items"], 'html.parser')
+        soup = self.parse_html(search_news["items"])
         titles = soup.find_all('div', class_='event-card-item')
         if not titles:
             self.parse_next = False
@@ -49,13 +47,12 @@ class NewsUaeunOrg(CheckNewsModel):
                     link = a_teg.get('href')
                     if link not in links_set:
                         links_set.add(link)
-                        if not self.db_check_link(link, self.speaker):
-                            res = {
-                                'link': link,
-                                'date': date
-                            }
-                            links.append(res)
-        return links
+                        res = {
+                            'link': link,
+                            'date': date
+                        }
+                        links.append(res)
+        return self.db_filter_new_links(links, self.speaker, field='link')
     
     def get_links_content(self, datas: list, search_keyword: str) -> None:
         for data in datas:
@@ -66,7 +63,7 @@ class NewsUaeunOrg(CheckNewsModel):
                 page_content = self.news_content_response(link)
                 if not page_content:
                     continue
-                soup = BeautifulSoup(page_content, 'html.parser')
+                soup = self.parse_html(page_content)
                 res = self.get_result_dict(search_keyword, self.domain, link, self.speaker, self.country)
                 text_list = [p.get_text(strip=True) for p in soup.find_all("p")]
                 full_text = " ".join(text_list)
@@ -77,72 +74,52 @@ class NewsUaeunOrg(CheckNewsModel):
                 res['news_title']=self.clear_text(news_title)
                 res['news_body']=self.clear_text(full_text)
                 res['news_date']=data['date']
-                res.update(self.check_aws_bedrock(self.speaker, res))
-                self.db_client.insert_row(res)
+                self.classify_and_save(self.speaker, res)
             except Exception as ex:
                 self.logger.error(f'{ex}, link: {link}')
     
     def get_news_create(self, createdby: BeautifulSoup) -> str:
         if not createdby:
             return '', True
-        arabic_date = createdby.get_text()
-        arabic_months_dict = self.arabic_months_dict()
-        day, arabic_month, year = arabic_date.split()
-        month = arabic_months_dict.get(arabic_month)
-        date_obj = datetime.strptime(f"{day} {month} {year}", "%d %B %Y")
+        date_obj = self.parse_arabic_date(createdby.get_text())
         stop_parse = False
         if date_obj < self.stop_date_create:
             stop_parse = True
         return date_obj.strftime("%Y-%m-%d"), stop_parse
 
-    def news_content_response(self, link: str, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            print(f'Something wrong with news content. Link: {link}')
-            return None
-        try:
-            client = cloudscraper.create_scraper()
-            response = client.get(link, proxies=self.get_proxy(), headers=self.get_headers())
-            response.raise_for_status()
-            return response.text
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.news_content_response(link, count_try + 1)
+    def news_content_response(self, link: str) -> str:
+        for attempt in self.retrying(link):
+            with attempt:
+                response = self.request('GET', link, headers=self.get_headers())
+                response.raise_for_status()
+                return response.text
+        print(f'Something wrong with news content. Link: {link}')
+        return None
 
-    def get_response(self, news_keyword: str, page: int = 1, count_try: int = 0) -> str:
-        if count_try > self.max_count_try:
-            raise Exception(f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}')
-        try:
-            client = cloudscraper.create_scraper()
-            cookies = {
-                'wp-wpml_current_language': 'ar',
-            }
-            params = {
-                'action': 'contentmachine',
-                'page': f'{page}',
-                'post_type': 'statement',
-                'pillars': 'all',
-                'focus': 'all',
-                'count': '9',
-                'type': 'search',
-                'search': f'{news_keyword}',
-                'month': 'all',
-                'year': 'all',
-            }
-            response = client.get('https://uaeun.org/wp/wp-admin/admin-ajax.php', 
-                                  params=params, 
-                                  cookies=cookies,
-                                  proxies=self.get_proxy())
-            response.raise_for_status()
-            return response.json()
-        except Exception as ex:
-            # print(ex)
-            pass
-        finally:
-            client.close()
-        return self.get_response(news_keyword, page, count_try + 1)
+    def get_response(self, news_keyword: str, page: int = 1) -> str:
+        url = 'https://uaeun.org/wp/wp-admin/admin-ajax.php'
+        for attempt in self.retrying(url, f'Something wrong with bna_response. News_keyword: {news_keyword}, Page: {page}'):
+            with attempt:
+                cookies = {
+                    'wp-wpml_current_language': 'ar',
+                }
+                params = {
+                    'action': 'contentmachine',
+                    'page': f'{page}',
+                    'post_type': 'statement',
+                    'pillars': 'all',
+                    'focus': 'all',
+                    'count': '9',
+                    'type': 'search',
+                    'search': f'{news_keyword}',
+                    'month': 'all',
+                    'year': 'all',
+                }
+                response = self.request_chain('GET', url,
+                                              self.get_api_chain(),
+                                              params=params,
+                                              cookies=cookies)
+                return response.json()
     
     def get_headers(self) -> dict:
         return {
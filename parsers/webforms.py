@@ -0,0 +1,108 @@
+import hashlib
+import html as html_lib
+import re
+from parsers.extraction import parse_html
+
+
+# Hidden ASP.NET state inputs (__VIEWSTATE, __EVENTVALIDATION, ...), attributes in any order
+HIDDEN_INPUT = re.compile(r'<input\b[^>]*?\bname\s*=\s*["\'](__\w+)["\'][^>]*>', re.IGNORECASE)
+INPUT_VALUE = re.compile(r'\bvalue\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+DO_POSTBACK = re.compile(r'__doPostBack\(\s*[\'"]([^\'"]*)[\'"]\s*,\s*[\'"]([^\'"]*)[\'"]')
+
+
+def scan_form_fields(html: str) -> dict:
+    """
+    The hidden __* fields of a WebForms page read straight from the markup.
+    __VIEWSTATE alone is often hundreds of kilobytes, a regex over the raw
+    text is much cheaper than finding it in a parsed tree.
+    """
+    fields = {}
+    for match in HIDDEN_INPUT.finditer(html):
+        value = INPUT_VALUE.search(match.group(0))
+        if value:
+            fields[match.group(1)] = html_lib.unescape(value.group(1) if value.group(1) is not None else value.group(2))
+        else:
+            fields[match.group(1)] = ''
+    return fields
+
+
+def postback_of(anchor) -> tuple[str, str] | None:
+    """(event target, event argument) of a pager link, from its onclick or javascript: href."""
+    for attribute in ('onclick', 'href'):
+        match = DO_POSTBACK.search(anchor.get(attribute) or '')
+        if match:
+            return match.group(1), match.group(2)
+    return None
+
+
+class WebFormsPage:
+    """One parsed page of a WebForms search: result links, pager state and postback fields."""
+    def __init__(self, number: int, links: list[str], has_pager: bool, last_page: bool,
+                 next_postback: tuple[str, str] | None, form_fields: dict, digest: str, duplicate: bool):
+        self.number = number
+        self.links = links
+        self.has_pager = has_pager
+        self.last_page = last_page
+        self.next_postback = next_postback
+        self.form_fields = form_fields
+        self.digest = digest
+        self.duplicate = duplicate
+
+    def postback_data(self, target: str | None = None, argument: str = '') -> dict:
+        """Form data posting this page back as if target was clicked, the next page by default."""
+        if target is None and self.next_postback:
+            target, argument = self.next_postback
+        return {**self.form_fields, '__EVENTTARGET': target or '', '__EVENTARGUMENT': argument}
+
+
+class WebFormsPager:
+    """
+    Reads the pages of an ASP.NET postback search (Search.aspx style) with a
+    single parse per page. items and link are CSS selectors for the result
+    blocks and the anchor inside each; pager holds the numbered postback
+    links; empty marks a "no results" message.
+
+    Pages repeating one already seen for the current keyword (the server
+    answering an out of range postback with the last page again) are
+    flagged by a hash of their links. Call reset() for every keyword.
+    """
+    def __init__(self, items: str, link: str = 'a', pager: str = '.pagination', empty: str | None = None):
+        self.items = items
+        self.link = link
+        self.pager = pager
+        self.empty = empty
+        self.seen_digests = set()
+
+    def reset(self) -> None:
+        self.seen_digests = set()
+
+    def parse(self, html: str, number: int) -> WebFormsPage:
+        doc = parse_html(html)
+        links = []
+        if not (self.empty and doc.select_one(self.empty)):
+            for item in doc.select(self.items):
+                anchor = item.select_one(self.link)
+                if anchor is not None and anchor.get('href'):
+                    links.append(anchor.get('href'))
+
+        pager_items = doc.select(f'{self.pager} li')
+        anchors = doc.select(f'{self.pager} a')
+        last_item = pager_items[-1] if pager_items else None
+        last_anchor = last_item.select_one('a') if last_item is not None else None
+        last_page = last_item is not None and (
+            'disabled' in (last_item.get('class') or [])
+            or (last_anchor is not None and 'disabled' in (last_anchor.get('class') or [])))
+
+        next_postback = None
+        for anchor in anchors:
+            if anchor.get_text(strip=True) == str(number + 1):
+                next_postback = postback_of(anchor)
+                break
+        if next_postback is None and last_anchor is not None and not last_page:
+            next_postback = postback_of(last_anchor)
+
+        digest = hashlib.sha1('\n'.join(links).encode('utf8')).hexdigest()
+        duplicate = bool(links) and digest in self.seen_digests
+        self.seen_digests.add(digest)
+        return WebFormsPage(number, links, bool(anchors), last_page, next_postback, scan_form_fields(html), digest,
+                            duplicate)
@@ -1,17 +1,390 @@
 import os
+import json
+import asyncio
+import threading
+import time
+import traceback
+import aiohttp
 import requests
 from datetime import datetime
 from requests.exceptions import ProxyError
 
 
+class ProxyStats:
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency = None
+
+    def report(self, ok: bool, latency: float | None = None) -> None:
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+        if latency is not None:
+            self.latency = latency if self.latency is None else self.alpha * latency + (1 - self.alpha) * self.latency
+
+    @property
+    def success_rate(self) -> float:
+        # Smoothed so untried proxies start at 0.5 instead of 0 or 1
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    def score(self) -> float:
+        return self.success_rate / (1 + (self.latency if self.latency is not None else 1.0))
+
+
+class ProxyProber:
+    """
+    Checks proxies concurrently by fetching url through each of them.
+
+    An aiohttp TraceConfig records the connect time and the time to the
+    response headers (TTFB) of every probe, probe_all() returns
+    {proxy: (ok, connect, ttfb)} with the timings in seconds.
+    """
+    def __init__(self, url: str, timeout: float = 10, concurrency: int = 50):
+        self.url = url
+        self.timeout = timeout
+        self.concurrency = concurrency
+
+    def probe_all(self, proxies: list[str]) -> dict[str, tuple[bool, float | None, float | None]]:
+        if not proxies:
+            return {}
+        return asyncio.run(self._probe_all(proxies))
+
+    async def _probe_all(self, proxies: list[str]) -> dict:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_request_end.append(self._on_request_end)
+        limit = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, force_close=True)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[trace_config]) as session:
+            results = await asyncio.gather(*(self._probe(session, limit, proxy) for proxy in proxies))
+        return dict(zip(proxies, results))
+
+    async def _probe(self, session: aiohttp.ClientSession, limit: asyncio.Semaphore, proxy: str) -> tuple:
+        timings = {}
+        async with limit:
+            try:
+                async with session.get(self.url, proxy=proxy, trace_request_ctx=timings) as response:
+                    ok = response.status < 400
+            except Exception:
+                ok = False
+        start = timings.get('start')
+        connect = timings['connected'] - start if 'connected' in timings else None
+        ttfb = timings['headers'] - start if 'headers' in timings else None
+        return ok, connect, ttfb
+
+    async def _on_request_start(self, session, context, params) -> None:
+        context.trace_request_ctx['start'] = time.monotonic()
+
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        context.trace_request_ctx['connected'] = time.monotonic()
+
+    async def _on_request_end(self, session, context, params) -> None:
+        context.trace_request_ctx['headers'] = time.monotonic()
+
+
+# The cached list holds proxy credentials, so it lives outside the source tree by default
+DEFAULT_CACHE_PATH = os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser('~/.cache'), 'arabic_news',
+                                  'proxies.json')
+
+
+class ProxyRegistry:
+    """
+    Process-wide list of IPRoyal proxies with health scores.
+
+    The list is fetched from the reseller API once, cached to disk for ttl
+    seconds and refreshed in the background; a failed refresh keeps serving
+    the previous list. Callers report the outcome and latency of every request
+    made through a proxy. Every rerank_interval seconds the proxies are ranked
+    by smoothed success rate and EWMA latency into tiers (the best top_share
+    of each country and of the whole list), and pick() walks a tier round-robin
+    in O(1). With a domain, pick() keeps handing out the same proxy for it
+    until that proxy fails, so clearance cookies stay bound to one IP.
+
+    With a prober every proxy is checked when the list is loaded. Proxies that
+    fail the probe, or max_failures requests in a row, are quarantined and
+    never picked; they are probed again after quarantine_base seconds, doubling
+    up to quarantine_max for every failed re-check.
+    """
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH, ttl: float = 6 * 3600,
+                 refresh_interval: float = 3600, top_share: float = 0.25, rerank_interval: float = 30,
+                 prober: ProxyProber | None = None, max_failures: int = 3, quarantine_base: float = 60,
+                 quarantine_max: float = 3600):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.top_share = top_share
+        self.rerank_interval = rerank_interval
+        self.prober = prober
+        self.max_failures = max_failures
+        self.quarantine_base = quarantine_base
+        self.quarantine_max = quarantine_max
+        self.quarantined = {}
+        self.proxies = []
+        self.stats = {}
+        self.countries = {}
+        self.tiers = {}
+        self.affinity = {}
+        self.loaded_at = 0.0
+        self._cursors = {}
+        self._ranked_at = 0.0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self._dirty = True
+        self._refresher = None
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+        # Held through the probe so no proxy is handed out before it has been checked
+        with self._load_lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+    def _load(self) -> None:
+        with self._lock:
+            cached, loaded_at = self._read_cache()
+            if cached and time.time() - loaded_at < self.ttl:
+                self._set_proxies(cached, loaded_at)
+            else:
+                try:
+                    fetched = get_list_proxies()
+                except Exception:
+                    # The API is down or answered an error, a stale list beats failing every site
+                    print(traceback.format_exc())
+                    fetched = None
+                if fetched:
+                    self._set_proxies(fetched, time.time())
+                    self._write_cache(fetched)
+                elif cached:
+                    print('Could not refresh the proxy list, using the cached one')
+                    self._set_proxies(cached, loaded_at)
+            if not self.proxies:
+                raise Exception("The proxy list is empty.")
+            proxies = list(self.stats)
+        self.probe(proxies)
+        self._start_refresher()
+
+    def refresh(self) -> None:
+        try:
+            fetched = get_list_proxies()
+        except Exception:
+            print(traceback.format_exc())
+            return
+        if not fetched:
+            return
+        self._write_cache(fetched)
+        with self._lock:
+            known = set(self.stats)
+            self._set_proxies(fetched, time.time())
+            new = [proxy for proxy in self.stats if proxy not in known]
+        self.probe(new)
+
+    def probe(self, proxies: list[str]) -> None:
+        """Probe the proxies concurrently, quarantining the ones that fail and releasing the rest."""
+        if not self.prober or not proxies:
+            return
+        try:
+            results = self.prober.probe_all(proxies)
+        except Exception:
+            print(traceback.format_exc())
+            return
+        with self._lock:
+            for proxy, (ok, connect, ttfb) in results.items():
+                stats = self.stats.get(proxy)
+                if stats is None:
+                    continue
+                stats.report(ok, ttfb)
+                if ok:
+                    self.quarantined.pop(proxy, None)
+                else:
+                    self._quarantine(proxy)
+            self.tiers = {}
+        print(f'Proxy probe: {self.live_count()} of {len(self.stats)} proxies are live')
+
+    def live_count(self) -> int:
+        return len(self.stats) - len(self.quarantined)
+
+    def pick(self, domain: str | None = None, country: str | None = None, exclude: str | None = None) -> str:
+        """
+        Return a proxy from the tier of the given country, or from the global
+        tier when there is no proxy in that country. With a domain the proxy is
+        sticky: the same one is returned for (domain, tier) until it fails.
+        exclude skips one proxy when the tier has another, for hedged requests.
+        """
+        self.load()
+        with self._lock:
+            now = time.monotonic()
+            if not self.tiers or (self._dirty and now - self._ranked_at >= self.rerank_interval):
+                self._rerank(now)
+            if None not in self.tiers:
+                raise Exception("No live proxies, every proxy is quarantined.")
+            tier_key = normalize_country(country)
+            if tier_key not in self.tiers:
+                tier_key = None
+            if domain:
+                proxy = self.affinity.get((domain, tier_key))
+                if proxy in self.stats and proxy not in self.quarantined:
+                    return proxy
+            tier = self.tiers[tier_key]
+            cursor = self._cursors.get(tier_key, 0)
+            if exclude and len(tier) > 1 and tier[cursor % len(tier)] == exclude:
+                cursor += 1
+            self._cursors[tier_key] = cursor + 1
+            proxy = tier[cursor % len(tier)]
+            if domain:
+                self.affinity[(domain, tier_key)] = proxy
+            return proxy
+
+    def report(self, proxy: str, ok: bool, latency: float | None = None) -> None:
+        with self._lock:
+            stats = self.stats.get(proxy)
+            if stats is None:
+                return
+            stats.report(ok, latency)
+            self._dirty = True
+            if not ok:
+                # The next pick for these domains moves to another proxy
+                for key in [key for key, value in self.affinity.items() if value == proxy]:
+                    del self.affinity[key]
+                if stats.consecutive_failures >= self.max_failures:
+                    self._quarantine(proxy)
+                    self.tiers = {}
+
+    def _quarantine(self, proxy: str) -> None:
+        _, checks = self.quarantined.get(proxy, (0.0, 0))
+        delay = min(self.quarantine_max, self.quarantine_base * 2 ** checks)
+        self.quarantined[proxy] = (time.monotonic() + delay, checks + 1)
+        for key in [key for key, value in self.affinity.items() if value == proxy]:
+            del self.affinity[key]
+
+    def _rerank(self, now: float) -> None:
+        live = [proxy for proxy in self.stats if proxy not in self.quarantined]
+        groups = {None: live} if live else {}
+        for proxy in live:
+            country = self.countries.get(proxy)
+            if country:
+                groups.setdefault(country, []).append(proxy)
+        tiers = {}
+        for key, proxies in groups.items():
+            if not proxies:
+                continue
+            ranked = sorted(proxies, key=lambda proxy: self.stats[proxy].score(), reverse=True)
+            # Two proxies at least, so a hedge or a failover has somewhere else to go
+            tiers[key] = ranked[:max(min(2, len(ranked)), int(len(ranked) * self.top_share))]
+        self.tiers = tiers
+        self._ranked_at = now
+        self._dirty = False
+
+    def proxy_strings(self) -> list[str]:
+        self.load()
+        with self._lock:
+            return list(self.stats)
+
+    def _set_proxies(self, proxies: list[dict], loaded_at: float) -> None:
+        # Stats of proxies that are still in the list survive a refresh
+        self.proxies = proxies
+        self.stats = {proxy_to_string(proxy): self.stats.get(proxy_to_string(proxy)) or ProxyStats()
+                      for proxy in proxies}
+        self.countries = {proxy_to_string(proxy): normalize_country(proxy.get('country')) for proxy in proxies}
+        self.quarantined = {proxy: value for proxy, value in self.quarantined.items() if proxy in self.stats}
+        self.tiers = {}
+        self.loaded_at = loaded_at
+        self._dirty = True
+
+    def _read_cache(self) -> tuple[list, float]:
+        try:
+            with open(self.cache_path, encoding='utf8') as file:
+                data = json.load(file)
+            return data.get('proxies') or [], float(data.get('loaded_at', 0))
+        except (OSError, ValueError):
+            return [], 0.0
+
+    def _write_cache(self, proxies: list[dict]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            # The list holds proxy credentials
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf8') as file:
+                json.dump({'loaded_at': time.time(), 'proxies': proxies}, file, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            print(traceback.format_exc())
+
+    def _start_refresher(self) -> None:
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._refresh_periodically, name='proxy-refresh', daemon=True)
+            self._refresher.start()
+
+    def _refresh_periodically(self) -> None:
+        refreshed_at = time.monotonic()
+        while True:
+            time.sleep(min(self.refresh_interval, self.quarantine_base))
+            now = time.monotonic()
+            with self._lock:
+                due = [proxy for proxy, (until, _) in self.quarantined.items() if until <= now]
+            self.probe(due)
+            if now - refreshed_at >= self.refresh_interval:
+                refreshed_at = now
+                self.refresh()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_proxy_registry() -> ProxyRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProxyRegistry(
+                os.getenv("PROXY_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl=float(os.getenv("PROXY_CACHE_TTL", 6 * 3600)),
+                refresh_interval=float(os.getenv("PROXY_REFRESH_INTERVAL", 3600)),
+                prober=ProxyProber(
+                    os.getenv("PROXY_PROBE_URL", 'http://www.gstatic.com/generate_204'),
+                    timeout=float(os.getenv("PROXY_PROBE_TIMEOUT", 10)),
+                    concurrency=int(os.getenv("PROXY_PROBE_CONCURRENCY", 50)),
+                ) if os.getenv("PROXY_PROBE", "1") == "1" else None,
+            )
+        return _registry
+
+
 def get_proxies():
-    all_proxies = get_list_proxies()
-    if not all_proxies:
-        raise Exception("The proxy list is empty.")
-    proxy_strings = [proxy_to_string(proxy) for proxy in all_proxies]
-    if len(proxy_strings) > 0:
-        return proxy_strings
-    return None
+    return get_proxy_registry().proxy_strings()
+
+def normalize_country(country: str | None) -> str | None:
+    if not country:
+        return None
+    country = ' '.join(str(country).split()).casefold()
+    return COUNTRY_ALIASES.get(country, country)
+
+COUNTRY_ALIASES = {
+    'uae': 'united arab emirates',
+    'ae': 'united arab emirates',
+    'ksa': 'saudi arabia',
+    'sa': 'saudi arabia',
+    'bh': 'bahrain',
+    'qa': 'qatar',
+    'jo': 'jordan',
+    'eg': 'egypt',
+    'us': 'united states',
+    'usa': 'united states',
+    'uk': 'united kingdom',
+    'gb': 'united kingdom',
+}
 
 def get_list_proxies() -> list | None:
     user_agent = "Mozilla/5.0 (platform; rv:geckoversion) Gecko/geckotrail Firefox/firefoxversion"
@@ -24,7 +397,7 @@ def get_list_proxies() -> list | None:
     while True:
         try:
             response = requests.get('https://apid.iproyal.com/v1/reseller/orders', headers=ip_royal_headers,
-                                    params={'per_page': 1000, 'status': 'confirmed', 'product_id': int(3), 'page': 1},
+                                    params={'per_page': 1000, 'status': 'confirmed', 'product_id': int(3), 'page': page},
                                     verify=False)
             data = response.json()
             response.close()
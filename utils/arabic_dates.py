@@ -0,0 +1,99 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from utils.hijri_calendar import HIJRI_MONTHS, hijri_to_gregorian
+
+
+# Egyptian/Gulf month names and their common spellings
+GREGORIAN_MONTHS = {
+    "يناير": 1, "فبراير": 2, "مارس": 3, "أبريل": 4, "إبريل": 4, "مايو": 5, "يونيو": 6, "يونيه": 6,
+    "يوليو": 7, "يوليه": 7, "أغسطس": 8, "سبتمبر": 9, "أكتوبر": 10, "نوفمبر": 11, "ديسمبر": 12,
+}
+# Levantine (Syriac) month names used by Jordanian and Egyptian sources
+LEVANTINE_MONTHS = {
+    "كانون الثاني": 1, "شباط": 2, "آذار": 3, "نيسان": 4, "أيار": 5, "حزيران": 6,
+    "تموز": 7, "آب": 8, "أيلول": 9, "تشرين الأول": 10, "تشرين الثاني": 11, "كانون الأول": 12,
+}
+WEEKDAYS = ("السبت", "الأحد", "الاثنين", "الإثنين", "الثلاثاء", "الأربعاء", "الخميس", "الجمعة")
+
+# One str.translate pass: Arabic-Indic and Persian digits to ASCII, alef/yeh/teh marbuta
+# variants folded, tatweel, dagger alef and direction marks dropped, nbsp to space
+FOLD = str.maketrans({
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+    **{chr(0x06F0 + i): str(i) for i in range(10)},
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه",
+    "ـ": None, "ٰ": None, "‎": None, "‏": None, "؜": None, "\xa0": " ",
+})
+
+
+def fold(text: str) -> str:
+    return text.translate(FOLD)
+
+
+def _alternation(names) -> str:
+    # Longest first so "كانون الثاني" wins over a shorter prefix
+    return '|'.join(re.escape(name).replace(r'\ ', r'\s+') for name in sorted(names, key=len, reverse=True))
+
+
+MONTHS = {fold(name): (month, False) for name, month in {**GREGORIAN_MONTHS, **LEVANTINE_MONTHS}.items()}
+MONTHS.update({fold(name): (month, True) for name, month in HIJRI_MONTHS.items()})
+
+DATE_PATTERN = re.compile(
+    rf'(?:(?:يوم\s+)?(?:{_alternation(fold(day) for day in WEEKDAYS)})\s*[،,]?\s*)?'
+    rf'(?P<day>\d{{1,2}})\s+(?:من\s+)?(?P<month>{_alternation(MONTHS)})\s*[،,]?\s*(?P<year>\d{{4}})'
+    # Month first, as pmo.gov.bh renders %B %d, %Y
+    rf'|(?P<mf_month>{_alternation(MONTHS)})\s+(?P<mf_day>\d{{1,2}})\s*[،,]\s*(?P<mf_year>\d{{4}})'
+    r'|(?P<iso_year>\d{4})\s*[-/.]\s*(?P<iso_month>\d{1,2})\s*[-/.]\s*(?P<iso_day>\d{1,2})(?!\d)'
+    r'|(?<!\d)(?P<num_day>\d{1,2})\s*[-/.]\s*(?P<num_month>\d{1,2})\s*[-/.]\s*(?P<num_year>\d{4})'
+)
+# "هـ" after a date marks it as Hijri, folded to "ه"
+HIJRI_SUFFIX = re.compile(r'\s*ه(?!\w)')
+SPACES = re.compile(r'\s+')
+
+
+def _to_datetime(match: re.Match, text: str) -> datetime | None:
+    hijri_suffix = bool(HIJRI_SUFFIX.match(text, match.end()))
+    try:
+        if match.group('month'):
+            month, hijri = MONTHS[SPACES.sub(' ', match.group('month'))]
+            year, day = int(match.group('year')), int(match.group('day'))
+        elif match.group('mf_month'):
+            month, hijri = MONTHS[SPACES.sub(' ', match.group('mf_month'))]
+            year, day = int(match.group('mf_year')), int(match.group('mf_day'))
+        elif match.group('iso_year'):
+            year, month, day = int(match.group('iso_year')), int(match.group('iso_month')), int(match.group('iso_day'))
+            hijri = hijri_suffix
+        else:
+            year, month, day = int(match.group('num_year')), int(match.group('num_month')), int(match.group('num_day'))
+            hijri = hijri_suffix
+        if hijri or hijri_suffix:
+            return hijri_to_gregorian(year, month, day)
+        return datetime(year, month, day)
+    except (ValueError, IndexError, KeyError):
+        return None
+
+
+def iter_dates(text: str):
+    """Every valid date in text, in order of appearance."""
+    text = fold(text)
+    for match in DATE_PATTERN.finditer(text):
+        date_obj = _to_datetime(match, text)
+        if date_obj is not None:
+            yield date_obj
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str) -> datetime | None:
+    """
+    The first date in a piece of site text: "3 أغسطس 2014", "٣ آب ٢٠١٤",
+    "الخميس، 5 مارس 2024", "12 رمضان 1445 هـ", "١٢ / ٠٣ / ٢٠٢٤ - ...",
+    "مارس 5, 2024", "2024-03-12", "12-03-2024 | 10:30". Numeric dates are
+    read day first.
+    Returns None when the text holds no valid date.
+    """
+    return next(iter_dates(text), None)
+
+
+def to_iso(text: str) -> str | None:
+    date_obj = parse_date(text)
+    return date_obj.strftime("%Y-%m-%d") if date_obj else None
@@ -0,0 +1,64 @@
+import unicodedata
+from array import array
+from datetime import datetime
+from ummalqura.hijri import Umalqurra
+from ummalqura.ummalqura_arrray import UmalqurraArray
+
+
+# Hijri years kept in the lookup table, about 1999-2048; dates outside it go through ummalqura itself
+HIJRI_FIRST_YEAR = 1420
+HIJRI_LAST_YEAR = 1470
+
+# ummalqura stores the start of every month from 1356 AH as a Julian day number minus 2400000,
+# adding this turns one into a proleptic Gregorian ordinal (date.toordinal)
+JDN_TO_ORDINAL = 2400000 - 1721425
+# Index of the first month of HIJRI_FIRST_YEAR in UmalqurraArray.ummalqura_dat
+_FIRST_INDEX = (HIJRI_FIRST_YEAR - 1) * 12 - 16260
+
+# Gregorian ordinal of day 1 of every month in the window, indexed by (year - HIJRI_FIRST_YEAR) * 12 + month - 1
+MONTH_STARTS = array('l', (UmalqurraArray.ummalqura_dat[_FIRST_INDEX + i] + JDN_TO_ORDINAL
+                           for i in range((HIJRI_LAST_YEAR - HIJRI_FIRST_YEAR + 1) * 12)))
+
+HIJRI_MONTHS = {
+    "محرم": 1, "صفر": 2, "ربيع الأول": 3, "ربيع الثاني": 4, "ربيع الآخر": 4,
+    "جمادى الأولى": 5, "جمادى الأولىٰ": 5, "جمادى الثانية": 6, "جمادى الآخرة": 6,
+    "رجب": 7, "شعبان": 8, "رمضان": 9, "شوال": 10, "ذو القعدة": 11, "ذو الحجة": 12,
+}
+
+# Spellings folded together: alef and yeh variants, teh marbuta, tatweel and dagger alef
+NAME_FOLD = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه", "ـ": None, "ٰ": None})
+
+
+def normalize_month_name(name: str) -> str:
+    return ' '.join(name.translate(NAME_FOLD).split())
+
+
+# Normalized once here, so a lookup costs one translate of the input
+_MONTH_LOOKUP = {normalize_month_name(name): month for name, month in HIJRI_MONTHS.items()}
+
+
+def hijri_month(name: str) -> int | None:
+    """Month number of a Hijri month name in any of its usual spellings, None if unknown."""
+    month = _MONTH_LOOKUP.get(normalize_month_name(name))
+    if month is None:
+        # Presentation forms and other compatibility characters, rare enough to pay for NFKC
+        month = _MONTH_LOOKUP.get(normalize_month_name(unicodedata.normalize("NFKC", name)))
+    return month
+
+
+_fallback = None
+
+
+def hijri_to_gregorian(year: int, month: int, day: int) -> datetime:
+    """
+    Umm al-Qura date to Gregorian. Inside the table window this is one
+    array lookup; like ummalqura, day 30 of a 29 day month rolls over.
+    """
+    global _fallback
+    if not 1 <= month <= 12 or not 1 <= day <= 30:
+        raise ValueError(f"Invalid Hijri date: {year}/{month}/{day}")
+    if HIJRI_FIRST_YEAR <= year <= HIJRI_LAST_YEAR:
+        return datetime.fromordinal(MONTH_STARTS[(year - HIJRI_FIRST_YEAR) * 12 + month - 1] + day - 1)
+    if _fallback is None:
+        _fallback = Umalqurra()
+    return datetime(*_fallback.hijri_to_gregorian(year, month, day))
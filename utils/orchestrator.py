@@ -0,0 +1,99 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable
+from utils.logger import Logger
+from utils.site_run import SiteRun, SiteBudgetExceeded, bind_site_run
+
+
+class Site:
+    def __init__(self, name: str, func: Callable[[], None], budget: float | None = None):
+        self.name = name
+        self.func = func
+        self.budget = budget
+
+
+class Orchestrator:
+    """
+    Runs site parsers on a thread pool.
+
+    max_workers caps the number of sites running at once. per_site_limit caps
+    how many requests one site may have in flight together: it is the width
+    of the site's concurrent article batches (Functions.iter_pages), the
+    only place a site fetches in parallel; everything else goes out one
+    request at a time from the site's thread. site_budget is the default
+    wall-clock budget in seconds for every site and run_budget the one for
+    the whole run. Budgets are cooperative: parsers
+    check them through Functions before each request or LLM call and clamp
+    request timeouts to them, so an expired site drains quickly instead of
+    being killed. Sites still waiting when the run budget is spent are skipped.
+    """
+    def __init__(self, max_workers: int | None = None, per_site_limit: int | None = None,
+                 site_budget: float | None = None, run_budget: float | None = None):
+        self.max_workers = max_workers or int(os.getenv('ORCHESTRATOR_MAX_WORKERS', 4))
+        self.per_site_limit = per_site_limit or int(os.getenv('ORCHESTRATOR_SITE_CONCURRENCY', 8))
+        if site_budget is None and os.getenv('ORCHESTRATOR_SITE_BUDGET'):
+            site_budget = float(os.getenv('ORCHESTRATOR_SITE_BUDGET'))
+        self.site_budget = site_budget
+        if run_budget is None and os.getenv('ORCHESTRATOR_RUN_BUDGET'):
+            run_budget = float(os.getenv('ORCHESTRATOR_RUN_BUDGET'))
+        self.run_budget = run_budget
+        self.elapsed = 0.0
+        self.logger = Logger().get_logger(__name__)
+
+    def run(self, sites: list[Site]) -> list[SiteRun]:
+        started_at = time.monotonic()
+        run_deadline = started_at + self.run_budget if self.run_budget is not None else None
+        runs = {site: SiteRun(site.name, site.budget or self.site_budget, run_deadline, self.per_site_limit)
+                for site in sites}
+        pending = deque(sites)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='site') as executor:
+            while pending or running:
+                if run_deadline is not None and time.monotonic() >= run_deadline and pending:
+                    self.logger.warning(f'Run is past its deadline, skipping {len(pending)} sites')
+                    for site in pending:
+                        runs[site].status = 'skipped'
+                    pending.clear()
+                while pending and len(running) < self.max_workers:
+                    site = pending.popleft()
+                    running[executor.submit(self._run_site, site, runs[site])] = site
+                done, _ = wait(running, timeout=1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                for site_run in runs.values():
+                    if site_run.status == 'running' and site_run.is_expired():
+                        site_run.status = 'over budget'
+                        self.logger.warning(f'{site_run.name} is over its budget, waiting for it to drain')
+        self.elapsed = time.monotonic() - started_at
+        return list(runs.values())
+
+    def _run_site(self, site: Site, site_run: SiteRun) -> None:
+        bind_site_run(site_run)
+        site_run.start()
+        print(f'Start {site.name}')
+        try:
+            site.func()
+            site_run.finish('ok')
+        except SiteBudgetExceeded as ex:
+            site_run.finish('over budget')
+            self.logger.warning(ex)
+        except Exception as ex:
+            site_run.increment('errors')
+            site_run.finish('failed')
+            print(f"Error in {site.name}: {ex}\n")
+        finally:
+            bind_site_run(None)
+
+    def print_summary(self, runs: list[SiteRun]) -> None:
+        columns = SiteRun.COUNTERS
+        header = f"{'site':<28}{'status':<13}{'duration':>10}" + ''.join(f'{c:>15}' for c in columns)
+        print(header)
+        print('-' * len(header))
+        for site_run in runs:
+            row = f'{site_run.name:<28}{site_run.status:<13}{site_run.duration:>9.1f}s'
+            row += ''.join(f'{site_run.counters.get(c, 0):>15}' for c in columns)
+            print(row)
+        total = sum(site_run.duration for site_run in runs)
+        print(f'Sites: {len(runs)}, summed site time: {total:.1f}s, wall time: {self.elapsed:.1f}s')
@@ -0,0 +1,86 @@
+import threading
+import time
+
+
+class SiteBudgetExceeded(Exception):
+    pass
+
+
+class SiteRun:
+    COUNTERS = ('articles', 'llm_calls', 'llm_cache_hits', 'db_inserts', 'timeouts', 'errors')
+
+    def __init__(self, name: str, budget: float | None = None, run_deadline: float | None = None,
+                 concurrency: int | None = None):
+        self.name = name
+        self.budget = budget
+        # Requests the site may have in flight at once, None for no cap of its own
+        self.concurrency = concurrency
+        # time.monotonic() at which the whole run must stop, shared by every site
+        self.run_deadline = run_deadline
+        self.status = 'pending'
+        self.started_at = None
+        self.finished_at = None
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.started_at = time.monotonic()
+        self.status = 'running'
+
+    def finish(self, status: str) -> None:
+        self.finished_at = time.monotonic()
+        if self.status == 'running':
+            self.status = status
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def deadline(self) -> float | None:
+        """The earliest of the site's and the run's deadlines, as a time.monotonic() value."""
+        deadlines = [self.run_deadline]
+        if self.budget is not None and self.started_at is not None:
+            deadlines.append(self.started_at + self.budget)
+        deadlines = [deadline for deadline in deadlines if deadline is not None]
+        return min(deadlines) if deadlines else None
+
+    def remaining(self) -> float | None:
+        deadline = self.deadline
+        if deadline is None:
+            return None
+        return deadline - time.monotonic()
+
+    def is_expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check_budget(self) -> None:
+        if self.is_expired():
+            self.status = 'over budget'
+            if self.run_deadline is not None and time.monotonic() >= self.run_deadline:
+                raise SiteBudgetExceeded(f'{self.name} stopped, the run is past its deadline')
+            raise SiteBudgetExceeded(f'{self.name} exceeded its budget of {self.budget}s')
+
+
+_local = threading.local()
+_detached = SiteRun('detached')
+
+
+def bind_site_run(site_run: SiteRun | None) -> None:
+    _local.site_run = site_run
+
+
+def current_site_run() -> SiteRun:
+    """
+    Return the SiteRun bound to the calling thread by the orchestrator,
+    or a shared detached one when a parser is run on its own.
+    """
+    return getattr(_local, 'site_run', None) or _detached